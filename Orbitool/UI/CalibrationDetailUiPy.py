@@ -2,13 +2,12 @@ import math
 
 import numpy as np
 from .manager import Manager, state_node
-import matplotlib.ticker
 
 
 from PyQt6 import QtWidgets, QtGui
 from Orbitool.models.spectrum import Spectrum, safeCutSpectrum, safeSplitSpectrum
 from . import CalibrationDetailUi
-from .component import Plot
+from .component import Plot, plot_decimated, scientific_formatter
 
 
 class Widget(QtWidgets.QWidget):
@@ -109,7 +108,8 @@ class Widget(QtWidgets.QWidget):
         ax.clear()
         ax.axhline(color='black', linewidth=.5)
 
-        ax.plot(spectrum.mz, spectrum.intensity, color='red', label="raw")
+        plot_decimated(ax, spectrum.mz, spectrum.intensity,
+                       color='red', label="raw")
 
         if True:
             cali_mz = []
@@ -120,7 +120,8 @@ class Widget(QtWidgets.QWidget):
                     info.calibrator_segments[spectrum.path]):
                 cali_mz.append(calibrator.calibrate_mz(mz_part))
             cali_mz = np.concatenate(cali_mz)
-            ax.plot(cali_mz, spectrum.intensity, color='black', label="calibrated")
+            plot_decimated(ax, cali_mz, spectrum.intensity,
+                           color='black', label="calibrated")
 
         for index, (ion, used) in enumerate(info.yield_ion_used(spectrum.path)):
             formula = ion.formula
@@ -151,7 +152,7 @@ class Widget(QtWidgets.QWidget):
         ax.xaxis.set_tick_params(rotation=15)
         ax.yaxis.set_tick_params(rotation=60)
         ax.yaxis.set_major_formatter(
-            matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+            scientific_formatter())
 
         ax.legend()
         ax.relim()
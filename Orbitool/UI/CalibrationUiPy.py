@@ -1,4 +1,3 @@
-import math
 from enum import Enum
 from functools import partial
 from itertools import chain
@@ -10,17 +9,21 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 
 from Orbitool import setting
 from Orbitool.base.disk_structure import DiskListDirectView
+from Orbitool.base.dataset_structure import CompressedDatasetStructure
 from Orbitool.models import peakfit, spectrum as spectrum_func
 from Orbitool.models.spectrum import Spectrum, SpectrumInfo
 from Orbitool.models.calibration import Calibrator
+from Orbitool.models.file import FileSpectrumInfo
+from Orbitool.models.calibration.ion_search import find_ions_peak
 from Orbitool.models.peakfit.normal_distribution import NormalDistributionFunc
 from Orbitool.models.workspace import WorkSpace
 from Orbitool.models.workspace.calibration import CalibratorInfoSegment
+from Orbitool.models.workspace.incremental import calibrated_paths, merge_start
 from Orbitool.utils import binary_search
 
 from . import CalibrationUi
 from .CalibrationDetailUiPy import Widget as CalibrationDetailWin
-from .component import Plot
+from .component import Plot, plot_decimated
 from .manager import Manager, MultiProcess, state_node
 from .utils import (DragHelper, get_tablewidget_selected_row, openfile,
                     savefile, showInfo)
@@ -279,7 +282,8 @@ class Widget(QtWidgets.QWidget):
                 if all_ions:
                     info.last_ions.clear()
                     info.path_ion_infos.clear()
-                info.done_split(path_ions_peak)
+                    info.ion_split_segments.clear()
+                info.done_split(path_ions_peak, formulas)
                 info.rtol = rtol
             yield func, "calculate ions points"
 
@@ -340,8 +344,8 @@ class Widget(QtWidgets.QWidget):
             if len(times) == 1:
                 kwds["marker"] = "."
             for index in range(deviations.shape[1]):
-                ax.plot(times, deviations[:, index], **kwds,
-                        label=info.last_ions[index].shown_text)
+                plot_decimated(ax, times, deviations[:, index], **kwds,
+                               label=info.last_ions[index].shown_text)
 
         ax.set_xlabel("starting time")
         ax.set_ylabel("Deviation (ppm)")
@@ -357,18 +361,16 @@ class Widget(QtWidgets.QWidget):
         self.manager.calibration_detail_win = win
         win.show()
 
-    @state_node(withArgs=True)
-    def calibrate(self, skip: bool):
+    def calibrate_kwargs(self, skip: bool):
         workspace = self.manager.workspace
         rtol = workspace.info.file_tab.rtol
         noise_info = workspace.info.noise_tab
-        noise_skip = noise_info.skip
         setting = noise_info.general_setting
         result = noise_info.general_result
         dependent = setting.mass_dependent
         params, points, deltas = setting.get_params(not dependent)
-        func_kwargs = {
-            "noise_skip": noise_skip,
+        return {
+            "noise_skip": noise_info.skip,
             "calibrate_skip": skip,
             "average_rtol": rtol,
             "quantile": setting.quantile,
@@ -381,8 +383,13 @@ class Widget(QtWidgets.QWidget):
             "subtract": setting.subtract,
             "poly_coef": result.poly_coef,
             "std": result.global_noise_std}
+
+    @state_node(withArgs=True)
+    def calibrate(self, skip: bool):
+        noise_skip = self.manager.workspace.info.noise_tab.skip
+        self.info.skip = skip
         calibrate_merge = CalibrateMergeDenoise(
-            self.manager.workspace, func_kwargs=func_kwargs)
+            self.manager.workspace, func_kwargs=self.calibrate_kwargs(skip))
         msg = []
         if not skip:
             msg.append("calibrate")
@@ -393,57 +400,71 @@ class Widget(QtWidgets.QWidget):
         yield calibrate_merge, msg
         self.callback.emit()
 
+    def checkNewSpectra(self, raw_length: int, new_infos: List[FileSpectrumInfo]):
+        """
+        raise before reading if new spectra can't be calibrated like the merged `raw_length` ones
+        """
+        if self.info.skip:
+            return
+        raw_infos = self.manager.workspace.info.noise_tab.denoised_spectrum_infos
+        if paths := calibrated_paths(raw_infos, raw_length, new_infos):
+            raise ValueError(
+                f"new spectra come from calibrated files {sorted(paths)}, please calibrate all spectra again")
+
+    def calibrateNewSpectra(self, raw_length: int):
+        """
+        calibrate, merge and denoise raw spectra from `raw_length` with current settings,
+        return index of the first calibrated spectrum changed
+        """
+        workspace = self.manager.workspace
+        info = self.info
+        raw_infos = workspace.info.noise_tab.denoised_spectrum_infos
+
+        if not info.skip:
+            # paths of an interrupted run are fitted again
+            path_ions_peak: Dict[str, List[List[Tuple[float, float]]]] = yield SplitAndFitPeak(
+                workspace.data.raw_spectra,
+                read_kwargs=dict(start=raw_length),
+                func_kwargs=dict(
+                    fit_func=workspace.info.peak_shape_tab.func,
+                    ions=[ion.formula.mass() for ion in info.last_ions],
+                    segments=info.last_calibrate_info_segments,
+                    rtol=info.rtol)), "split and fit target peaks of new spectra"
+
+            def func():
+                info.path_times.update(
+                    (path.path, path.createDatetime) for path in workspace.info.file_tab.pathlist
+                    if path.path in path_ions_peak)
+                info.done_split_paths(path_ions_peak)
+                info.calc_calibrator(path_ions_peak.keys())
+            yield func, "calculate calibration infos of new files"
+
+        raw_start, calibrated_start = merge_start(raw_infos, raw_length)
+        yield CalibrateMergeDenoise(
+            workspace, read_kwargs=dict(start=raw_start),
+            func_kwargs=self.calibrate_kwargs(info.skip),
+            write_kwargs=dict(start=calibrated_start)), "calibrate, merge, denoise new spectra"
+        return calibrated_start
+
 
 class SplitAndFitPeak(MultiProcess):
     @staticmethod
-    def read(h5_spectra: DiskListDirectView[Spectrum], **kwargs) -> Generator:
-        return h5_spectra
+    def read(h5_spectra: DiskListDirectView[Spectrum], start: int = 0, **kwargs) -> Generator:
+        if not start:
+            return h5_spectra
+        return (h5_spectra[index] for index in range(start, len(h5_spectra)))
 
     @staticmethod
-    def read_len(h5_spectra: DiskListDirectView[Spectrum], **kwargs) -> int:
-        return len(h5_spectra)
+    def read_len(h5_spectra: DiskListDirectView[Spectrum], start: int = 0, **kwargs) -> int:
+        return len(h5_spectra) - start
 
     @staticmethod
     def func(data: Spectrum, fit_func: NormalDistributionFunc, ions: List[float], rtol: float, segments: List[CalibratorInfoSegment], **kwargs):
-        ions_peak: List[Tuple[float, float]] = []
-        mz = data.mz
-        intensity = data.intensity
-        segment_index = 0
-        for ion in ions:
-            while segments[segment_index].end_point < ion:
-                segment_index += 1
-            segment = segments[segment_index]
-            delta = ion * rtol
-            mz_, intensity_ = spectrum_func.safeCutSpectrum(
-                mz, intensity, ion - delta, ion + delta)
-
-            peaks = spectrum_func.splitPeaks(mz_, intensity_)
-
-            # intensity filter for noise
-            peaks = [peak for peak in peaks if peak.maxIntensity >
-                     segment.intensity_filter]
-
-            # find highest peak within rtol
-            find = False
-            if len(peaks) > 0:
-                indexes = np.argsort(peak.maxIntensity for peak in peaks)
-                peaks = [peaks[index] for index in indexes]
-
-                while len(peaks) > 0:
-                    peak = peaks.pop()
-                    target_peaks = fit_func.splitPeak(peak)
-
-                    index = np.argmax(
-                        [peak.peak_intensity for peak in target_peaks])
-                    peak = target_peaks[index]
-                    if abs(peak.peak_position / ion - 1) < segment.rtol:
-                        ions_peak.append(
-                            (peak.peak_position, peak.peak_intensity))
-                        find = True
-                        break
-            if not find:
-                ions_peak.append((math.nan, math.nan))
-
+        ions_peak = find_ions_peak(
+            data.mz, data.intensity, fit_func, ions, rtol,
+            [segment.end_point for segment in segments],
+            [segment.rtol for segment in segments],
+            [segment.intensity_filter for segment in segments])
         return data.path, ions_peak
 
     @staticmethod
@@ -461,7 +482,7 @@ class SplitAndFitPeak(MultiProcess):
 
 class CalibrateMergeDenoise(MultiProcess):
     @staticmethod
-    def read(file: WorkSpace, **kwargs) -> Generator[List[Tuple[Spectrum, Calibrator]], Any, Any]:
+    def read(file: WorkSpace, start: int = 0, **kwargs) -> Generator[List[Tuple[Spectrum, Calibrator]], Any, Any]:
         data = file.data
         noise_tab = file.info.noise_tab
         separators = np.array([
@@ -469,7 +490,9 @@ class CalibrateMergeDenoise(MultiProcess):
 
         batch = []
         calibrators_segments = file.info.calibration_tab.calibrator_segments
-        for info, spectrum in zip(noise_tab.denoised_spectrum_infos, data.raw_spectra):
+        raw_spectra = data.raw_spectra
+        spectra = (raw_spectra[index] for index in range(start, len(raw_spectra)))
+        for info, spectrum in zip(noise_tab.denoised_spectrum_infos[start:], spectra):
             item = (spectrum, separators, calibrators_segments.get(spectrum.path, None))
             if info.average_index:
                 batch.append(item)
@@ -480,9 +503,9 @@ class CalibrateMergeDenoise(MultiProcess):
         yield batch
 
     @staticmethod
-    def read_len(file: WorkSpace, **read_kwargs) -> int:
+    def read_len(file: WorkSpace, start: int = 0, **read_kwargs) -> int:
         cnt = 0
-        for info in file.info.noise_tab.denoised_spectrum_infos:
+        for info in file.info.noise_tab.denoised_spectrum_infos[start:]:
             if info.average_index == 0:
                 cnt += 1
         return cnt
@@ -492,18 +515,22 @@ class CalibrateMergeDenoise(MultiProcess):
              noise_skip: bool, calibrate_skip: bool, average_rtol: float,
              quantile: float, mass_dependent: bool, n_sigma: bool,
              dependent: bool, points: np.ndarray, deltas: np.ndarray,
-             params: np.ndarray, subtract: bool, poly_coef: np.ndarray, std: float) -> Spectrum:
+             params: np.ndarray, subtract: bool, poly_coef: np.ndarray, std: float) -> CompressedDatasetStructure:
         spectra = []
+        segment_ends = []
+        poly_coefs = []
         paths = set()
         start_times = []
         end_times = []
-        calibrator: Calibrator
         for spectrum, separators, calibrators in data:
-            if not calibrate_skip:
-                mz = []
-                for mz_part, calibrator in zip(spectrum_func.safeSplitSpectrum(spectrum.mz, spectrum.intensity, separators), calibrators):
-                    mz.append(calibrator.calibrate_mz(mz_part))
-                spectrum.mz = np.concatenate(mz)
+            if calibrate_skip:
+                segment_ends.append(())
+                poly_coefs.append(None)
+            else:
+                parts = spectrum_func.safeSplitSpectrum(
+                    spectrum.mz, spectrum.intensity, separators)
+                segment_ends.append(np.cumsum([len(part) for part in parts]))
+                poly_coefs.append([calibrator.poly_coef for calibrator in calibrators])
             spectra.append((spectrum.mz, spectrum.intensity,
                             (spectrum.end_time - spectrum.start_time).total_seconds()))
             paths.add(spectrum.path)
@@ -511,8 +538,9 @@ class CalibrateMergeDenoise(MultiProcess):
             end_times.append(spectrum.end_time)
 
         path = paths.pop() if len(paths) == 1 else ""
-        mz, intensity = spectrum_func.averageSpectra(
-            spectra, average_rtol, drop_input=True)
+        # calibrate while averaging
+        mz, intensity = spectrum_func.calibrateAverageSpectra(
+            spectra, segment_ends, poly_coefs, average_rtol)
 
         if not noise_skip:
             if not dependent:
@@ -527,10 +555,14 @@ class CalibrateMergeDenoise(MultiProcess):
         spectrum = Spectrum(
             mz=mz, intensity=intensity, path=path,
             start_time=min(start_times), end_time=max(end_times))
-        return spectrum
+        # compress in worker, writer only stores compressed chunks
+        return CompressedDatasetStructure(spectrum)
 
     @staticmethod
-    def write(file: WorkSpace, rets: Iterable[Spectrum], **kwargs):
+    def write(file: WorkSpace, rets: Iterable[CompressedDatasetStructure], start: Optional[int] = None, **kwargs):
+        """
+        start: replace calibrated spectra from `start` instead of all of them
+        """
         obj = (file.proxy_file or file.file)._obj
         tmp = DiskListDirectView(Spectrum, obj, "tmp")
         infos = []
@@ -538,10 +570,18 @@ class CalibrateMergeDenoise(MultiProcess):
         def it():
             for spectrum in rets:
                 infos.append(SpectrumInfo(
-                    start_time=spectrum.start_time, end_time=spectrum.end_time))
+                    start_time=spectrum.attrs["start_time"], end_time=spectrum.attrs["end_time"]))
                 yield spectrum
         tmp.extend(it())
-        file.info.calibration_tab.calibrated_spectrum_infos = infos
+        calibration_tab = file.info.calibration_tab
+        if start is not None:
+            # caches of spectra before `start` stay valid
+            file.data.truncate_calibrated_spectra(start)
+            file.data.calibrated_spectra.extend_from(tmp)
+            calibration_tab.calibrated_spectrum_infos[start:] = infos
+            return
+        calibration_tab.calibrated_spectrum_infos = infos
+        calibration_tab.calibrated_spectra_version += 1
         path = file.data.calibrated_spectra.obj.name
         del obj[path]
         obj.move(tmp.obj.name, path)
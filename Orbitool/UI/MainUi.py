@@ -49,6 +49,12 @@ class Ui_MainWindow(object):
         self.workspaceLoadAction.setObjectName("workspaceLoadAction")
         self.workspaceSaveAsAction = QtGui.QAction(parent=MainWindow)
         self.workspaceSaveAsAction.setObjectName("workspaceSaveAsAction")
+        self.workspaceCompactAction = QtGui.QAction(parent=MainWindow)
+        self.workspaceCompactAction.setObjectName("workspaceCompactAction")
+        self.workspaceMemoryAction = QtGui.QAction(parent=MainWindow)
+        self.workspaceMemoryAction.setObjectName("workspaceMemoryAction")
+        self.processNewSpectraAction = QtGui.QAction(parent=MainWindow)
+        self.processNewSpectraAction.setObjectName("processNewSpectraAction")
         self.configLoadAction = QtGui.QAction(parent=MainWindow)
         self.configLoadAction.setObjectName("configLoadAction")
         self.configSaveAction = QtGui.QAction(parent=MainWindow)
@@ -60,6 +66,10 @@ class Ui_MainWindow(object):
         self.menuWorkspace.addAction(self.workspaceLoadAction)
         self.menuWorkspace.addAction(self.workspaceSaveAction)
         self.menuWorkspace.addAction(self.workspaceSaveAsAction)
+        self.menuWorkspace.addAction(self.workspaceCompactAction)
+        self.menuWorkspace.addAction(self.workspaceMemoryAction)
+        self.menuWorkspace.addSeparator()
+        self.menuWorkspace.addAction(self.processNewSpectraAction)
         self.menuWorkspace.addSeparator()
         self.menuWorkspace.addAction(self.configLoadAction)
         self.menuWorkspace.addAction(self.configSaveAction)
@@ -80,6 +90,12 @@ class Ui_MainWindow(object):
         self.workspaceSaveAction.setShortcut(_translate("MainWindow", "Ctrl+S"))
         self.workspaceLoadAction.setText(_translate("MainWindow", "Load"))
         self.workspaceSaveAsAction.setText(_translate("MainWindow", "Save as"))
+        self.workspaceCompactAction.setText(_translate("MainWindow", "Compact"))
+        self.workspaceCompactAction.setToolTip(_translate("MainWindow", "Reclaim space left by deleted data"))
+        self.workspaceMemoryAction.setText(_translate("MainWindow", "Memory report"))
+        self.workspaceMemoryAction.setToolTip(_translate("MainWindow", "Memory held by each tab and caches"))
+        self.processNewSpectraAction.setText(_translate("MainWindow", "Process new spectra"))
+        self.processNewSpectraAction.setToolTip(_translate("MainWindow", "Read, calibrate and add to time series only spectra appended in file tab since last run"))
         self.configLoadAction.setText(_translate("MainWindow", "Load config from workspace"))
         self.configLoadAction.setToolTip(_translate("MainWindow", "Load Config from Workspace"))
         self.configSaveAction.setText(_translate("MainWindow", "Save config to workspace"))
@@ -1,14 +1,16 @@
+import logging
 from datetime import datetime
 from pathlib import Path
 import shutil
 from typing import Dict, Union
 
-from matplotlib.pyplot import get
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 from Orbitool import setting
 from Orbitool.base.structure import broken_entries as h5_brokens
 from Orbitool.models.workspace import WorkSpace, updater
+from Orbitool.models.workspace.incremental import appended_start, merged_length
+from Orbitool.utils.memory import format_usages
 from ..version import VERSION
 from . import (CalibrationUiPy, file_tab, formulas, MainUi, MassDefectUiPy,
                MassListUiPy, NoiseUiPy, PeakFitUiPy, PeakListUiPy,
@@ -34,6 +36,9 @@ class Window(QtWidgets.QMainWindow):
         ui.workspaceLoadAction.triggered.connect(self.load)
         ui.workspaceSaveAction.triggered.connect(self.save)
         ui.workspaceSaveAsAction.triggered.connect(self.save_as)
+        ui.workspaceCompactAction.triggered.connect(self.compact)
+        ui.workspaceMemoryAction.triggered.connect(self.memory_report)
+        ui.processNewSpectraAction.triggered.connect(self.process_new_spectra)
 
         ui.configLoadAction.triggered.connect(self.loadConfig)
         ui.configSaveAction.triggered.connect(self.saveConfig)
@@ -194,7 +199,59 @@ class Window(QtWidgets.QMainWindow):
     @state_node
     def save(self):
         self.manager.save.emit()
-        self.manager.workspace.save()
+        if reclaimed := self.manager.workspace.save():
+            self.showMsg(f"workspace compacted, {reclaimed / 2**20:.1f} MB reclaimed")
+
+    @state_node
+    def compact(self):
+        self.manager.save.emit()
+        workspace = self.manager.workspace
+        # save may have compacted already
+        reclaimed = workspace.save() or workspace.compact()
+        self.showMsg(f"workspace compacted, {reclaimed / 2**20:.1f} MB reclaimed")
+
+    @state_node(mode='n')
+    def memory_report(self):
+        rows = self.manager.memory_report()
+        lines = format_usages(rows)
+        logging.getLogger("Orbitool").info("\n".join(["memory report"] + lines))
+        numpy = sum(row.numpy for row in rows) / 2**20
+        python = sum(row.python for row in rows) / 2**20
+        box = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Icon.Information, "Memory report",
+            f"{numpy + python:.1f} MB in workspace info and caches, {numpy:.1f} MB numpy arrays, "
+            f"{python:.1f} MB python objects", parent=self)
+        box.setDetailedText("\n".join(lines))
+        box.exec()
+
+    @state_node
+    def process_new_spectra(self):
+        """
+        for workspaces whose spectrum infos keep growing, e.g. new RAW files added every hour.
+        Spectra to process are worked out from calibrated spectra and time series,
+        so a run interrupted by an error is continued by the next one.
+        """
+        info = self.workspace.info
+        raw_infos = info.noise_tab.denoised_spectrum_infos
+        read_start = appended_start(raw_infos, info.file_tab.spectrum_infos)
+        if read_start is None or not info.calibration_tab.calibrated_spectrum_infos:
+            UiUtils.showInfo(
+                "Spectra are not only appended since last run, please process them from noise tab")
+            return
+        raw_length = merged_length(raw_infos, info.calibration_tab.calibrated_spectrum_infos)
+        # check before changing anything
+        self.calibrationTab.checkNewSpectra(
+            raw_length, raw_infos[raw_length:] + info.file_tab.spectrum_infos[read_start:])
+
+        yield from self.noiseTab.readNewSpectra(read_start)
+        raw_count = len(info.noise_tab.denoised_spectrum_infos) - raw_length
+        if raw_count:
+            yield from self.calibrationTab.calibrateNewSpectra(raw_length)
+        calculated = yield from self.timeseriesesTab.calcNewSpectra()
+        if not raw_count and not calculated:
+            self.showMsg("no new spectra")
+            return
+        self.showMsg(f"{raw_count} new spectra processed")
 
     @state_node
     def save_as(self):
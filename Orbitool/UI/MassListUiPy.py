@@ -2,13 +2,15 @@ import csv
 from typing import Optional, Union
 from functools import partial
 
+import numpy as np
 from PyQt6 import QtCore, QtWidgets
 
 from Orbitool.models.peakfit import MassListItem, MassListHelper
 from Orbitool.models.formula import Formula
 from . import MassListUi
+from .component import ArrayTableModel
 from .manager import Manager, state_node
-from .utils import get_tablewidget_selected_row, openfile, savefile
+from .utils import TableUtils, openfile, savefile
 
 
 class Widget(QtWidgets.QWidget):
@@ -27,6 +29,10 @@ class Widget(QtWidgets.QWidget):
 
         ui.doubleSpinBox.valueChanged.connect(self.updateRtol)
 
+        self.model = ArrayTableModel(["mz", "formula"], [
+            lambda v: format(v, '.5f'), lambda formulas: ', '.join(str(f) for f in formulas)], self, alignment=None)
+        self.model.bind_view(ui.tableView)
+
         ui.addPushButton.clicked.connect(self.addMass)
         ui.removePushButton.clicked.connect(self.rmMass)
 
@@ -52,15 +58,10 @@ class Widget(QtWidgets.QWidget):
         ui = self.ui
         ui.doubleSpinBox.setValue(self.info.rtol * 1e6)
 
-        table = ui.tableWidget
-        table.clearContents()
-        table.setRowCount(0)
-        table.setRowCount(len(self.info.masslist))
-        for index, mass in enumerate(self.info.masslist):
-            table.setItem(index, 0, QtWidgets.QTableWidgetItem(
-                format(mass.position, '.5f')))
-            table.setItem(index, 1, QtWidgets.QTableWidgetItem(
-                ', '.join(str(f) for f in mass.formulas)))
+        masslist = self.info.masslist
+        self.model.set_columns([
+            np.array([mass.position for mass in masslist], dtype=float),
+            [mass.formulas for mass in masslist]])
 
     @state_node(mode="e")
     def showMassList_CatchException(self):
@@ -93,9 +94,9 @@ class Widget(QtWidgets.QWidget):
 
     @state_node
     def rmMass(self):
-        indexes = get_tablewidget_selected_row(self.ui.tableWidget)
+        indexes = TableUtils.getSelectedSourceRow(self.ui.tableView)
         masslist = self.info.masslist
-        for index in reversed(indexes):
+        for index in np.sort(indexes)[::-1]:
             masslist.pop(index)
         self.showMasslist()
 
@@ -122,7 +123,7 @@ class Widget(QtWidgets.QWidget):
         self.showMasslist()
 
     def get_selected_index(self):
-        return get_tablewidget_selected_row(self.ui.tableWidget)
+        return np.sort(TableUtils.getSelectedSourceRow(self.ui.tableView))
 
     def read_masslist_from(self, f):
         rtol = self.info.rtol
@@ -1,16 +1,15 @@
 import csv
 from collections import deque
 from copy import copy
-from tkinter import W
 from typing import Generator, Iterable, List, Optional, Tuple, Union
 
-import matplotlib.ticker
 import numpy as np
 from numpy.polynomial.polynomial import polyval
 from PyQt6 import QtCore, QtWidgets
 
 from Orbitool import logger, setting
 from Orbitool.base.disk_structure import DiskListDirectView
+from Orbitool.base.dataset_structure import CompressedDatasetStructure
 from Orbitool.models.workspace.noise_tab import MzIntensity, NoiseArray, NoiseFormulaParameter
 from Orbitool.models import spectrum as spectrum_func
 from Orbitool.models.file import FileSpectrumInfo
@@ -20,7 +19,7 @@ from Orbitool.models.workspace import WorkSpace
 from Orbitool.utils import binary_search
 
 from . import NoiseUi, component
-from .component import factory
+from .component import factory, plot_decimated, scientific_formatter
 from .manager import Manager, MultiProcess, state_node
 from .utils import (TableUtils, get_tablewidget_selected_row, savefile, set_header_sizes,
                     showInfo)
@@ -150,7 +149,7 @@ class Widget(QtWidgets.QWidget):
         spectrum = self.info.current_spectrum
         if spectrum is not None:
             self.plot.ax.clear()
-            self.plot.ax.plot(spectrum.mz, spectrum.intensity)
+            plot_decimated(self.plot.ax, spectrum.mz, spectrum.intensity)
             self.plot.canvas.draw()
             self.y_rescale(self.ui.yLogCheckBox.isChecked())
 
@@ -361,22 +360,22 @@ class Widget(QtWidgets.QWidget):
 
         if not is_log:
             ax.yaxis.set_major_formatter(
-                matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+                scientific_formatter())
 
-        ax.plot(spectrum.mz, result.noise.LOD, zorder=2.5,
-                linewidth=1, color='k', label='LOD')
-        ax.plot(spectrum.mz, result.noise.noise, zorder=2.5,
-                linewidth=1, color='b', label='noise')
+        plot_decimated(ax, spectrum.mz, result.noise.LOD, zorder=2.5,
+                       linewidth=1, color='k', label='LOD')
+        plot_decimated(ax, spectrum.mz, result.noise.noise, zorder=2.5,
+                       linewidth=1, color='b', label='noise')
         spectrum_split = result.spectrum_split
         noise_split = result.noise_split
         if setting.denoise.plot_noise_in_diff_color and spectrum_split.mz is not None:
-            ax.plot(spectrum_split.mz, spectrum_split.intensity,
-                    linewidth=1, color="#1f77b4", label="Spectrum")
-            ax.plot(noise_split.mz, noise_split.intensity,
-                    linewidth=1, color="#BF2138", label="Noise")
+            plot_decimated(ax, spectrum_split.mz, spectrum_split.intensity,
+                           linewidth=1, color="#1f77b4", label="Spectrum")
+            plot_decimated(ax, noise_split.mz, noise_split.intensity,
+                           linewidth=1, color="#BF2138", label="Noise")
         else:
-            ax.plot(spectrum.mz, spectrum.intensity,
-                    linewidth=1, color="#BF2138", label="Spectrum")
+            plot_decimated(ax, spectrum.mz, spectrum.intensity,
+                           linewidth=1, color="#BF2138", label="Spectrum")
         ax.legend(loc='upper right')
 
         self.moveToGlobalNoise()
@@ -478,6 +477,15 @@ class Widget(QtWidgets.QWidget):
 
         self.callback.emit((s,))
 
+    def readNewSpectra(self, start: int):
+        """
+        read spectra of file tab's spectrum infos from `start`, append them to raw spectra
+        """
+        workspace = self.manager.workspace
+        if start == len(workspace.info.file_tab.spectrum_infos):
+            return
+        yield ReadFromFile(workspace, read_kwargs={"start": start}, write_kwargs={"append": True}), "read new spectra"
+
     @state_node
     def skip(self):
         yield ReadFromFile(self.manager.workspace), "read and average all spectra"
@@ -585,7 +593,7 @@ class Widget(QtWidgets.QWidget):
 
         if not is_log:
             ax.yaxis.set_major_formatter(
-                matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+                scientific_formatter())
 
         if self.info.current_spectrum is None:
             return
@@ -645,14 +653,17 @@ class ReadFromFile(MultiProcess):
         spectrum = Spectrum(
             mz=mz, intensity=intensity, path=info.path,
             start_time=info.start_time, end_time=info.end_time)
-        return info, spectrum
+        # compress in worker, writer only stores compressed chunks
+        return info, CompressedDatasetStructure(spectrum)
 
     @staticmethod
-    def read(file: WorkSpace, **kwargs) -> Generator:
+    def read(file: WorkSpace, start: int = 0, **kwargs) -> Generator:
         rtol = file.info.file_tab.rtol
         cnt = 0
+        if start:  # continue average index of read spectra
+            cnt = file.info.noise_tab.denoised_spectrum_infos[-1].average_index + 1
         last_reader = None
-        for info in file.info.file_tab.spectrum_infos:
+        for info in file.info.file_tab.spectrum_infos[start:]:
             data, last_reader = info.get_spectrum_from_info(rtol, last_reader=last_reader)
             if info.average_index and info.average_index != cnt:
                 info = copy(info)
@@ -664,11 +675,11 @@ class ReadFromFile(MultiProcess):
                 cnt = info.average_index
 
     @staticmethod
-    def read_len(file: WorkSpace, **kwargs) -> int:
-        return len(file.info.file_tab.spectrum_infos)
+    def read_len(file: WorkSpace, start: int = 0, **kwargs) -> int:
+        return len(file.info.file_tab.spectrum_infos) - start
 
     @staticmethod
-    def write(file: WorkSpace, rets: Iterable[Tuple[FileSpectrumInfo, Spectrum]], **kwargs):
+    def write(file: WorkSpace, rets: Iterable[Tuple[FileSpectrumInfo, CompressedDatasetStructure]], append: bool = False, **kwargs):
         obj = (file.proxy_file or file.file)._obj
         tmp = DiskListDirectView(Spectrum, obj, "tmp")
         infos = []
@@ -679,6 +690,11 @@ class ReadFromFile(MultiProcess):
                 yield spectrum
         tmp.extend(it())
 
+        if append:
+            file.data.raw_spectra.extend_from(tmp)
+            file.info.noise_tab.denoised_spectrum_infos.extend(infos)
+            return
+
         file.info.noise_tab.denoised_spectrum_infos = infos
         file.info.noise_tab.to_be_calibrate = True
         path = file.data.raw_spectra.obj.name
@@ -1,7 +1,6 @@
 from copy import deepcopy
 from typing import List, Optional, Union
 
-import matplotlib.ticker
 import numpy as np
 from PyQt6 import QtCore, QtGui, QtWidgets
 
@@ -11,7 +10,7 @@ from Orbitool.models.spectrum import FittedPeak
 from Orbitool.utils import binary_search
 
 from . import PeakFitFloatUi
-from .component import Plot
+from .component import Plot, scientific_formatter
 from .formulas import FormulaResultWindow
 from .manager import Manager, state_node
 from .utils import set_header_sizes
@@ -209,7 +208,7 @@ class Window(QtWidgets.QMainWindow):
         ax.xaxis.set_tick_params(rotation=15)
         ax.yaxis.set_tick_params(rotation=60)
         ax.yaxis.set_major_formatter(
-            matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+            scientific_formatter())
         if show_legend:
             ax.legend()
 
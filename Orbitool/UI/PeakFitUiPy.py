@@ -3,8 +3,6 @@ from enum import Enum
 from itertools import chain
 from typing import Callable, List, Optional, Set, Tuple, cast
 
-import matplotlib.text
-import matplotlib.ticker
 import numpy as np
 from PyQt6 import QtCore, QtWidgets
 
@@ -17,7 +15,7 @@ from Orbitool.models.spectrum import FittedPeak, Peak, PeakTags, Spectrum
 from Orbitool.utils import binary_search
 
 from . import PeakFitUi
-from .component import Plot
+from .component import Plot, plot_decimated, scientific_formatter
 from .manager import Manager, MultiProcess, state_node
 
 
@@ -196,11 +194,11 @@ class Widget(QtWidgets.QWidget):
         ax.set_yscale('log' if is_log else 'linear')
         if is_log:
             ax.yaxis.set_major_formatter(
-                matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+                scientific_formatter())
 
-        ax.plot(info.shown_mz, info.shown_intensity,
-                color='k', linewidth=1, label="spectrum")
-        ax.plot(info.shown_mz, info.shown_residual,
+        plot_decimated(ax, info.shown_mz, info.shown_intensity,
+                       color='k', linewidth=1, label="spectrum")
+        plot_decimated(ax, info.shown_mz, info.shown_residual,
                 color='r', linewidth=.5, label="residual")
         ax.legend()
 
@@ -219,7 +217,7 @@ class Widget(QtWidgets.QWidget):
         ax.set_yscale('log' if is_log else 'linear')
         if not is_log:
             ax.yaxis.set_major_formatter(
-                matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+                scientific_formatter())
         self.rescale()
         self.plot.canvas.draw()
 
@@ -337,8 +335,9 @@ class Widget(QtWidgets.QWidget):
         args = np.array([peak.peak_intensity for _, peak in index_peaks_pair],
                         dtype=float).argsort()[::-1]
 
+        from matplotlib.text import Annotation
         anns = [child for child in ax.get_children() if isinstance(
-            child, matplotlib.text.Annotation)]
+            child, Annotation)]
         while anns:
             ann = anns.pop()
             ann.remove()
@@ -1,8 +1,8 @@
-from array import array
 import contextlib
 import csv
-from typing import Dict, List, Optional, Tuple, Union, cast
+from typing import Dict, List, Tuple
 
+import numpy as np
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 from Orbitool.models.formula import Formula
@@ -11,9 +11,10 @@ from Orbitool.utils import binary_search
 
 from .. import setting
 from . import PeakListUi
+from .component import ArrayTableModel
 from .manager import Manager, state_node
 from .PeakFitFloatUiPy import Window as PeakFloatWin
-from .utils import get_tablewidget_selected_row, savefile
+from .utils import TableUtils, savefile
 
 colors = {
     PeakTags.Done: QtGui.QColor(0xD9FFC9),
@@ -21,6 +22,18 @@ colors = {
     PeakTags.Fail: QtGui.QColor(0xFFBBB1)}
 
 
+def format_ppm(ppm: float) -> str:
+    return "" if np.isnan(ppm) else format(ppm, '.5f')
+
+
+def format_formulas(peak: FittedPeak) -> str:
+    return ', '.join(str(f) for f in peak.formulas)
+
+
+def format_tags(peak: FittedPeak) -> str:
+    return ','.join(tag.name for tag in map(PeakTags, peak.tags))
+
+
 class Widget(QtWidgets.QWidget):
 
     def __init__(self, manager: Manager) -> None:
@@ -42,8 +55,14 @@ class Widget(QtWidgets.QWidget):
         ui.doubleSpinBox.setKeyboardTracking(False)
         ui.doubleSpinBox.valueChanged.connect(self.goto_mass)
         ui.gotoToolButton.clicked.connect(self.goto_mass)
-        ui.tableWidget.itemDoubleClicked.connect(self.openPeakFloatWin)
-        ui.tableWidget.verticalScrollBar().valueChanged.connect(self.scrolled)
+        self.model = ArrayTableModel(
+            ["position", "formula", "intensity", "ppm", "area", "tag", "peaks num"], [
+                lambda v: format(v, '.5f'), format_formulas, lambda v: format(v, '.3e'), format_ppm,
+                lambda v: format(v, '.3e'), format_tags, str], self, alignment=None)
+        self.model.show_source_index = True
+        self.model.bind_view(ui.tableView)
+        ui.tableView.doubleClicked.connect(self.openPeakFloatWin)
+        ui.tableView.verticalScrollBar().valueChanged.connect(self.scrolled)
 
         self.manager.bind.peak_fit_left_index.connect(
             "peaklist", self.scroll_to_index)
@@ -63,56 +82,37 @@ class Widget(QtWidgets.QWidget):
         return self.manager.workspace.info.peak_fit_tab
 
     def showPeaks(self):
-        table = self.ui.tableWidget
-        peaks = self.info.peaks
-        original_indexes = self.info.original_indexes
-        raw_split_num = self.info.raw_split_num
-        indexes = self.info.shown_indexes
+        model = self.model
+        bar = self.ui.tableView.verticalScrollBar()
+        current_index = int(model.rows[bar.value()]) if bar.value() < len(
+            model.rows) else 0
 
-        peaks = [peaks[index] for index in indexes]
-
-        bar = table.verticalScrollBar()
-        item = table.verticalHeaderItem(bar.value())
-        if item:
-            current_index = int(item.text())
-        else:
-            current_index = 0
+        info = self.info
+        peaks = info.peaks
+        indexes = info.shown_indexes
+        ppm = [(peak.peak_position / peak.formulas[0].mass() - 1) * 1e6 if len(peak.formulas) == 1 else np.nan
+               for peak in peaks]
+        peaks_num = np.asarray(info.raw_split_num, dtype=int)[
+            np.asarray(info.original_indexes, dtype=int)]
+        columns = [
+            np.array([peak.peak_position for peak in peaks], dtype=float),
+            peaks,
+            np.array([peak.peak_intensity for peak in peaks], dtype=float),
+            np.array(ppm, dtype=float),
+            np.array([peak.area for peak in peaks], dtype=float),
+            peaks,
+            peaks_num]
 
         with self.no_send_slider():
-            table.clearContents()
-            table.setRowCount(0)
-            table.setRowCount(len(peaks))
-            table.setVerticalHeaderLabels(map(str, indexes))
-            ind = binary_search.indexNearest(indexes, current_index)
-            bar.setRange(0, len(indexes))
-            bar.setSliderPosition(ind)
-
-        for index, peak in enumerate(peaks):
-            tag = peak.tags
-            if tag:
-                tag = PeakTags(tag[0])
-            c = colors.get(tag, None)
-
-            def setItem(column, msg):
-                item = QtWidgets.QTableWidgetItem(str(msg))
-                if c is not None:
-                    item.setBackground(c)
-                table.setItem(
-                    index, column, item)
-
-            setItem(0, format(peak.peak_position, '.5f'))
-            setItem(1, ', '.join(str(f) for f in peak.formulas))
-            setItem(2, format(peak.peak_intensity, '.3e'))
-            setItem(3,
-                    format((peak.peak_position / peak.formulas[0].mass() - 1) * 1e6, '.5f') if len(peak.formulas) == 1 else "")
-            setItem(4, format(peak.area, '.3e'))
-            setItem(5, ','.join(tag.name for tag in map(PeakTags, peak.tags)))
-
-            setItem(6, raw_split_num[original_indexes[indexes[index]]])
+            model.set_columns(columns, indexes)
+            model.set_role_data(QtCore.Qt.ItemDataRole.BackgroundRole, [
+                colors.get(PeakTags(peak.tags[0]) if peak.tags else None) for peak in peaks])
+            if len(indexes):
+                bar.setSliderPosition(model.view_row_of_filtered(
+                    binary_search.indexNearest(indexes, current_index)))
 
     @contextlib.contextmanager
     def no_send_slider(self):
-        bar = self.ui.tableWidget.verticalScrollBar()
         box = self.ui.bindPlotCheckBox
         value = box.isChecked()
         box.setChecked(False)
@@ -123,20 +123,19 @@ class Widget(QtWidgets.QWidget):
         """
             filter selected or filter unselected
         """
-        selectedindex = get_tablewidget_selected_row(self.ui.tableWidget)
+        selected = TableUtils.getSelectedSourceRow(self.ui.tableView)
         info = self.info
         indexes = info.shown_indexes
-        if select:
-            info.shown_indexes = [indexes[index] for index in selectedindex]
-        else:
-            for index in reversed(selectedindex):
-                indexes.pop(index)
+        mask = np.isin(indexes, selected)
+        if not select:
+            mask = ~mask
+        info.shown_indexes = [index for index, m in zip(
+            indexes, mask.tolist()) if m]
 
     def getSelected(self):
-        selectedindex = get_tablewidget_selected_row(self.ui.tableWidget)
-        info = self.info
-        indexes = info.shown_indexes
-        return [indexes[index] for index in selectedindex]
+        selected = set(TableUtils.getSelectedSourceRow(
+            self.ui.tableView).tolist())
+        return [index for index in self.info.shown_indexes if index in selected]
 
     @state_node
     def goto_mass(self):
@@ -149,21 +148,21 @@ class Widget(QtWidgets.QWidget):
         self.manager.bind.peak_fit_left_index.emit_except("peaklist", index)
 
     @state_node(mode='n', withArgs=True)
-    def scrolled(self, index):
-        if self.ui.bindPlotCheckBox.isChecked():
+    def scrolled(self, row):
+        if self.ui.bindPlotCheckBox.isChecked() and row < self.model.rowCount():
             self.manager.bind.peak_fit_left_index.emit_except(
-                "peaklist", index)
+                "peaklist", self.model.filtered_position(row))
 
     def scroll_to_index(self, index):
-        if self.ui.bindPlotCheckBox.isChecked():
+        if self.ui.bindPlotCheckBox.isChecked() and index < self.model.rowCount():
             with self.no_send_slider():
-                self.ui.tableWidget.verticalScrollBar().setSliderPosition(index)
+                self.ui.tableView.verticalScrollBar().setSliderPosition(
+                    self.model.view_row_of_filtered(index))
 
     @state_node(withArgs=True)
-    def openPeakFloatWin(self, item: QtWidgets.QTableWidgetItem):
-        row = item.row()
+    def openPeakFloatWin(self, index: QtCore.QModelIndex):
         win = PeakFloatWin.get_or_create(
-            self.manager, self.info.shown_indexes[row])
+            self.manager, int(self.model.source_rows([index.row()])[0]))
         win.show()
         win.raise_()
 
@@ -7,7 +7,6 @@ import matplotlib
 import matplotlib.animation
 import matplotlib.backend_bases
 import matplotlib.lines
-import matplotlib.ticker
 import numpy as np
 from PyQt6 import QtCore, QtWidgets
 
@@ -17,6 +16,7 @@ from Orbitool.models.spectrum import FittedPeak
 
 from .. import setting
 from . import PeakShapeUi, component
+from .component import scientific_formatter
 from .manager import Manager, Thread, state_node
 from .utils import savefile, showInfo
 
@@ -120,7 +120,7 @@ class Widget(QtWidgets.QWidget):
             return
         self.animation = LineAnimation()
         ax.xaxis.set_major_formatter(
-            matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+            scientific_formatter())
         ax.yaxis.set_tick_params(rotation=15)
         for peak in self.info.peaks_manager.peaks:
             ax.plot(peak.mz, peak.intensity)
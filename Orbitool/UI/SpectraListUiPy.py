@@ -4,12 +4,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Literal, Optional, Union
 
+import numpy as np
 from PyQt6 import QtCore, QtWidgets
 
 from Orbitool.models.file import FileSpectrumInfo
 
 from .. import setting
 from . import SpectraListUi, utils
+from .component import ArrayTableModel
 from .manager import Manager, state_node
 from .utils import (TableUtils, get_tablewidget_selected_row, openfolder, set_header_sizes,
                     showInfo)
@@ -37,7 +39,10 @@ class Widget(QtWidgets.QWidget):
         ui = self.ui
         ui.setupUi(self)
 
-        set_header_sizes(ui.tableWidget.horizontalHeader(), [210, 210])
+        self.model = ArrayTableModel(
+            ["start time", "end time"], [lambda t: setting.format_time(t)] * 2, self, alignment=None)
+        self.model.bind_view(ui.tableView)
+        set_header_sizes(ui.tableView.horizontalHeader(), [210, 210])
         self.show_combobox_selection()
         ui.exportSelectPushButton.clicked.connect(
             lambda: self.export("select"))
@@ -62,18 +67,18 @@ class Widget(QtWidgets.QWidget):
         ui = self.ui
         current = ui.comboBox.currentData()
         if self.former_index == current:
-            ui.tableWidget.resizeColumnsToContents()
+            ui.tableView.resizeColumnsToContents()
             return
         if self.former_index != -1:
-            self.comboBox_position[self.former_index] = ui.tableWidget.verticalScrollBar(
+            self.comboBox_position[self.former_index] = ui.tableView.verticalScrollBar(
             ).sliderPosition()
-        ui.tableWidget.setRowCount(0)
+        self.model.clear()
         if current == FILE_TAB:
             self.show_file_infos()
         elif current == CALIBRATE_TAB:
             self.show_calibration_infos()
 
-        ui.tableWidget.verticalScrollBar().setSliderPosition(
+        ui.tableView.verticalScrollBar().setSliderPosition(
             self.comboBox_position.get(current, 0))
         self.former_index = current
 
@@ -82,7 +87,6 @@ class Widget(QtWidgets.QWidget):
         return self.manager.workspace.info.spectra_list
 
     def show_file_infos(self):
-        tableWidget = self.ui.tableWidget
         spectrum_infos: List[FileSpectrumInfo] = self.manager.workspace.info.file_tab.spectrum_infos
 
         shown_indexes: List[int] = []
@@ -96,26 +100,18 @@ class Widget(QtWidgets.QWidget):
             else:
                 ends[-1] = info.end_time
         self.info.shown_indexes = shown_indexes
-        tableWidget.setRowCount(len(infos))
-
-        for i, (info, end) in enumerate(zip(infos, ends)):
-            time_range = (setting.format_time(info.start_time),
-                          setting.format_time(end))
-            for j, v in enumerate(time_range):
-                tableWidget.setItem(i, j, QtWidgets.QTableWidgetItem(v))
-        tableWidget.resizeColumnsToContents()
+        self.model.set_columns([
+            np.array([info.start_time for info in infos], dtype=object),
+            np.array(ends, dtype=object)])
+        self.ui.tableView.resizeColumnsToContents()
 
     def show_calibration_infos(self):
-        tableWidget = self.ui.tableWidget
         infos = self.manager.workspace.info.calibration_tab.calibrated_spectrum_infos
         self.info.shown_indexes = list(range(len(infos)))
-        tableWidget.setRowCount(len(infos))
-        for i, info in enumerate(infos):
-            tableWidget.setItem(i, 0, QtWidgets.QTableWidgetItem(
-                setting.format_time(info.start_time)))
-            tableWidget.setItem(i, 1, QtWidgets.QTableWidgetItem(
-                setting.format_time(info.end_time)))
-        tableWidget.resizeColumnsToContents()
+        self.model.set_columns([
+            np.array([info.start_time for info in infos], dtype=object),
+            np.array([info.end_time for info in infos], dtype=object)])
+        self.ui.tableView.resizeColumnsToContents()
 
     def show_combobox_selection(self):
         comboBox = self.ui.comboBox
@@ -124,7 +120,7 @@ class Widget(QtWidgets.QWidget):
         comboBox.addItem("Calibrate tab", CALIBRATE_TAB)
 
     def get_selected_index(self):
-        indexes = TableUtils.getSelectedRow(self.ui.tableWidget)
+        indexes = TableUtils.getSelectedSourceRow(self.ui.tableView)
         if len(indexes) == 0:
             if setting.general.default_select:
                 return 0
@@ -154,7 +150,7 @@ class Widget(QtWidgets.QWidget):
         elif data == CALIBRATE_TAB:
             spectra = self.manager.workspace.data.calibrated_spectra
 
-        rows = TableUtils.getSelectedRow(self.ui.tableWidget)
+        rows = np.sort(TableUtils.getSelectedSourceRow(self.ui.tableView))
 
         if mode == "select":
             def iter_select():
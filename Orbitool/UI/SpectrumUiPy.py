@@ -1,14 +1,19 @@
 import csv
 from typing import Optional, Union
 
-from PyQt6 import QtCore, QtWidgets
+from PyQt6 import QtWidgets
 
 from ..models.spectrum.spectrum import Spectrum
 from . import SpectrumUi
+from .component import ArrayTableModel
 from .manager import Manager, state_node
 from .utils import savefile
 
 
+def format_value(v: float) -> str:
+    return format(v, '.6f') if v > 1e-6 else '0.0'
+
+
 class Widget(QtWidgets.QWidget):
     def __init__(self, manager: Manager, parent: Optional['QWidget'] = None) -> None:
         super().__init__()
@@ -21,6 +26,10 @@ class Widget(QtWidgets.QWidget):
         ui = self.ui
         ui.setupUi(self)
 
+        self.model = ArrayTableModel(
+            ["mz", "intensity"], [format_value, format_value], self)
+        ui.tableView.setModel(self.model)
+
         self.ui.pushButton.clicked.connect(self.export)
 
     @property
@@ -34,17 +43,7 @@ class Widget(QtWidgets.QWidget):
         self.info.spectrum = spectrum
         if not spectrum:
             return
-        tableWidget = self.ui.tableWidget
-        tableWidget.setRowCount(0)
-        mass = spectrum.mz
-        intensity = spectrum.intensity
-        tableWidget.setRowCount(len(mass))
-        for i, (m_row, i_row) in enumerate(zip(mass, intensity)):
-            for j, v in enumerate((m_row, i_row)):
-                item = QtWidgets.QTableWidgetItem(
-                    format(v, '.6f') if v > 1e-6 else '0.0')
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-                tableWidget.setItem(i, j, item)
+        self.model.set_columns([spectrum.mz, spectrum.intensity])
 
     @state_node
     def export(self):
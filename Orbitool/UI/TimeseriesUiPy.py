@@ -1,15 +1,22 @@
-import csv
+from datetime import timedelta
 from typing import Optional
 
+import numpy as np
 from PyQt6 import QtWidgets
 
-from ..utils.time_format.time_convert import converters
+from ..models.timeseries import TimeSeriesMatrix
+from ..models.timeseries.export import EXPORT_FILTER, export_binary, export_csv, time_columns
 from . import TimeseriesUi
+from .component import ArrayTableModel
 from .manager import Manager, state_node
 from .utils import savefile
 from Orbitool import setting
 
 
+def optional_format(spec: str):
+    return lambda v: "" if np.isnan(v) else format(v, spec)
+
+
 class Widget(QtWidgets.QWidget):
     def __init__(self, manager: Manager) -> None:
         super().__init__()
@@ -23,6 +30,11 @@ class Widget(QtWidgets.QWidget):
         ui = self.ui
         ui.setupUi(self)
 
+        self.model = ArrayTableModel(
+            ["time", "intensity", "position", "deviation(ppm)"],
+            [str, lambda v: format(v, '.3e'), optional_format('.5f'), optional_format('.3f')], self)
+        self.model.bind_view(ui.tableView)
+
         ui.retentionTimeCheckBox.stateChanged.connect(self.retention_time_toggle)
         ui.exportPushButton.clicked.connect(self.export)
 
@@ -46,31 +58,28 @@ class Widget(QtWidgets.QWidget):
         if index < 0:
             return
         retention_time = self.ui.retentionTimeCheckBox.isChecked()
-        series = self.manager.workspace.data.time_series[index]
-
-        table = self.ui.tableWidget
-        table.clearContents()
-        table.setRowCount(0)
-        table.setRowCount(len(series.times))
+        info = self.info.timeseries_infos[index]
 
-        if not self.info.timeseries_infos[index].valid():
+        model = self.model
+        if not info.valid():
+            model.set_columns([[]] * 4)
             return
+        series = info.get_series(
+            self.manager.workspace.data.time_series_matrices[info.matrix_index])
+
+        times = series.times
+        if retention_time:
+            model.formatters[0] = lambda t: str(t.item())
+            times = times - times[:1]
+        else:
+            time_format = setting.general.time_format
+            model.formatters[0] = lambda t: t.item().strftime(time_format)
+        if len(series.positions):
+            positions, deviation = series.positions, series.get_deviations()
+        else:
+            positions = deviation = np.full(len(times), np.nan)
+        model.set_columns([times, series.intensity, positions, deviation])
 
-        positions = series.positions
-        deviation = series.get_deviations()
-        begin = series.times[0]
-        for index, (time, intensity) in enumerate(zip(series.times, series.intensity)):
-            table.setItem(index, 0, QtWidgets.QTableWidgetItem(
-                str(time-begin) if retention_time else
-                time.strftime(setting.general.time_format) ))
-            table.setItem(index, 1, QtWidgets.QTableWidgetItem(
-                format(intensity, '.3e')))
-            if positions:
-                table.setItem(index, 2, QtWidgets.QTableWidgetItem(
-                    format(positions[index], '.5f')))
-                table.setItem(index, 3, QtWidgets.QTableWidgetItem(
-                    format(deviation[index], '.3f')))
-    
     @state_node(mode='e')
     def showSeries_CatchException(self):
         self.showSeries()
@@ -82,28 +91,21 @@ class Widget(QtWidgets.QWidget):
             return
 
         info = self.info.timeseries_infos[index]
-        series = self.manager.workspace.data.time_series[index]
-        ret, f = savefile("timeseries", "CSV file(*.csv)",
+        series = info.get_series(
+            self.manager.workspace.data.time_series_matrices[info.matrix_index])
+        ret, f = savefile("timeseries", EXPORT_FILTER,
                           f"timeseries {info.get_name()}")
         if not ret:
             return
 
         def func():
-            with open(f, 'w', newline='') as file:
-                writer = csv.writer(file)
-                formats = setting.timeseries.export_time_formats
-                time_formats = {k: v for k,
-                                (v, _) in converters.items() if k in formats}
-                row = [f"{time} time" for time in time_formats.keys()]
-                row.extend(["intensity", "position", "deviation"])
-                writer.writerow(row)
-                length = len(series.times)
-                for time, *row in zip(
-                        series.times, series.intensity,
-                        series.positions or [""] * length,
-                        series.get_deviations() or [""] * length):
-                    prt_time = time.replace(microsecond=0)
-                    writer.writerow([c(prt_time)
-                                    for c in time_formats.values()] + row)
+            matrix = TimeSeriesMatrix.FromSeries([series], timedelta())
+            deviations = matrix.get_deviations([series.position_mid])
+            if export_binary(f, [info.get_name()], matrix, deviations):
+                return
+            columns = time_columns(
+                matrix.times, setting.timeseries.export_time_formats)
+            export_csv(f, list(columns) + ["intensity", "position", "deviation"],
+                       [*columns.values(), matrix.intensity, matrix.positions, deviations])
 
         yield func
@@ -114,6 +114,14 @@ class Ui_Form(object):
         self.calcPeakPushButton.setSizePolicy(sizePolicy)
         self.calcPeakPushButton.setObjectName("calcPeakPushButton")
         self.formLayout.setWidget(6, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.calcPeakPushButton)
+        self.extractRawPushButton = QtWidgets.QPushButton(parent=self.showPeakPage)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.extractRawPushButton.sizePolicy().hasHeightForWidth())
+        self.extractRawPushButton.setSizePolicy(sizePolicy)
+        self.extractRawPushButton.setObjectName("extractRawPushButton")
+        self.formLayout.setWidget(7, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.extractRawPushButton)
         self.toolBox.addItem(self.showPeakPage, "")
         self.page_4 = QtWidgets.QWidget()
         self.page_4.setGeometry(QtCore.QRect(0, 0, 314, 91))
@@ -143,28 +151,18 @@ class Ui_Form(object):
         self.formLayout_2.setWidget(2, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.calcRangePushButton)
         self.toolBox.addItem(self.page_4, "")
         self.verticalLayout_17.addWidget(self.toolBox)
-        self.tableWidget = QtWidgets.QTableWidget(parent=self.layoutWidget_3)
+        self.tableView = QtWidgets.QTableView(parent=self.layoutWidget_3)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Preferred)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.tableWidget.sizePolicy().hasHeightForWidth())
-        self.tableWidget.setSizePolicy(sizePolicy)
-        self.tableWidget.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.SizeAdjustPolicy.AdjustIgnored)
-        self.tableWidget.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.tableWidget.setHorizontalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
-        self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setColumnCount(4)
-        self.tableWidget.setRowCount(0)
-        item = QtWidgets.QTableWidgetItem()
-        self.tableWidget.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.tableWidget.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.tableWidget.setHorizontalHeaderItem(2, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.tableWidget.setHorizontalHeaderItem(3, item)
-        self.tableWidget.horizontalHeader().setStretchLastSection(True)
-        self.verticalLayout_17.addWidget(self.tableWidget)
+        sizePolicy.setHeightForWidth(self.tableView.sizePolicy().hasHeightForWidth())
+        self.tableView.setSizePolicy(sizePolicy)
+        self.tableView.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.SizeAdjustPolicy.AdjustIgnored)
+        self.tableView.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tableView.setHorizontalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.tableView.setObjectName("tableView")
+        self.tableView.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout_17.addWidget(self.tableView)
         self.horizontalLayout_16 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_16.setObjectName("horizontalLayout_16")
         self.label_23 = QtWidgets.QLabel(parent=self.layoutWidget_3)
@@ -258,19 +256,13 @@ class Ui_Form(object):
         self.massListRadioButton.setText(_translate("Form", "mass list all peaks"))
         self.label_22.setText(_translate("Form", "<html><head/><body><p>tolerance(ppm)</p></body></html>"))
         self.calcPeakPushButton.setText(_translate("Form", "Calc time series"))
+        self.extractRawPushButton.setToolTip(_translate("Form", "Sum intensity within m/z windows from scans of raw files directly"))
+        self.extractRawPushButton.setText(_translate("Form", "Extract from raw files"))
         self.toolBox.setItemText(self.toolBox.indexOf(self.showPeakPage), _translate("Form", "Show peak time series"))
         self.label.setText(_translate("Form", "left"))
         self.label_2.setText(_translate("Form", "right"))
         self.calcRangePushButton.setText(_translate("Form", "Calc time series"))
         self.toolBox.setItemText(self.toolBox.indexOf(self.page_4), _translate("Form", "Show intensity sum time series"))
-        item = self.tableWidget.horizontalHeaderItem(0)
-        item.setText(_translate("Form", "show"))
-        item = self.tableWidget.horizontalHeaderItem(1)
-        item.setText(_translate("Form", "tag"))
-        item = self.tableWidget.horizontalHeaderItem(2)
-        item.setText(_translate("Form", "mz-from"))
-        item = self.tableWidget.horizontalHeaderItem(3)
-        item.setText(_translate("Form", "mz-to"))
         self.label_23.setText(_translate("Form", "Remove"))
         self.removeSelectedPushButton.setText(_translate("Form", "selected"))
         self.removeAllPushButton.setText(_translate("Form", "all"))
@@ -1,30 +1,31 @@
-import csv
 from datetime import datetime, timedelta
 from functools import partial
-from itertools import chain
-from typing import Dict, Iterable, List, Literal, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Optional, Tuple
 
-import matplotlib.lines
-import matplotlib.ticker
 import numpy as np
 from PyQt6 import QtCore, QtWidgets
 
 from Orbitool.base.disk_structure import DiskListDirectView
+from Orbitool.models.file import Path
 from Orbitool.models.formula import Formula
 from Orbitool.models.peakfit import BaseFunc as BaseFitFunc
-from Orbitool.models.peakfit import MassListItem, NoFitFunc
+from Orbitool.models.peakfit import FittedPeakTable, MassListItem, NoFitFunc, PeakAreaIndex
 from Orbitool.models.spectrum import Spectrum, safeCutSpectrum, splitPeaks
-from Orbitool.models.workspace.timeseries import TimeSeriesInfoRow
-from Orbitool.utils import binary_search
+from Orbitool.models.workspace import WorkSpace
+from Orbitool.models.workspace.incremental import timeseries_start
+from Orbitool.utils.readers.spectrum_filter import SpectrumFilter, StatsFilters
 
 from .. import setting
-from ..models.timeseries.timeseries import TimeSeries
-from ..utils.time_format.time_convert import converters
+from ..models.timeseries import TimeSeries, TimeSeriesMatrix
+from ..models.timeseries.export import EXPORT_FILTER, export_binary, export_csv, time_columns
 from . import TimeseriesesUi
-from .component import Plot, factory
+from .component import ArrayTableModel, Plot, plot_decimated, scientific_formatter
 from .manager import Manager, MultiProcess, state_node
 from .utils import TableUtils, savefile, showInfo
 
+if TYPE_CHECKING:
+    from matplotlib.lines import Line2D
+
 
 class Widget(QtWidgets.QWidget):
     click_series = QtCore.pyqtSignal()
@@ -37,7 +38,7 @@ class Widget(QtWidgets.QWidget):
         manager.init_or_restored.connect(self.restore)
         manager.save.connect(self.updateState)
 
-        self.shown_series: Dict[int, matplotlib.lines.Line2D] = {}
+        self.shown_series: Dict[int, "Line2D"] = {}
 
     def setupUi(self):
         ui = self.ui
@@ -47,9 +48,14 @@ class Widget(QtWidgets.QWidget):
         self.plot = Plot(ui.widget)
 
         ui.calcPeakPushButton.clicked.connect(self.calc_peak)
+        ui.extractRawPushButton.clicked.connect(self.extract_raw)
         ui.calcRangePushButton.clicked.connect(self.calc_sum)
 
-        ui.tableWidget.itemDoubleClicked.connect(self.seriesClicked)
+        self.model = ArrayTableModel(["show", "tag", "mz-from", "mz-to"], [
+            str, str, lambda v: format(v, '.5f'), lambda v: format(v, '.5f')], self, alignment=None)
+        self.model.bind_view(ui.tableView)
+        self.model.checkChanged.connect(self.showTimeseriesAt)
+        ui.tableView.doubleClicked.connect(self.seriesClicked)
         ui.removeSelectedPushButton.clicked.connect(self.removeSelect)
         ui.removeAllPushButton.clicked.connect(self.removeAll)
         ui.exportTimeseriesPushButton.clicked.connect(
@@ -65,12 +71,11 @@ class Widget(QtWidgets.QWidget):
         return self.manager.workspace.info.time_series_tab
 
     @property
-    def timeseries(self):
-        return self.manager.workspace.data.time_series
+    def matrices(self):
+        return self.manager.workspace.data.time_series_matrices
 
     def restore(self):
-        for func, msg in self.showTimeseries():
-            func()
+        self.showTimeseries()
         self.info.ui_state.restore_state(self.ui)
 
     def updateState(self):
@@ -78,6 +83,47 @@ class Widget(QtWidgets.QWidget):
 
     @state_node
     def calc_peak(self):
+        series = self.peakSeries()
+        if not series:
+            showInfo("get no time series")
+            return
+        matrix = yield from self.calcPeakSeries(series)
+
+        yield partial(self.info.append_matrix, self.matrices, matrix, series), "write to disk"
+
+        self.showTimeseries()
+
+    @state_node
+    def extract_raw(self):
+        """
+        sum intensity within each m/z window from scans of raw files,
+        without averaging, denoising or calibration
+        """
+        file_tab = self.manager.workspace.info.file_tab
+        paths = file_tab.pathlist.paths
+        if not paths:
+            showInfo("please add files first")
+            return
+        series = self.peakSeries()
+        if not series:
+            showInfo("get no time series")
+            return
+        for s in series:
+            s.range_sum = True
+
+        func_kwargs = {
+            "mz_ranges": [(s.position_min, s.position_max) for s in series],
+            "filter": file_tab.getCastedUsedSpectrumFilters(),
+            "stats_filter": file_tab.getCastedScanstatsFilters(),
+            "time_range": self.manager.getters.file_time_range.get()}
+        matrix = yield ExtractChromatograms(
+            paths, func_kwargs=func_kwargs, write_kwargs={"series": series}), "extract time series from raw files"
+
+        yield partial(self.info.append_matrix, self.matrices, matrix, series), "write to disk"
+
+        self.showTimeseries()
+
+    def peakSeries(self):
         ui = self.ui
 
         series: List[TimeSeries] = []
@@ -116,29 +162,7 @@ class Widget(QtWidgets.QWidget):
             for mass in masslist:
                 series.append(
                     TimeSeries.FactoryPositionRtol(mass.position, rtol, mass.formulas))
-
-        func = self.manager.workspace.info.peak_shape_tab.func
-
-        spectra = self.manager.workspace.data.calibrated_spectra
-
-        if not series:
-            showInfo("get no time series")
-            return
-        position_list = [(s.position_min, s.position_max) for s in series]
-        position_min = min(p for p, _ in position_list)
-        position_max = max(p for _, p in position_list)
-        func_args = {"mz_range_list": position_list, "mz_cut": (
-            position_min, position_max), "func": func}
-
-        write_args = {"series": series}
-
-        series = yield CalcTimeseries(spectra, func_kwargs=func_args, write_kwargs=write_args), "calculate time series"
-
-        yield partial(self.timeseries.extend, series), "write to disk"
-        self.info.timeseries_infos.extend(
-            TimeSeriesInfoRow.FromTimeSeries(s) for s in series)
-
-        yield from self.showTimeseries()
+        return series
 
     @state_node
     def calc_sum(self):
@@ -148,57 +172,184 @@ class Widget(QtWidgets.QWidget):
         mz_max = ui.rangeMaxDoubleSpinBox.value()
 
         series = TimeSeries(position_min=mz_min, position_max=mz_max, range_sum=True)
+        matrix = yield from self.calcSumSeries(series)
+
+        self.info.append_matrix(self.matrices, matrix, [series])
+
+        self.showTimeseries()
 
-        spectra = self.manager.workspace.data.calibrated_spectra
+    def calcPeakSeries(self, series: List[TimeSeries], start: int = 0):
+        """
+        matrix of highest peaks of `series` in calibrated spectra from `start`
+        """
+        workspace = self.manager.workspace
+        position_list = [(s.position_min, s.position_max) for s in series]
+
+        if setting.timeseries.use_fitted_peak_tables:
+            yield from self.updateFittedPeakTables()
+            tables = workspace.data.fitted_peak_tables
+
+            def read_tables():
+                times = []
+                rows = []
+                for index in range(start, len(tables)):
+                    table = tables[index]
+                    times.append(table.start_time)
+                    rows.append(table.get_max(position_list))
+                matrix = TimeSeriesMatrix.Empty(len(series))
+                matrix.extend_peaks(times, rows)
+                return matrix
+            return (yield read_tables, "read time series from fitted peaks")
 
+        position_min = min(p for p, _ in position_list)
+        position_max = max(p for _, p in position_list)
+        func_args = {"mz_range_list": position_list, "mz_cut": (
+            position_min, position_max), "func": workspace.info.peak_shape_tab.func}
+        return (yield CalcTimeseries(
+            workspace.data.calibrated_spectra, read_kwargs={"start": start},
+            func_kwargs=func_args, write_kwargs={"count": len(series)}), "calculate time series")
+
+    def calcSumSeries(self, series: TimeSeries, start: int = 0):
+        """
+        one column matrix of mz range sums of `series` in calibrated spectra from `start`
+        """
+        workspace = self.manager.workspace
+        mz_min, mz_max = series.position_min, series.position_max
         target = setting.timeseries.mz_sum_target
         match setting.timeseries.mz_sum_func:
             case "nofit":
                 func = NoFitFunc()
             case "norm":
-                func = self.manager.workspace.info.peak_shape_tab.func
+                func = workspace.info.peak_shape_tab.func
+
+        if setting.timeseries.use_peak_area_index and target == "area" and isinstance(func, NoFitFunc):
+            yield from self.updatePeakAreaIndexes()
+            indexes = workspace.data.peak_area_indexes
+
+            def read_indexes():
+                times = []
+                sums = []
+                for index in range(start, len(indexes)):
+                    area_index = indexes[index]
+                    times.append(area_index.start_time)
+                    sums.append(area_index.get_sum(mz_min, mz_max))
+                return sum_matrix(series, times, sums)
+            return (yield read_indexes, "read mz range sum series from peak area index")
+
+        if setting.timeseries.use_fitted_peak_tables and not isinstance(func, NoFitFunc):
+            yield from self.updateFittedPeakTables()
+            tables = workspace.data.fitted_peak_tables
+
+            def read_tables():
+                times = []
+                sums = []
+                for index in range(start, len(tables)):
+                    table = tables[index]
+                    times.append(table.start_time)
+                    sums.append(table.get_sum(mz_min, mz_max, target))
+                return sum_matrix(series, times, sums)
+            return (yield read_tables, "read mz range sum series from fitted peaks")
+
         func_args = {
             "target": target,
             "func": func,
             "mz_range": (mz_min, mz_max)
         }
-        write_args = {"series": series}
-
-        series = yield CalcSumTimeSeries(spectra, func_kwargs=func_args, write_kwargs=write_args), "calculate mz range sum series"
-
-        self.timeseries.append(series)
-        self.info.timeseries_infos.append(
-            TimeSeriesInfoRow.FromTimeSeries(series))
-
-        yield from self.showTimeseries()
+        return (yield CalcSumTimeSeries(
+            workspace.data.calibrated_spectra, read_kwargs={"start": start},
+            func_kwargs=func_args, write_kwargs={"series": series}), "calculate mz range sum series")
+
+    def calcNewSpectra(self):
+        """
+        recalculate points of all time series from the first calibrated spectrum not in them,
+        return whether there were such spectra
+        """
+        workspace = self.manager.workspace
+        spectra = workspace.data.calibrated_spectra
+        calibrated_infos = workspace.info.calibration_tab.calibrated_spectrum_infos
+        start = timeseries_start(calibrated_infos, self.info.calculated_end_time)
+        if start >= len(spectra):
+            return False
+        if not len(self.matrices):
+            self.info.calculated_end_time = calibrated_infos[-1].end_time
+            return True
+        begin = spectra[start].start_time
+        matrices = {}
+        for matrix_index in range(len(self.matrices)):
+            matrix = self.matrices[matrix_index]
+            # series from raw files don't depend on spectra
+            if matrix.from_raw:
+                continue
+            matrix.truncate(begin)
+            series = [TimeSeries(position_min=row.position_min, position_max=row.position_max)
+                      for row in self.info.matrix_rows(matrix_index)]
+            if matrix.range_sum:
+                # `calc_sum` stores one range per matrix
+                series, = series
+                appended = yield from self.calcSumSeries(series, start)
+            else:
+                appended = yield from self.calcPeakSeries(series, start)
+            matrix.extend(appended.times, appended.intensity, appended.positions)
+            matrices[matrix_index] = matrix
+
+        def write():
+            for matrix_index, matrix in matrices.items():
+                self.matrices[matrix_index] = matrix
+                for row in self.info.matrix_rows(matrix_index):
+                    row.update_times(matrix)
+            self.info.calculated_end_time = calibrated_infos[-1].end_time
+        yield write, "write to disk"
+
+        for line in self.shown_series.values():
+            line.remove()
+        self.shown_series.clear()
+        self.plot.canvas.draw()
+        self.showTimeseries()
+        return True
+
+    def updateFittedPeakTables(self):
+        workspace = self.manager.workspace
+        func = workspace.info.peak_shape_tab.func
+        version = workspace.info.calibration_tab.calibrated_spectra_version
+        length = len(workspace.data.fitted_peak_tables)
+        spectra_length = len(workspace.data.calibrated_spectra)
+        start = 0
+        # calibrated spectra may be appended since last fitting
+        if self.info.fitted_peak_tables_valid(func, version) and length <= spectra_length:
+            if length == spectra_length:
+                return
+            start = length
+        yield FitPeakTables(workspace, read_kwargs={"start": start}, func_kwargs={"func": func}, write_kwargs={"append": start > 0}), "fit peaks of each spectrum"
+        self.info.fitted_peak_tables_func = func
+        self.info.fitted_peak_tables_version = version
+
+    def updatePeakAreaIndexes(self):
+        workspace = self.manager.workspace
+        version = workspace.info.calibration_tab.calibrated_spectra_version
+        length = len(workspace.data.peak_area_indexes)
+        spectra_length = len(workspace.data.calibrated_spectra)
+        start = 0
+        if self.info.peak_area_indexes_version == version and length <= spectra_length:
+            if length == spectra_length:
+                return
+            start = length
+        yield BuildPeakAreaIndexes(workspace, read_kwargs={"start": start}, write_kwargs={"append": start > 0}), "index peak areas of each spectrum"
+        self.info.peak_area_indexes_version = version
 
     def showTimeseries(self):
-        if len(self.info.timeseries_infos) != len(self.timeseries):
-            def func():
-                self.info.timeseries_infos = [
-                    TimeSeriesInfoRow.FromTimeSeries(s) for s in self.timeseries]
-            yield func, "update timeseries info"
-
-        table = self.ui.tableWidget
-        table.clearContents()
-        table.setRowCount(0)
-        table.setRowCount(len(self.info.timeseries_infos))
-        shown_series = self.shown_series
-        for index, s in enumerate(self.info.timeseries_infos):
-            if s.valid():
-                chb = factory.CheckBox(index in shown_series)
-                chb.toggled.connect(partial(self.showTimeseriesAt, index))
-                table.setCellWidget(index, 0, chb)
-            else:
-                i = QtWidgets.QTableWidgetItem("E")
-                i.setToolTip("Empty timeseries")
-                table.setItem(index, 0, i)
-            table.setItem(index, 1, QtWidgets.QTableWidgetItem(s.get_name()))
-            table.setItem(index, 2, QtWidgets.QTableWidgetItem(
-                format(s.position_min, '.5f')))
-            table.setItem(index, 3, QtWidgets.QTableWidgetItem(
-                format(s.position_max, '.5f')))
-        table.resizeColumnsToContents()
+        infos = self.info.timeseries_infos
+        valid = np.array([s.valid() for s in infos], dtype=bool)
+        model = self.model
+        model.set_columns([
+            np.where(valid, "", "E"),
+            [s.get_name() for s in infos],
+            np.array([s.position_min for s in infos], dtype=float),
+            np.array([s.position_max for s in infos], dtype=float)])
+        model.set_check_states(0, np.where(
+            valid, np.isin(np.arange(len(infos)), list(self.shown_series)), -1))
+        model.set_role_data(QtCore.Qt.ItemDataRole.ToolTipRole, np.where(
+            valid, None, "Empty timeseries"))
+        self.ui.tableView.resizeColumnsToContents()
 
     @state_node(withArgs=True)
     def showTimeseriesAt(self, index: int, checked: bool):
@@ -211,11 +362,12 @@ class Widget(QtWidgets.QWidget):
             i = self.info.timeseries_infos[index]
             if not i.valid():
                 return
-            s = self.timeseries[index]
+            s = i.get_series(self.matrices[i.matrix_index])
             kwds = {}
             if len(s.times) == 1:
                 kwds["marker"] = '.'
-            lines = ax.plot(s.times, s.intensity, label=i.get_name(), **kwds)
+            lines = plot_decimated(
+                ax, s.times, s.intensity, label=i.get_name(), **kwds)
             shown_series[index] = lines[-1]
         else:
             if index not in shown_series:
@@ -228,42 +380,36 @@ class Widget(QtWidgets.QWidget):
         self.plot.canvas.draw()
 
     @state_node(withArgs=True)
-    def seriesClicked(self, item: QtWidgets.QTableWidgetItem):
-        row = item.row()
-        self.info.show_index = row
+    def seriesClicked(self, index: QtCore.QModelIndex):
+        self.info.show_index = int(self.model.source_rows([index.row()])[0])
 
         self.click_series.emit()
 
     @state_node
     def removeSelect(self):
-        indexes = TableUtils.getSelectedRow(self.ui.tableWidget)
-        timeseries = self.timeseries
-        infos = self.info.timeseries_infos
-        for index in reversed(indexes):
-            del infos[index]
-            del timeseries[index]
+        indexes = np.sort(TableUtils.getSelectedSourceRow(self.ui.tableView))
+        self.info.remove_rows(self.matrices, indexes)
         self.shown_series = {
             index - (index > indexes).sum(): line for index, line in self.shown_series.items()}
-        yield from self.showTimeseries()
+        self.showTimeseries()
 
     @state_node
     def removeAll(self):
         self.info.timeseries_infos.clear()
-        self.timeseries.clear()
+        self.matrices.clear()
         self.shown_series.clear()
-        yield from self.showTimeseries()
+        self.showTimeseries()
         self.plot.ax.clear()
 
     @state_node(withArgs=True)
     def export(self, target: Literal["intensity", "deviation"]):
         infos = self.info.timeseries_infos
-        series = self.timeseries
         if len(infos) == 0 or all(not info.valid() for info in infos):
             return
         time_min = min(info.time_min for info in infos if info.valid())
         time_max = max(info.time_max for info in infos if info.valid())
 
-        ret, file = savefile("Timeseries", "CSV file(*.csv)",
+        ret, file = savefile("Timeseries", EXPORT_FILTER,
                              f"timeseries {target} {time_min.strftime(setting.general.export_time_format)}-{time_max.strftime(setting.general.export_time_format)}.csv")
         if not ret:
             return
@@ -271,76 +417,46 @@ class Widget(QtWidgets.QWidget):
         manager = self.manager
 
         def func():
-            delta_time = timedelta(seconds=1)
-            times = list(chain.from_iterable([s.times for s in series]))
-            times.sort()
-            last = times[-1]
-            times = [time_a for time_a, time_b in zip(
-                times, times[1:]) if time_b - time_a > delta_time]
-            times.append(last)
-
-            stimes: List[np.ndarray] = []
-            svalues: List[np.ndarray] = []
-            for s in series:
-                stimes.append(s.times)
-                match target:
-                    case "intensity":
-                        svalues.append(s.intensity)
-                    case "deviation":
-                        deviation = s.get_deviations()
-                        if len(deviation) == 0 and len(s.times) > 0:
-                            deviation = [""] * len(s.times)
-                        svalues.append(deviation)
-
-            formats = setting.timeseries.export_time_formats
-            time_formats = {k: v for k,
-                            (v, _) in converters.items() if k in formats}
-            with open(file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                row = [f"{time} time" for time in time_formats.keys()]
-
-                row.extend(i.get_name() for i in infos)
-
-                writer.writerow(row)
-
-                indexes = np.zeros(len(infos), dtype=int)
-                max_indexes = np.array([len(t) for t in stimes], dtype=int)
-
-                for current in manager.tqdm(times):
-                    select = indexes < max_indexes
-                    select &= np.array([slt and (abs(s[i] - current) < delta_time)
-                                        for slt, i, s in zip(select, indexes, stimes)])
-
-                    prt_time = current.replace(microsecond=0)
-                    row = [converter(prt_time)
-                           for converter in time_formats.values()]
-                    row.extend([(v[i] if slt else '')
-                               for slt, i, v in zip(select, indexes, svalues)])
-
-                    indexes[select] += 1
-                    writer.writerow(row)
+            all_series = self.info.get_series(self.matrices)
+            names = [i.get_name() for i in infos]
+            matrix = TimeSeriesMatrix.FromSeries(all_series, timedelta(seconds=1))
+            deviations = matrix.get_deviations(
+                [s.position_mid for s in all_series])
+            if export_binary(file, names, matrix, deviations):
+                return
+            match target:
+                case "intensity":
+                    values = matrix.intensity
+                case "deviation":
+                    values = deviations
+
+            columns = time_columns(
+                matrix.times, setting.timeseries.export_time_formats)
+            export_csv(file, list(columns) + names,
+                       [*columns.values(), values], manager.tqdm)
 
         yield func
 
     @state_node(mode='x')
     def rescale(self):
         plot = self.plot
-        series = self.timeseries
         if len(plot.ax.get_lines()) == 0:
             return
+        from matplotlib.dates import num2date
         l, r = plot.ax.get_xlim()
-        l = np.array(matplotlib.dates.num2date(
+        l = np.array(num2date(
             l).replace(tzinfo=None), dtype=np.datetime64)
-        r = np.array(matplotlib.dates.num2date(
+        r = np.array(num2date(
             r).replace(tzinfo=None), dtype=np.datetime64)
         b = 0
         t = 1
         shown_series = self.shown_series
+        infos = self.info.timeseries_infos
         for index in shown_series:
-            s = series[index]
-            sli = binary_search.indexBetween(s.times, (l, r))
-            if sli.stop > sli.start:
-                t = max(t, max(s.intensity[sli]))
+            s = infos[index].get_series(self.matrices[infos[index].matrix_index])
+            start, stop = np.searchsorted(s.times, (l, r))
+            if stop > start:
+                t = max(t, s.intensity[start:stop].max())
 
         if self.ui.logScaleCheckBox.isChecked():
             t *= 10
@@ -359,19 +475,25 @@ class Widget(QtWidgets.QWidget):
         ax.set_yscale('log' if log else 'linear')
         if not log:
             ax.yaxis.set_major_formatter(
-                matplotlib.ticker.FormatStrFormatter(r"%.1e"))
+                scientific_formatter())
         self.rescale()
 
 
+def sum_matrix(series: TimeSeries, times: List[datetime], sums: List[float]):
+    matrix = TimeSeriesMatrix.Empty(1, range_sum=True)
+    matrix.extend(times, sums, np.full(len(sums), series.position_mid))
+    return matrix
+
+
 class CalcTimeseries(MultiProcess):
     @staticmethod
-    def read(file: DiskListDirectView[Spectrum], **kwargs):
-        for spectrum in file:
-            yield spectrum
+    def read(file: DiskListDirectView[Spectrum], start: int = 0, **kwargs):
+        for index in range(start, len(file)):
+            yield file[index]
 
     @staticmethod
-    def read_len(file: DiskListDirectView[Spectrum], **kwargs) -> int:
-        return len(file)
+    def read_len(file: DiskListDirectView[Spectrum], start: int = 0, **kwargs) -> int:
+        return len(file) - start
 
     @staticmethod
     def func(spectrum: Spectrum, func: BaseFitFunc, mz_range_list: List[Tuple[float, float]], mz_cut: Tuple[float, float]):
@@ -380,28 +502,56 @@ class CalcTimeseries(MultiProcess):
 
         peaks = splitPeaks(mz, intensity)
 
-        return spectrum.start_time, [func.get_peak_max(peaks, mi, ma) for mi, ma in mz_range_list]
+        return spectrum.start_time, func.get_peaks_max(peaks, mz_range_list)
 
     @staticmethod
-    def write(file, rets: Iterable[Tuple[datetime, Iterable[Tuple[float, float]]]], series: List[TimeSeries]):
+    def write(file, rets: Iterable[Tuple[datetime, List[Optional[Tuple[float, float]]]]], count: int):
+        times = []
+        rows = []
         for time, ret in rets:
-            for r, s in zip(ret, series):
-                if r is not None:
-                    position, intensity = r
-                    s.append(time, intensity, position)
-
-        return series
+            times.append(time)
+            rows.append(ret)
+        matrix = TimeSeriesMatrix.Empty(count)
+        matrix.extend_peaks(times, rows)
+        return matrix
 
 
-class CalcSumTimeSeries(MultiProcess):
+class ExtractChromatograms(MultiProcess):
     @staticmethod
-    def read(file: DiskListDirectView[Spectrum], **kwargs):
+    def read(file: List[Path], **kwargs):
         yield from file
 
     @staticmethod
-    def read_len(file: DiskListDirectView[Spectrum], **read_kwargs) -> int:
+    def read_len(file: List[Path], **kwargs) -> int:
         return len(file)
 
+    @staticmethod
+    def func(path: Path, mz_ranges: List[Tuple[float, float]], filter: SpectrumFilter, stats_filter: StatsFilters, time_range: Optional[Tuple[datetime, datetime]] = None):
+        return path.getFileHandler().getChromatograms(mz_ranges, filter, stats_filter, time_range)
+
+    @staticmethod
+    def write(file, rets: Iterable[Tuple[np.ndarray, np.ndarray]], series: List[TimeSeries]):
+        matrix = TimeSeriesMatrix.Empty(len(series), range_sum=True, from_raw=True)
+        mids = [s.position_mid for s in series]
+        for times, intensity in rets:
+            matrix.extend(times, intensity, np.broadcast_to(mids, intensity.shape))
+        order = np.argsort(matrix.times, kind="stable")
+        matrix.times = matrix.times[order]
+        matrix.intensity = matrix.intensity[order]
+        matrix.positions = matrix.positions[order]
+        return matrix
+
+
+class CalcSumTimeSeries(MultiProcess):
+    @staticmethod
+    def read(file: DiskListDirectView[Spectrum], start: int = 0, **kwargs):
+        for index in range(start, len(file)):
+            yield file[index]
+
+    @staticmethod
+    def read_len(file: DiskListDirectView[Spectrum], start: int = 0, **read_kwargs) -> int:
+        return len(file) - start
+
     @staticmethod
     def func(spectrum: Spectrum, func: BaseFitFunc, mz_range: Tuple[float, float], target: str):
         mz, intensity = safeCutSpectrum(
@@ -412,7 +562,78 @@ class CalcSumTimeSeries(MultiProcess):
 
     @staticmethod
     def write(file, rets: Iterable[Tuple[datetime, float]], series: TimeSeries):
-        mid = (series.position_min + series.position_max) / 2
+        times = []
+        sums = []
         for dt, s in rets:
-            series.append(dt, s, mid)
-        return series
+            times.append(dt)
+            sums.append(s)
+        return sum_matrix(series, times, sums)
+
+
+class FitPeakTables(MultiProcess):
+    @staticmethod
+    def read(file: WorkSpace, start: int = 0, **kwargs):
+        spectra = file.data.calibrated_spectra
+        for index in range(start, len(spectra)):
+            yield spectra[index]
+
+    @staticmethod
+    def read_len(file: WorkSpace, start: int = 0, **read_kwargs) -> int:
+        return len(file.data.calibrated_spectra) - start
+
+    @staticmethod
+    def func(spectrum: Spectrum, func: BaseFitFunc):
+        peaks = splitPeaks(spectrum.mz, spectrum.intensity)
+        return FittedPeakTable.FromPeaks(func, peaks, start_time=spectrum.start_time)
+
+    @staticmethod
+    def write(file: WorkSpace, rets: Iterable[FittedPeakTable], append: bool = False, **kwargs):
+        obj = (file.proxy_file or file.file)._obj
+        tmp = DiskListDirectView(FittedPeakTable, obj, "tmp")
+        tmp.extend(rets)
+        if append:
+            file.data.fitted_peak_tables.extend_from(tmp)
+            return
+        path = file.data.fitted_peak_tables.obj.name
+        del obj[path]
+        obj.move(tmp.obj.name, path)
+
+    @staticmethod
+    def exception(file: WorkSpace, **kwargs):
+        obj = (file.proxy_file or file.file)._obj
+        if "tmp" in obj:
+            del obj["tmp"]
+
+
+class BuildPeakAreaIndexes(MultiProcess):
+    @staticmethod
+    def read(file: WorkSpace, start: int = 0, **kwargs):
+        spectra = file.data.calibrated_spectra
+        for index in range(start, len(spectra)):
+            yield spectra[index]
+
+    @staticmethod
+    def read_len(file: WorkSpace, start: int = 0, **read_kwargs) -> int:
+        return len(file.data.calibrated_spectra) - start
+
+    @staticmethod
+    def func(spectrum: Spectrum):
+        return PeakAreaIndex.FromSpectrum(spectrum.mz, spectrum.intensity, spectrum.start_time)
+
+    @staticmethod
+    def write(file: WorkSpace, rets: Iterable[PeakAreaIndex], append: bool = False, **kwargs):
+        obj = (file.proxy_file or file.file)._obj
+        tmp = DiskListDirectView(PeakAreaIndex, obj, "tmp")
+        tmp.extend(rets)
+        if append:
+            file.data.peak_area_indexes.extend_from(tmp)
+            return
+        path = file.data.peak_area_indexes.obj.name
+        del obj[path]
+        obj.move(tmp.obj.name, path)
+
+    @staticmethod
+    def exception(file: WorkSpace, **kwargs):
+        obj = (file.proxy_file or file.file)._obj
+        if "tmp" in obj:
+            del obj["tmp"]
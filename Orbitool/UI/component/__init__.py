@@ -1,2 +1,3 @@
-from .plot import Plot
-from . import factory
\ No newline at end of file
+from .plot import Plot, plot_decimated, scientific_formatter
+from . import factory
+from .table_model import ArrayTableModel
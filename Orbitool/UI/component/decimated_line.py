@@ -0,0 +1,38 @@
+import numpy as np
+from matplotlib.lines import Line2D
+
+from ... import setting
+from ...utils.decimation import MinMaxPyramid
+
+
+class DecimatedLine(Line2D):
+    """
+    Line showing points picked by a `MinMaxPyramid` for current x range
+    and axes width, picked again when drawn after pan, zoom or resize.
+    """
+
+    def __init__(self, x: np.ndarray, x_num: np.ndarray, y: np.ndarray, pyramid: MinMaxPyramid, **kwargs) -> None:
+        """
+        x_num: `x` converted to float by the axis
+        """
+        self.raw_x = x
+        self.raw_x_num = x_num
+        self.raw_y = y
+        self.pyramid = pyramid
+        self.view = None
+        super().__init__(x[:0], y[:0], **kwargs)
+
+    def decimate(self, x_min: float, x_max: float, width: float):
+        view = (x_min, x_max, int(width))
+        if view == self.view:
+            return
+        self.view = view
+        indexes = self.pyramid.query(
+            self.raw_x_num, self.raw_y, x_min, x_max, width * setting.plot_points_per_pixel / 2)
+        self.set_data(self.raw_x[indexes], self.raw_y[indexes])
+
+    def draw(self, renderer):
+        if self.axes is not None:
+            x_min, x_max = sorted(self.axes.viewLim.intervalx)
+            self.decimate(x_min, x_max, self.axes.bbox.width)
+        super().draw(renderer)
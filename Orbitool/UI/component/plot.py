@@ -1,18 +1,29 @@
+from __future__ import annotations
 from datetime import datetime
 from statistics import mode
+from typing import TYPE_CHECKING, Dict, List, Tuple
+import weakref
+
+import numpy as np
 from PyQt6 import QtWidgets
 from PyQt6.QtCore import QTimer
 
-from matplotlib.backend_bases import FigureCanvasBase
-from matplotlib.backends.backend_qt5agg import FigureCanvas, NavigationToolbar2QT
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-
 from ... import setting
+from ...utils.decimation import MinMaxPyramid
+
+# matplotlib is imported when the first plot is created, so worker processes
+# importing `MultiProcess` subclasses of UI modules don't load it
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.backend_bases import FigureCanvasBase
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
 
 
 class Plot:
     def __init__(self, parentWidget: QtWidgets.QWidget, tool_bar=True):
+        from matplotlib.backends.backend_qt5agg import FigureCanvas, NavigationToolbar2QT
+        from matplotlib.figure import Figure
         self.parent = parentWidget
         parentWidget.setMinimumSize(100, 100)
         parentWidget.setLayout(QtWidgets.QVBoxLayout())
@@ -50,3 +61,61 @@ class Plot:
             self.fig.tight_layout()
             self.canvas.draw()
             self.resized = False
+
+
+def scientific_formatter():
+    """
+    tick formatter like 1.0e+03
+    """
+    from matplotlib.ticker import FormatStrFormatter
+    return FormatStrFormatter(r"%.1e")
+
+
+_pyramids: Dict[Tuple[int, int], Tuple[weakref.ref, weakref.ref, MinMaxPyramid]] = {}
+
+
+def get_pyramid(x: np.ndarray, y: np.ndarray) -> MinMaxPyramid:
+    """
+    pyramids are cached as long as both `x` and `y` are alive,
+    they keep only indexes so the cache doesn't keep the arrays alive
+    """
+    key = (id(x), id(y))
+    if (cached := _pyramids.get(key)) is not None and cached[0]() is x and cached[1]() is y:
+        return cached[2]
+
+    def release(_):
+        if _pyramids.get(key) is entry:
+            del _pyramids[key]
+    entry = (weakref.ref(x, release), weakref.ref(y, release), MinMaxPyramid(y))
+    _pyramids[key] = entry
+    return entry[2]
+
+
+def pyramid_cache() -> List[MinMaxPyramid]:
+    return [pyramid for _, _, pyramid in _pyramids.values()]
+
+
+def plot_decimated(ax: Axes, x: np.ndarray, y: np.ndarray, **kwargs) -> List[Line2D]:
+    """
+    same as `ax.plot(x, y, **kwargs)`, but long lines with ascending x are
+    drawn by `DecimatedLine`
+    """
+    points_per_pixel = setting.plot_points_per_pixel
+    if points_per_pixel <= 0 or not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray) \
+            or len(x) <= ax.bbox.width * points_per_pixel:
+        return ax.plot(x, y, **kwargs)
+    x_num = np.asarray(ax.xaxis.convert_units(x), dtype=float)
+    if np.isnan(x_num).any() or np.any(x_num[1:] < x_num[:-1]):
+        return ax.plot(x, y, **kwargs)
+
+    from .decimated_line import DecimatedLine
+    pyramid = get_pyramid(x, y)
+    line = DecimatedLine(x, x_num, y, pyramid)
+    line.decimate(x_num[0], x_num[-1], ax.bbox.width)
+    # let `ax.plot` handle property cycle and autoscale, then take its place
+    template, = ax.plot(*line.get_data(), **kwargs)
+    line.update_from(template)
+    line.set_zorder(template.get_zorder())
+    template.remove()
+    ax.add_line(line)
+    return [line]
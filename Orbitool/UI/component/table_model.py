@@ -0,0 +1,207 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+
+Formatter = Callable[[object], str]
+Qt = QtCore.Qt
+RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+
+def _find(rows: np.ndarray, value: int) -> int:
+    rows = np.flatnonzero(rows == value)
+    return int(rows[0]) if len(rows) else -1
+
+
+class ArrayTableModel(QtCore.QAbstractTableModel):
+    """
+    Read only table over columns of numpy arrays (or sequences),
+    cells are formatted only when they are shown.
+    Shown rows are `rows`, an index array into the columns: filter by
+    `set_rows`, sort by header, neither rebuilds anything but the index array.
+    Columns of numpy array are sorted by values, others by formatted strings.
+    """
+    checkChanged = QtCore.pyqtSignal(int, bool)
+
+    def __init__(self, headers: Sequence[str], formatters: Optional[Sequence[Formatter]] = None, parent: Optional[QtCore.QObject] = None, alignment: Optional[Qt.AlignmentFlag] = RIGHT) -> None:
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.formatters: List[Formatter] = list(
+            formatters) if formatters is not None else [str] * len(self.headers)
+        assert len(self.formatters) == len(self.headers)
+        self.alignment = alignment
+        self.columns: List[Sequence] = [np.empty(0)] * len(self.headers)
+        self.role_data: Dict[Qt.ItemDataRole, Sequence] = {}
+        self.check_column = -1
+        self.check_states: np.ndarray = np.empty(0, dtype=np.int8)
+        self.show_source_index = False
+
+        self.filtered_rows = np.empty(0, dtype=int)
+        self.rows = self.filtered_rows
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+
+    def bind_view(self, view: QtWidgets.QTableView, sortable: bool = True):
+        """
+        click header to sort, click again to reverse and a third time to unsort
+        """
+        view.setModel(self)
+        if sortable:
+            header = view.horizontalHeader()
+            header.setSortIndicatorClearable(True)
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            view.setSortingEnabled(True)
+
+    def set_columns(self, columns: Sequence[Sequence], rows: Optional[Sequence[int]] = None):
+        """
+        `rows` is the filter on source rows, all rows if None
+        """
+        assert len(columns) == len(self.headers)
+        assert len({len(column) for column in columns}) <= 1
+        self.beginResetModel()
+        self.columns = list(columns)
+        self.role_data.clear()
+        self.check_column = -1
+        self._set_rows(np.arange(len(columns[0])) if rows is None else rows)
+        self.endResetModel()
+
+    def set_rows(self, rows: Sequence[int]):
+        self.beginResetModel()
+        self._set_rows(rows)
+        self.endResetModel()
+
+    def _set_rows(self, rows: Sequence[int]):
+        self.filtered_rows = np.asarray(rows, dtype=int)
+        self.rows = self.filtered_rows
+        if self.sort_column >= 0:
+            self.rows = self.filtered_rows[self._sorted_order()]
+
+    def clear(self):
+        self.set_columns([np.empty(0)] * len(self.headers))
+
+    def set_role_data(self, role: Qt.ItemDataRole, values: Sequence):
+        """
+        `values` for each source row, shared by all columns
+        """
+        self.role_data[role] = values
+        self._all_changed([role])
+
+    def set_check_states(self, column: int, states: Sequence[int]):
+        """
+        `states` for each source row, -1 for not checkable, 0 / 1 for unchecked / checked
+        """
+        self.check_column = column
+        self.check_states = np.asarray(states, dtype=np.int8)
+        self._all_changed([Qt.ItemDataRole.CheckStateRole])
+
+    def _all_changed(self, roles: List[Qt.ItemDataRole]):
+        if len(self.rows):
+            self.dataChanged.emit(self.index(0, 0), self.index(
+                len(self.rows) - 1, len(self.headers) - 1), roles)
+
+    def source_rows(self, rows: Sequence[int]) -> np.ndarray:
+        return self.rows[np.asarray(rows, dtype=int)]
+
+    def view_row(self, source_row: int) -> int:
+        """
+        -1 if not shown
+        """
+        return _find(self.rows, source_row)
+
+    def filtered_position(self, row: int) -> int:
+        """
+        position of view row in the unsorted filtered rows
+        """
+        if self.sort_column < 0:
+            return row
+        return _find(self.filtered_rows, self.rows[row])
+
+    def view_row_of_filtered(self, position: int) -> int:
+        """
+        view row of position in the unsorted filtered rows
+        """
+        if self.sort_column < 0:
+            return position
+        return self.view_row(self.filtered_rows[position])
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                return self.formatters[column](self.columns[column][row])
+            case Qt.ItemDataRole.TextAlignmentRole:
+                return self.alignment
+            case Qt.ItemDataRole.CheckStateRole:
+                if column != self.check_column or self.check_states[row] < 0:
+                    return None
+                return Qt.CheckState.Checked if self.check_states[row] else Qt.CheckState.Unchecked
+        if (values := self.role_data.get(role)) is not None:
+            return values[row]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.check_column and self.check_states[self.rows[index.row()]] >= 0:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index: QtCore.QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.CheckStateRole or not self.flags(index) & Qt.ItemFlag.ItemIsUserCheckable:
+            return False
+        row = int(self.rows[index.row()])
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.check_states[row] = checked
+        self.dataChanged.emit(index, index, [role])
+        self.checkChanged.emit(row, checked)
+        return True
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(self.rows[section] if self.show_source_index else section + 1)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        column < 0 for the filtered order
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.rows[index.row()] for index in persistent]
+
+        self.sort_column = column
+        self.sort_order = order
+        self.rows = self.filtered_rows if column < 0 else self.filtered_rows[self._sorted_order()]
+
+        positions = np.empty(len(self.columns[0]), dtype=int)
+        positions[self.rows] = np.arange(len(self.rows))
+        self.changePersistentIndexList(persistent, [self.index(
+            positions[source], index.column()) for index, source in zip(persistent, sources)])
+        self.layoutChanged.emit()
+
+    def _sorted_order(self) -> np.ndarray:
+        column = self.columns[self.sort_column]
+        if isinstance(column, np.ndarray):
+            keys = column[self.filtered_rows]
+        else:
+            formatter = self.formatters[self.sort_column]
+            keys = np.array([formatter(column[row])
+                            for row in self.filtered_rows.tolist()])
+        order = np.argsort(keys, kind="stable")
+        if self.sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1]
+        return order
@@ -0,0 +1,51 @@
+import gc
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ..decimated_line import DecimatedLine
+from ..plot import get_pyramid, plot_decimated, pyramid_cache
+
+
+def test_plot_decimated():
+    fig = Figure(figsize=(4, 3), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    x = np.linspace(100, 200, 200001)
+    y = np.sin(x) ** 2
+    y[150000] = 10
+    line, = plot_decimated(ax, x, y, color='k', label="spectrum")
+    small, = plot_decimated(ax, x[:10], y[:10])
+    assert isinstance(line, DecimatedLine)
+    assert not isinstance(small, DecimatedLine)
+    assert line.get_label() == "spectrum"
+
+    canvas.draw()
+    assert len(line.get_xdata()) < 2000
+    assert line.get_ydata().max() == 10
+    assert ax.get_xlim()[0] < 100 and ax.get_xlim()[1] > 200
+
+    x_min, x_max = 150.0001, 151.0001
+    ax.set_xlim(x_min, x_max)
+    canvas.draw()
+    xdata = line.get_xdata()
+    assert xdata[0] < x_min and xdata[-1] > x_max
+    assert xdata[1] >= x_min and xdata[-2] <= x_max
+
+
+def test_pyramid_released():
+    x = np.linspace(100, 200, 10000)
+    y = np.sin(x)
+    pyramid = get_pyramid(x, y)
+    assert get_pyramid(x, y) is pyramid
+    assert get_pyramid(x, y.copy()) is not pyramid
+    assert len(pyramid_cache()) == 2
+
+    fig = Figure(figsize=(4, 3), dpi=100)
+    FigureCanvasAgg(fig)
+    plot_decimated(fig.subplots(), x, y)
+    del fig, pyramid, x, y
+    gc.collect()
+    assert pyramid_cache() == []
@@ -0,0 +1,61 @@
+import numpy as np
+from PyQt6 import QtCore
+
+from ..table_model import ArrayTableModel
+
+
+def test_array_table_model():
+    model = ArrayTableModel(["mz", "intensity"], [
+        lambda v: format(v, '.2f'), str])
+    assert model.rowCount() == 0
+    assert model.columnCount() == 2
+    assert model.headerData(
+        1, QtCore.Qt.Orientation.Horizontal) == "intensity"
+
+    model.set_columns([np.array([1., 2.5, 3.]), np.array([4, 5, 6])])
+    assert model.rowCount() == 3
+    assert model.data(model.index(1, 0)) == "2.50"
+    assert model.data(model.index(2, 1)) == "6"
+    assert model.data(model.index(5, 1)) is None
+
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_array_table_model_rows():
+    model = ArrayTableModel(["mz", "formula"], [
+        lambda v: format(v, '.1f'), lambda v: ', '.join(v)])
+    model.set_columns([np.array([3., 1., 2., 5.]), [
+        ["b"], ["d"], ["a", "c"], []]], [0, 1, 2])
+    assert model.rowCount() == 3
+
+    model.sort(0)
+    assert model.source_rows([0, 1, 2]).tolist() == [1, 2, 0]
+    assert model.data(model.index(0, 0)) == "1.0"
+    assert model.filtered_position(0) == 1
+    assert model.view_row_of_filtered(0) == 2
+
+    model.sort(1, QtCore.Qt.SortOrder.DescendingOrder)
+    assert model.source_rows([0, 1, 2]).tolist() == [1, 0, 2]
+
+    model.set_rows([3, 2])
+    assert model.source_rows([0, 1]).tolist() == [2, 3]
+    assert model.view_row(1) == -1
+
+    model.sort(-1)
+    assert model.source_rows([0, 1]).tolist() == [3, 2]
+
+
+def test_array_table_model_check():
+    model = ArrayTableModel(["show", "tag"])
+    model.set_columns([["", "E", ""], ["a", "b", "c"]])
+    model.set_check_states(0, [1, -1, 0])
+    changed = []
+    model.checkChanged.connect(lambda row, checked: changed.append((row, checked)))
+
+    Qt = QtCore.Qt
+    assert model.data(model.index(0, 0), Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+    assert model.data(model.index(1, 0), Qt.ItemDataRole.CheckStateRole) is None
+    assert not model.setData(model.index(1, 0), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert model.setData(model.index(2, 0), Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+    assert changed == [(2, True)]
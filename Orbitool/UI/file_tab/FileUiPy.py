@@ -5,6 +5,7 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 
 from Orbitool import utils
 from Orbitool.models.file import FileSpectrumInfo, Path, PathList
+from Orbitool.utils.readers import reader_for_file, supported_suffixes
 from Orbitool.UI.utils.utils import TableUtils
 
 from .. import utils as UiUtils
@@ -27,6 +28,7 @@ class Widget(QtWidgets.QWidget):
 
         manager.init_or_restored.connect(self.init_or_restore)
         manager.save.connect(self.updateState)
+        manager.getters.file_time_range.connect(self.timeRange)
 
     def setupUi(self):
         self.ui.setupUi(self)
@@ -38,7 +40,7 @@ class Widget(QtWidgets.QWidget):
         ui.tableWidget.dragMoveEvent = self.tableDragMoveEvent
         ui.tableWidget.dropEvent = self.tableDropEvent
 
-        ui.addFilePushButton.clicked.connect(self.addThermoFile)
+        ui.addFilePushButton.clicked.connect(self.addFile)
         ui.addFolderPushButton.clicked.connect(self.addFolder)
         ui.removeFilePushButton.clicked.connect(self.removePath)
 
@@ -86,16 +88,17 @@ class Widget(QtWidgets.QWidget):
         dialog.exec()
 
     @state_node
-    def addThermoFile(self):
+    def addFile(self):
         files = UiUtils.openfiles(
-            "Select one or more files", "RAW files(*.RAW)")
+            "Select one or more files",
+            f"Spectrum files({' '.join('*' + suffix for suffix in supported_suffixes())})")
         pathlist = self.pathlist
 
         info = self.info
 
         def func():
             for f in files:
-                path = pathlist.addThermoFile(f)
+                path = pathlist.addFile(f)
                 for filter in path.getFileHandler().getUniqueFilters():
                     info.add_filter(filter)
 
@@ -108,8 +111,8 @@ class Widget(QtWidgets.QWidget):
         self.showPaths()
         self.filter_helper.show_filter()
 
-    @addThermoFile.except_node
-    def addThermoFile(self):
+    @addFile.except_node
+    def addFile(self):
         self.showPaths()
 
     @state_node
@@ -123,8 +126,10 @@ class Widget(QtWidgets.QWidget):
         manager = self.manager
 
         def func():
-            for path in manager.tqdm(utils.files.FolderTraveler(folder, ext=".RAW", recurrent=self.ui.recursionCheckBox.isChecked())):
-                p = pathlist.addThermoFile(path)
+            for path in manager.tqdm(utils.files.FolderTraveler(folder, ext=supported_suffixes(), recurrent=self.ui.recursionCheckBox.isChecked())):
+                if reader_for_file(path) is None:
+                    continue
+                p = pathlist.addFile(path)
                 for filter in p.getFileHandler().getUniqueFilters():
                     info.add_filter(filter)
             pathlist.sort()
@@ -163,11 +168,13 @@ class Widget(QtWidgets.QWidget):
             pathlist = self.pathlist
             for p in paths:
                 if p.is_dir():
-                    for path in self.manager.tqdm(utils.files.FolderTraveler(str(p), ext=".RAW", recurrent=self.ui.recursionCheckBox.isChecked())):
-                        for filter in pathlist.addThermoFile(path).getFileHandler().getUniqueFilters():
+                    for path in self.manager.tqdm(utils.files.FolderTraveler(str(p), ext=supported_suffixes(), recurrent=self.ui.recursionCheckBox.isChecked())):
+                        if reader_for_file(path) is None:
+                            continue
+                        for filter in pathlist.addFile(path).getFileHandler().getUniqueFilters():
                             info.add_filter(filter)
-                elif p.suffix.lower() == ".raw":
-                    for filter in pathlist.addThermoFile(str(p)).getFileHandler().getUniqueFilters():
+                elif p.suffix.lower() in supported_suffixes():
+                    for filter in pathlist.addFile(str(p)).getFileHandler().getUniqueFilters():
                         info.add_filter(filter)
             pathlist.sort()
             self.filter_helper.refresh_filter_polarity()
@@ -247,10 +254,14 @@ class Widget(QtWidgets.QWidget):
 
         self.callback.emit()
 
+    def timeRange(self):
+        ui = self.ui
+        return (ui.startDateTimeEdit.dateTime().toPyDateTime(),
+                ui.endDateTimeEdit.dateTime().toPyDateTime())
+
     def _process_paths(self, paths: List[Path]):
         ui = self.ui
-        time_range = (ui.startDateTimeEdit.dateTime().toPyDateTime(),
-                      ui.endDateTimeEdit.dateTime().toPyDateTime())
+        time_range = self.timeRange()
 
         self.info.rtol = ui.rtolDoubleSpinBox.value() * 1e-6
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 from contextlib import contextmanager
 
+import multiprocessing
+import time
 import weakref
 from datetime import datetime
 from functools import wraps
 from typing import (
     Callable, Dict, Generic, Iterable, Iterator, Type, TypeVar,
-    List, overload, Set, Sized)
+    List, overload, Set, Sized, Tuple)
 from types import MethodType
 
 import numpy as np
@@ -14,6 +16,7 @@ from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QMainWindow, QTableWidget
 
 from Orbitool.models.workspace import WorkSpace
+from Orbitool.utils.memory import MemoryCounter, MemoryUsage
 
 
 class BindData:
@@ -28,6 +31,7 @@ class Values:
         )
         self.spectra_list_selected_index: ValueGetter[int] = ValueGetter()
         self.peak_list_selected_true_index: ValueGetter[List[int]] = ValueGetter()
+        self.file_time_range: ValueGetter[Tuple[datetime, datetime]] = ValueGetter()
 
 
 class Signals:
@@ -72,6 +76,20 @@ class Manager(QObject):
     def busy(self):
         return self._busy
 
+    def memory_report(self) -> List[MemoryUsage]:
+        """
+        `WorkSpace.memory_report` and caches of UI
+        """
+        from ..component.plot import pyramid_cache
+        counter = MemoryCounter()
+        rows = self.workspace.memory_report(counter)
+        caches = [counter.measure("plot_pyramids", pyramid_cache()),
+                  counter.measure("thread_result", getattr(self.running_thread, "result", None))]
+        row = sum(caches, MemoryUsage("cache"))
+        row.children = caches
+        rows.append(row)
+        return rows
+
     @contextmanager
     def not_check(self):
         busy = self.busy
@@ -88,6 +106,9 @@ T = TypeVar("T")
 
 
 class TQDM(Generic[T]):
+    # seconds between two messages, except the first and the last one
+    interval = .05
+
     def __init__(self, callback_func, iter: Iterable = None, length: int = 0, msg: str = "") -> None:
         self.callback_func = callback_func
         self.iter = iter
@@ -96,46 +117,76 @@ class TQDM(Generic[T]):
         self.length = length
         self.now = 0
 
-        self.begin_time = self.last_show_time = datetime.now()
+        self.begin_time = self.next_show_time = time.monotonic()
 
     def showMsg(self):
-        now = datetime.now()
-        if (now - self.last_show_time).total_seconds() > .01 or self.length < 1000:
-            passed_time = now - self.begin_time
-            if self.length > self.now:
-                if self.now:
-                    left_time = passed_time * \
-                        (self.length - self.now) / self.now
-                    minute = int(left_time.total_seconds() / 60)
-                    second = format(left_time.total_seconds() % 60, '.2f')
-                else:
-                    minute = "inf"
-                    second = "inf"
-                text = f"{self.msg} {self.now}/{self.length} ~{minute}:{second}"
-                percent = 100 * self.now // self.length
+        now = time.monotonic()
+        passed_time = now - self.begin_time
+        if self.length > self.now:
+            if self.now:
+                left_time = passed_time * (self.length - self.now) / self.now
+                minute = int(left_time / 60)
+                second = format(left_time % 60, '.2f')
             else:
-                minute = int(passed_time.total_seconds() / 60)
-                second = format(passed_time.total_seconds() % 60, '.2f')
-                text = f"{self.msg} {self.now} {minute}:{second} passed"
-                if self.length == self.now:
-                    percent = 100
-                else:
-                    percent = 70
-            self.callback_func(percent, text)
-            self.last_show_time = now
+                minute = "inf"
+                second = "inf"
+            text = f"{self.msg} {self.now}/{self.length} ~{minute}:{second}"
+            percent = 100 * self.now // self.length
+        else:
+            minute = int(passed_time / 60)
+            second = format(passed_time % 60, '.2f')
+            text = f"{self.msg} {self.now} {minute}:{second} passed"
+            if self.length == self.now:
+                percent = 100
+            else:
+                percent = 70
+        self.callback_func(percent, text)
+        self.next_show_time = now + self.interval
 
     def start_time(self):
-        self.begin_time = datetime.now()
+        self.begin_time = time.monotonic()
 
     def update(self, step=1):
+        """
+        `step` could be a batch of items, message is throttled by `interval`
+        """
         self.now += step
-        self.showMsg()
+        if self.now == self.length or time.monotonic() >= self.next_show_time:
+            self.showMsg()
+
+    def update_to(self, now: int):
+        """
+        for progress counted elsewhere, like `SharedCounter`
+        """
+        if now != self.now:
+            self.update(now - self.now)
 
     def __iter__(self) -> Iterator[T]:
         self.start_time()
+        clock = time.monotonic
         for x in self.iter:
-            self.update()
+            self.now += 1
+            if clock() >= self.next_show_time:
+                self.showMsg()
             yield x
+        self.showMsg()
+
+
+class SharedCounter:
+    """
+    counter in shared memory, could be increased by threads and by processes
+    which get it on creation, like `Pool(initargs=(counter,))`
+    """
+
+    def __init__(self) -> None:
+        self.value = multiprocessing.Value('q', 0)
+
+    def add(self, step: int = 1):
+        with self.value.get_lock():
+            self.value.value += step
+
+    def get(self) -> int:
+        return self.value.value
 
 
 class TQDMER(QObject):
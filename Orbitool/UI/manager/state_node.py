@@ -6,8 +6,10 @@ from PyQt6 import QtCore
 
 from ... import setting
 from ..utils import showInfo, sleep
+from . import trace
 from .manager import Manager
 from .thread import MultiProcess, Thread, threadtype
+from .trace import tracer
 
 
 class NodeType(Enum):
@@ -23,6 +25,21 @@ _busy_set = {'w', 'x'}
 _busy_reset = {'w', 'x', 'a'}
 
 
+def _finish_trace(manager: Manager, name: str, begin, trace_id: int):
+    span = tracer.record(name, "node", begin, trace_id)
+    spans = tracer.pop(trace_id)
+    if len(spans) == 1:  # no thread started
+        return
+    logger = logging.getLogger("Orbitool")
+    logger.info("\n".join([f"trace of {name}"] + trace.summary(spans)))
+    try:
+        trace.dump(spans)
+    except OSError as e:
+        logger.error(str(e), exc_info=e)
+    manager.msg.emit(
+        f"{name} {span.duration:.2f}s, cpu {sum(s.cpu for s in spans):.2f}s, see log and {trace.TRACE_PATH.name}")
+
+
 class node:
     """
     @thread_node
@@ -75,6 +92,16 @@ class node:
                 # else:
                 showInfo("Wait for process", 'busy')
                 return
+            # only busy nodes are traced, others may run inside them
+            if setting.debug.trace and self._mode in _busy_set:
+                trace_begin, trace_id = trace.now(), tracer.new_id()
+            else:
+                trace_begin, trace_id = None, 0
+
+            def finish_trace():
+                if trace_begin is not None:
+                    _finish_trace(manager, func.__qualname__, trace_begin, trace_id)
+
             try:
                 ret = func(
                     selfWidget, *args, **kwargs) if self._withArgs else func(selfWidget)
@@ -101,6 +128,9 @@ class node:
                                 thread = Thread(to_be_finished)
                             else:
                                 thread = to_be_finished
+                            if isinstance(thread, (Thread, MultiProcess)):
+                                thread.trace_name = f"{thread.trace_name} ({msg})"
+                                thread.trace_id = trace_id
                             thread.set_tqdmer(manager.tqdm)
                             thread.finished.connect(run_send)
                             manager.running_thread = thread
@@ -109,8 +139,10 @@ class node:
                             else:
                                 thread.start()
                         except StopIteration:
+                            finish_trace()
                             manager.set_busy(False)
                         except Exception as e:
+                            finish_trace()
                             logger = logging.getLogger("Orbitool")
                             logger.error(str(e), exc_info=e)
                             showInfo(str(e))
@@ -121,10 +153,13 @@ class node:
 
                     run_send(None)
 
-                elif self._mode in _busy_reset:
-                    manager.set_busy(False)
-                    return ret
+                else:
+                    finish_trace()
+                    if self._mode in _busy_reset:
+                        manager.set_busy(False)
+                        return ret
             except Exception as e:
+                finish_trace()
                 logger = logging.getLogger("Orbitool")
                 logger.error(str(e), exc_info=e)
                 showInfo(repr(e))
@@ -0,0 +1,34 @@
+from threading import Thread
+
+from ..manager import TQDM, SharedCounter
+
+
+def test_tqdm_throttle():
+    messages = []
+    tqdm = TQDM(lambda percent, msg: messages.append(percent),
+                range(100000), 100000, "loop")
+    assert sum(1 for _ in tqdm) == 100000
+    assert 1 <= len(messages) < 1000
+    assert messages[-1] == 100
+
+    messages.clear()
+    tqdm = TQDM(lambda percent, msg: messages.append(percent), length=100)
+    tqdm.update(10)
+    tqdm.update(10)
+    assert messages == [10]
+    tqdm.update_to(100)
+    assert messages == [10, 100]
+
+
+def test_shared_counter():
+    counter = SharedCounter()
+
+    def add():
+        for _ in range(1000):
+            counter.add()
+    threads = [Thread(target=add) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.get() == 4000
@@ -0,0 +1,102 @@
+import json
+from types import SimpleNamespace
+
+from PyQt6 import QtWidgets
+
+from Orbitool import setting
+
+from .. import Thread, state_node, trace
+from ..trace import Span, tracer
+from .test_multiprocess import p
+
+
+def test_summary():
+    spans = [Span("func", "process", 1, .5, .4, 1, 1, {"bytes": 2**20, "queue_wait": .1}),
+             Span("func", "process", 2, .5, .4, 2, 1, {"bytes": 2**20, "queue_wait": .2}),
+             Span("func", "submit", 0, .1, .1, 0, 1, {"in_flight": 3})]
+    assert trace.summary(spans) == [
+        "submit func: 1x wall 0.100s cpu 0.100s max in flight 3",
+        "process func: 2x wall 1.000s cpu 0.800s 2.00MB queue wait 0.300s in 2 processes"]
+
+    event = trace.chrome_trace(spans)["traceEvents"][0]
+    assert event["ph"] == "X" and event["ts"] == 1e6 and event["dur"] == 5e5
+    assert event["args"]["bytes"] == 2**20
+    json.dumps(trace.chrome_trace(spans))
+
+
+def test_trace_threads(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    monkeypatch.setattr(setting.debug, "NO_MULTIPROCESS", True)
+
+    trace_id = tracer.new_id()
+    monkeypatch.setattr(setting.debug, "trace", False)
+    thread = Thread(sum, ([1, 2],))
+    thread.trace_id = trace_id
+    thread.run()
+    assert tracer.pop(trace_id) == []
+
+    monkeypatch.setattr(setting.debug, "trace", True)
+    thread = Thread(sum, ([1, 2],))
+    thread.trace_id = trace_id
+    thread.run()
+    assert thread.result == 3
+    pp = p({}, {"length": 5})
+    pp.trace_id = trace_id
+    pp.run()
+    assert pp.result == (5,)
+    # spans of another trace are left
+    other = Thread(sum, ([1, 2],))
+    other.trace_id = tracer.new_id()
+    other.run()
+
+    spans = tracer.pop(trace_id)
+    assert [(span.category, span.name) for span in spans] == \
+        [("thread", "sum")] + [("process", "p.func")] * 5 + [("multiprocess", "p")]
+    assert [span.args["index"] for span in spans[1:6]] == list(range(5))
+    assert [span.name for span in tracer.pop(other.trace_id)] == ["sum"]
+
+
+def test_trace_nodes(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    monkeypatch.setattr(setting.debug, "trace", True)
+    monkeypatch.setattr(setting.debug, "thread_block_gui", True)
+    dumped = []
+    monkeypatch.setattr(trace, "dump", dumped.append)
+
+    class Manager:
+        busy = False
+        running_thread = None
+
+        def __init__(self):
+            self.msg = SimpleNamespace(emit=lambda msg: None)
+
+        def set_busy(self, busy):
+            self.busy = busy
+
+        def tqdm(self, *args, **kwargs):
+            pass
+
+    class Widget:
+        manager = Manager()
+
+        @state_node
+        def with_thread(self):
+            self.show()
+            yield lambda: sum([1, 2])
+            self.show()
+
+        @state_node(mode='n')
+        def show(self):
+            pass
+
+        @state_node
+        def without_thread(self):
+            self.show()
+
+    widget = Widget()
+    widget.without_thread()
+    assert dumped == []
+    widget.with_thread()
+    assert len(dumped) == 1
+    assert sorted(span.category for span in dumped[0]) == ["node", "thread"]
+    assert tracer.pop(0) == []
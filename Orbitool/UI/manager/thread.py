@@ -1,18 +1,20 @@
 import logging
+import pickle
 from collections import deque
 from enum import Enum
 from multiprocessing import Pool
 from multiprocessing.pool import AsyncResult
 from queue import Queue
-from typing import (Any, Deque, Generator, Generic, Iterable, List, Tuple,
-                    TypeVar, final)
+from typing import (Any, Deque, Dict, Generator, Generic, Iterable, List,
+                    Tuple, TypeVar, final)
 
 from PyQt6 import QtCore
 
 from ... import setting
 from Orbitool.config import _Setting
 from ..utils import sleep
-from . import manager
+from . import manager, trace
+from .trace import tracer
 
 logger = logging.getLogger("Orbitool")
 
@@ -31,15 +33,20 @@ class Thread(QtCore.QThread):
         self.args = args
         self.kwargs = kwargs
         self.result = None
+        self.trace_name = getattr(func, "__qualname__", str(func))
+        self.trace_id = 0
 
     def run(self):
+        if setting.debug.trace:
+            begin = trace.now()
         try:
             result = self.func(*self.args, **self.kwargs)
             self.result = result
-            self.finished.emit((result,))
         except Exception as e:
             self.result = e
-            self.finished.emit((e, ))
+        if setting.debug.trace:
+            tracer.record(self.trace_name, "thread", begin, self.trace_id)
+        self.finished.emit((self.result,))
 
     def set_tqdmer(self, tqdmer: manager.TQDMER):
         pass
@@ -48,12 +55,20 @@ class Thread(QtCore.QThread):
 Data = TypeVar("Data")
 Result = TypeVar("Result")
 
-def init_process(main_setting: _Setting):
+# processed items of current `MultiProcess`, only set in worker processes
+processed_counter: manager.SharedCounter = None
+in_worker = False
+
+
+def init_process(main_setting: _Setting, counter: manager.SharedCounter = None):
     import os
     os.environ["OPENBLAS_NUM_THREADS"] = "1"
     os.environ["GOTO_NUM_THREADS"] = "1"
     os.environ["OMP_NUM_THREADS"] = "1"
     setting.update_from(main_setting)
+    global processed_counter, in_worker
+    processed_counter = counter
+    in_worker = True
 
 class MultiProcess(QtCore.QThread, Generic[Data, Result]):
     finished = QtCore.pyqtSignal(tuple)
@@ -68,6 +83,8 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
         self.aborted = False
         self.tqdm: manager.TQDMER = None
         self.result = None
+        self.trace_name = type(self).__name__
+        self.trace_id = 0
 
     @final
     def finished_emit(self, t: tuple):
@@ -80,6 +97,8 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
 
     @final
     def run(self):
+        if setting.debug.trace:
+            begin = trace.now()
         try:
             if self.tqdm is None:
                 self.tqdm = manager.TQDMER()
@@ -89,6 +108,8 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
                 self._run()
         except Exception as e:
             self.finished_emit((e,))
+        if setting.debug.trace:
+            tracer.record(self.trace_name, "multiprocess", begin, self.trace_id)
 
     @final
     def _run(self):
@@ -97,13 +118,22 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
         queue = Queue()
         length = self.read_len(file, **self.read_kwargs)
         lock = QtCore.QMutex()
+        tracing = setting.debug.trace
+        name = self.trace_name
+        trace_id = self.trace_id
+        # index -> time of submit, for queue wait of worker
+        submitted: Dict[int, float] = {}
 
         def read_iter():
             it = iter(self.read(file, **self.read_kwargs))
             while True:
                 try:
                     lock.lock()
+                    if tracing:
+                        begin = trace.now()
                     value = next(it)
+                    if tracing:
+                        tracer.record(name, "read", begin, trace_id)
                 except StopIteration as e:
                     return
                 finally:
@@ -117,18 +147,29 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
                 if result is None:
                     break
                 lock.lock()
-                yield result
+                if tracing:
+                    result, put_time = result
+                    begin = trace.now()
+                    yield result
+                    tracer.record(name, "write", begin, trace_id,
+                                  queue_wait=begin[0] - put_time)
+                else:
+                    yield result
                 lock.unlock()
                 tqdm.update()
 
         write_thread = Thread(
             self.write, (file, write_queue()), self.write_kwargs)
+        write_thread.trace_id = trace_id
         write_thread.start()
 
         multi_cores = setting.general.multi_cores
         times = setting.pop_global_val("multi-process-tmp-times", 1.)
 
-        with Pool(multi_cores, initializer=init_process, initargs=(setting,)) as pool:
+        counter = manager.SharedCounter()
+        process_tqdm = self.tqdm(msg="process", length=length)
+
+        with Pool(multi_cores, initializer=init_process, initargs=(setting, counter)) as pool:
             def abort():
                 queue.put(None)
                 pool.terminate()
@@ -146,16 +187,24 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
                         if not_ready_num < multi_cores and len(results) < times * multi_cores:
                             return
                     sleep(.1)
+                    process_tqdm.update_to(counter.get())
                     if self.aborted:
                         return
                 while len(results) > 0 and results[0].ready():
                     ret = results.popleft().get()
+                    if isinstance(ret, trace.Traced):
+                        span = ret.span
+                        ret = ret.result
+                        span.args["queue_wait"] = span.start - \
+                            submitted.pop(span.args["index"])
+                        span.trace_id = trace_id
+                        tracer.add(span)
                     if isinstance(ret, Exception):
                         self.finished_emit(
                             (ret, (self.func, self.file)))
                         self.abort()
                         return
-                    queue.put(ret)
+                    queue.put((ret, trace.now()[0]) if tracing else ret)
 
             for i, input_data in self.tqdm(
                     enumerate(read_iter()),
@@ -164,14 +213,22 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
 
                 if self.aborted:
                     return abort()
+                if tracing:
+                    begin = trace.now()
+                    size = len(pickle.dumps(input_data))
+                    submitted[i] = begin[0]
                 results.append(pool.apply_async(
                     self.process, (i, self.func, input_data, self.func_kwargs)))
+                if tracing:
+                    tracer.record(name, "submit", begin, trace_id, index=i,
+                                  bytes=size, in_flight=len(results))
                 wait_to_ready(False)
 
             while results:
                 if self.aborted:
                     return abort()
                 wait_to_ready(True)
+            process_tqdm.update_to(counter.get())
 
             queue.put(None)
 
@@ -184,7 +241,12 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
 
         def read_process():
             for i, data in enumerate(self.tqdm(self.read(file, **self.read_kwargs), "process")):
-                yield self.process(i, self.func, data, self.func_kwargs)
+                ret = self.process(i, self.func, data, self.func_kwargs)
+                if isinstance(ret, trace.Traced):
+                    ret.span.trace_id = self.trace_id
+                    tracer.add(ret.span)
+                    ret = ret.result
+                yield ret
         ret = self.write(file, read_process(), **self.write_kwargs)
         self.finished_emit((ret,))
 
@@ -198,11 +260,22 @@ class MultiProcess(QtCore.QThread, Generic[Data, Result]):
     @final
     @staticmethod
     def process(label, func, data, kwargs):
+        if setting.debug.trace:
+            begin = trace.now()
         try:
             ret = func(data, **kwargs)
         except Exception as e:
             logger.error(str(e), exc_info=e)
-            return e
+            ret = e
+        finally:
+            if processed_counter is not None:
+                processed_counter.add()
+        if setting.debug.trace:
+            span = trace.Span.since(
+                getattr(func, "__qualname__", str(func)), "process", begin, index=label)
+            if in_worker:
+                span.args["bytes"] = len(pickle.dumps(ret))
+            return trace.Traced(ret, span)
         return ret
 
     @staticmethod
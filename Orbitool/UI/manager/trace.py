@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from os import getpid
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from Orbitool.config import ROOT_PATH
+
+TRACE_PATH = ROOT_PATH / "trace.json"
+
+
+def now() -> Tuple[float, float]:
+    """
+    wall time (comparable between processes) and cpu time of current thread
+    """
+    return time.perf_counter(), time.thread_time()
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start: float
+    duration: float
+    cpu: float
+    pid: int
+    tid: int
+    args: Dict[str, Any] = field(default_factory=dict)
+    # id of the traced `state_node` call, 0 if none
+    trace_id: int = 0
+
+    @classmethod
+    def since(cls, name: str, category: str, begin: Tuple[float, float], trace_id: int = 0, **args):
+        wall, cpu = now()
+        return cls(name, category, begin[0], wall - begin[0], cpu - begin[1],
+                   getpid(), threading.get_native_id(), args, trace_id)
+
+    def chrome_event(self) -> dict:
+        return {
+            "name": self.name, "cat": self.category, "ph": "X",
+            "ts": self.start * 1e6, "dur": self.duration * 1e6,
+            "pid": self.pid, "tid": self.tid,
+            "args": {"cpu_ms": self.cpu * 1e3, **self.args}}
+
+
+@dataclass
+class Traced:
+    """
+    result of a worker process with its span
+    """
+    result: Any
+    span: Span
+
+
+class Tracer:
+    """
+    Spans of `state_node` steps and `MultiProcess` stages,
+    only recorded when `setting.debug.trace` is True.
+    Spans are grouped by trace id, one for each traced `state_node` call.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.spans: List[Span] = []
+        self.last_id = 0
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.last_id += 1
+            return self.last_id
+
+    def add(self, span: Span):
+        with self.lock:
+            self.spans.append(span)
+
+    def record(self, name: str, category: str, begin: Tuple[float, float], trace_id: int = 0, **args) -> Span:
+        span = Span.since(name, category, begin, trace_id, **args)
+        self.add(span)
+        return span
+
+    def pop(self, trace_id: int) -> List[Span]:
+        """
+        remove and return spans of `trace_id`
+        """
+        with self.lock:
+            spans = [span for span in self.spans if span.trace_id == trace_id]
+            self.spans = [span for span in self.spans if span.trace_id != trace_id]
+        return spans
+
+
+tracer = Tracer()
+
+
+def summary(spans: List[Span]) -> List[str]:
+    """
+    a line for each category and name, in order of first start
+    """
+    groups: Dict[Tuple[str, str], List[Span]] = defaultdict(list)
+    for span in sorted(spans, key=lambda span: span.start):
+        groups[span.category, span.name].append(span)
+    lines = []
+    for (category, name), group in groups.items():
+        wall = sum(span.duration for span in group)
+        cpu = sum(span.cpu for span in group)
+        line = f"{category} {name}: {len(group)}x wall {wall:.3f}s cpu {cpu:.3f}s"
+        sums: Dict[str, float] = defaultdict(float)
+        maxs: Dict[str, float] = defaultdict(float)
+        for span in group:
+            for key, value in span.args.items():
+                if isinstance(value, (int, float)):
+                    sums[key] += value
+                    maxs[key] = max(maxs[key], value)
+        if "bytes" in sums:
+            line += f" {sums['bytes'] / 2**20:.2f}MB"
+        if "queue_wait" in sums:
+            line += f" queue wait {sums['queue_wait']:.3f}s"
+        if "in_flight" in maxs:
+            line += f" max in flight {int(maxs['in_flight'])}"
+        if len({span.pid for span in group}) > 1:
+            line += f" in {len({span.pid for span in group})} processes"
+        lines.append(line)
+    return lines
+
+
+def chrome_trace(spans: List[Span]) -> dict:
+    """
+    open in chrome://tracing or https://ui.perfetto.dev
+    """
+    return {"traceEvents": [span.chrome_event() for span in spans],
+            "displayTimeUnit": "ms"}
+
+
+def dump(spans: List[Span], path: Path = TRACE_PATH):
+    Path(path).write_text(json.dumps(chrome_trace(spans)))
@@ -24,6 +24,14 @@ class Tab(BaseTab):
         ui.mzRangeTargetComboBox.setCurrentText(timeseries.mz_sum_target)
         ui.mzRangePeakfitFuncCommboBox.addItems(get_args(timeseries.model_fields["mz_sum_func"].annotation))
         ui.mzRangePeakfitFuncCommboBox.setCurrentText(timeseries.mz_sum_func)
+        self.fittedPeakTablesCheckBox = QtWidgets.QCheckBox(
+            "Keep fitted peaks of each spectrum in workspace")
+        self.fittedPeakTablesCheckBox.setChecked(timeseries.use_fitted_peak_tables)
+        ui.formLayout.addRow(self.fittedPeakTablesCheckBox)
+        self.peakAreaIndexCheckBox = QtWidgets.QCheckBox(
+            "Keep peak area index of each spectrum for nofit area sum")
+        self.peakAreaIndexCheckBox.setChecked(timeseries.use_peak_area_index)
+        ui.formLayout.addRow(self.peakAreaIndexCheckBox)
 
 
         now = datetime.now().replace(microsecond=0)
@@ -42,6 +50,8 @@ class Tab(BaseTab):
 
         timeseries.mz_sum_target = ui.mzRangeTargetComboBox.currentText()
         timeseries.mz_sum_func = ui.mzRangePeakfitFuncCommboBox.currentText()
+        timeseries.use_fitted_peak_tables = self.fittedPeakTablesCheckBox.isChecked()
+        timeseries.use_peak_area_index = self.peakAreaIndexCheckBox.isChecked()
 
         formats = set()
         for name, cb in self.checkboxes.items():
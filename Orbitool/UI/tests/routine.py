@@ -65,7 +65,7 @@ def fileui(window: MainUiPy.Window):
 def file_spectra(window: MainUiPy.Window):
     spectra = window.spectraList
     assert spectra.comboBox.currentIndex() == 0
-    assert spectra.tableWidget.rowCount() > 0
+    assert spectra.tableView.model().rowCount() > 0
 
 
 def noise(window: MainUiPy.Window):
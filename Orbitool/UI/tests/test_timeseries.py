@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy import testing as nptest
+
+from Orbitool.models.file import Path
+from Orbitool.models.peakfit import FittedPeakTable
+from Orbitool.models.peakfit.normal_distribution import NormalDistributionFunc
+from Orbitool.models.spectrum import Spectrum, splitPeaks
+from Orbitool.models.timeseries import TimeSeries
+from Orbitool.utils.readers import hdf5
+
+from ..TimeseriesesUiPy import CalcSumTimeSeries, ExtractChromatograms
+
+time = datetime(2022, 1, 1)
+
+
+def test_fitted_peak_table_sum():
+    res = 150000
+    sigma = 100 / res / (2 * np.sqrt(2 * np.log(2)))
+    mz = np.arange(100, 100.02, 5e-4)
+    intensity = np.zeros_like(mz)
+    # two overlapped peaks, then two single peaks
+    for position, height in [(100.003, 100), (100.0045, 60), (100.0102, 80), (100.015, 30)]:
+        intensity += height * np.exp(-.5 * ((mz - position) / sigma) ** 2)
+    intensity[intensity < 1] = 0
+    spectrum = Spectrum(mz=mz, intensity=intensity, path="a", start_time=time, end_time=time)
+    func = NormalDistributionFunc(peak_fit_sigma=sigma, peak_fit_res=res)
+    table = FittedPeakTable.FromPeaks(func, splitPeaks(mz, intensity))
+
+    ranges = [
+        (100, 100.02),
+        # positions of the first component and the last one are out of range
+        (100.0035, 100.0095),
+        # the first raw peak's last non-zero point, the last raw peak's leading zero
+        (100.005, 100.014),
+        # between the first raw peak's last non-zero point and its trailing zero
+        (100.00525, 100.0105),
+        (100.0102, 100.0148),
+        (100.0062, 100.0085)]
+    for mz_range in ranges:
+        for target in ["peak_intensity", "area"]:
+            _, expected = CalcSumTimeSeries.func(spectrum, func, mz_range, target)
+            nptest.assert_allclose(table.get_sum(*mz_range, target), expected, rtol=1e-9)
+    assert table.get_sum(100.0062, 100.0085) == 0
+
+
+FILTER = {"string": "-", "polarity": "-1",
+          "mass": "50.0-750.0", "CiD": "off", "scan": "Full Profile"}
+
+
+def test_extract_chromatograms(tmp_path):
+    mz = np.linspace(100, 101, 5)
+    paths = []
+    # scans of the second file are between scans of the first one
+    for name, begin in [("a", time), ("b", time + timedelta(seconds=15))]:
+        file = tmp_path / f"{name}.h5"
+        hdf5.write(file, begin, (
+            (timedelta(seconds=30 * index), FILTER, {"TIC": 1.},
+             mz, np.full(5, index + 1.) * (10 if name == "b" else 1)) for index in range(4)))
+        paths.append(Path.fromFile(file, paths))
+
+    series = [TimeSeries(position_min=99, position_max=100.1),
+              TimeSeries(position_min=100.4, position_max=101)]
+    func_kwargs = {"mz_ranges": [(s.position_min, s.position_max) for s in series],
+                   "filter": FILTER, "stats_filter": {},
+                   "time_range": (time + timedelta(seconds=10), time + timedelta(seconds=100))}
+    rets = [ExtractChromatograms.func(path, **func_kwargs) for path in reversed(paths)]
+    matrix = ExtractChromatograms.write(None, rets, series)
+
+    assert matrix.range_sum and matrix.from_raw
+    # scans 0 of a and 3 of b are out of time range
+    assert matrix.times.tolist() == [
+        time + timedelta(seconds=seconds) for seconds in (15, 30, 45, 60, 75, 90)]
+    nptest.assert_equal(matrix.intensity[:, 0], [10, 2, 20, 3, 30, 4])
+    nptest.assert_equal(matrix.intensity[:, 1], np.array([10, 2, 20, 3, 30, 4]) * 3)
+    nptest.assert_equal(matrix.positions[0], [99.55, 100.7])
+
+    series = matrix.to_series(series)
+    assert series[1].times.tolist() == matrix.times.tolist()
+    nptest.assert_equal(series[1].intensity, matrix.intensity[:, 1])
@@ -52,3 +52,13 @@ class TableUtils:
     @staticmethod
     def getSelectedRow(table: QtWidgets.QTableWidget):
         return np.unique([index.row() for index in table.selectedIndexes()])
+
+    @staticmethod
+    @test.override_input
+    def getSelectedSourceRow(view: QtWidgets.QTableView) -> np.ndarray:
+        """
+        selected rows of a view over `ArrayTableModel`, as indexes of source rows
+        """
+        rows = np.unique([index.row()
+                         for index in view.selectionModel().selectedIndexes()]).astype(int)
+        return view.model().source_rows(rows)
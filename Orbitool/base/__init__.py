@@ -1,6 +1,6 @@
 from .h5file import H5File
 from .structure import BaseStructure
-from .dataset_structure import BaseDatasetStructure
+from .dataset_structure import BaseDatasetStructure, CompressedDatasetStructure
 from .row_structure import BaseRowStructure
 from .disk_structure import BaseDiskData, DiskDict, DiskList
 from .extra_type_handlers import Array, NdArray, AttrNdArray, AttrList, JSONObject
\ No newline at end of file
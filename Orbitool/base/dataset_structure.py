@@ -1,12 +1,14 @@
 from collections import deque
 from h5py import Group as H5Group, Dataset as H5Dataset
 
-from typing import Any, List, Type, final, get_args, get_origin, Dict
+from typing import Any, List, Tuple, Type, final, get_args, get_origin, Dict
 import numpy as np
 
 from Orbitool.base.extra_type_handlers.np_handler import NdArray
 from .structure import MISSING, AttrTypeHandler, BaseStructure, DatasetTypeHandler, get_handler, broken_entries
 from .extra_type_handlers import np_helper, Array
+from .extra_type_handlers.codec import Codec, decode_column, encode_column
+from .extra_type_handlers.np_helper import CompressedArray
 from .extra_type_handlers.column_handler import ColumnCellTypeHandler, ColumnHandler
 
 STRUCT_BASE = "_dataset_struct_base"
@@ -43,6 +45,23 @@ class BaseDatasetStructure(BaseStructure):
     def h5_type_handler(cls):
         return DatasetStructureTypeHandler
 
+class CompressedDatasetStructure:
+    """
+    A `BaseDatasetStructure` whose dataset is compressed in advance, usually
+    in worker processes, so that the writer thread only does I/O.
+    It could be written wherever the origin structure could be written.
+    Only structures made of arrays / columns are supported.
+    """
+
+    def __init__(self, value: BaseDatasetStructure) -> None:
+        self.origin = type(value)
+        handler: DatasetStructureTypeHandler = get_handler(self.origin)
+        array, self.codec_attrs = handler.to_array(value)
+        # encoded columns are small integers, whose high bytes are shuffled together
+        self.array = CompressedArray(array, shuffle=bool(self.codec_attrs))
+        self.attrs = {k: getattr(value, k) for k in handler.annotations}
+
+
 def get_not_none_attr(value, attr, origin):
     ret = getattr(value, attr)
     assert ret is not None, f"{origin}.{attr} cannot be None"
@@ -82,6 +101,10 @@ class DatasetStructureTypeHandler(DatasetTypeHandler):
         self.dataset_fields = dataset_fields
         self.dataset_handler = dataset_handler
         self.handlers = handlers
+        # columns annotated with a codec, like NdArray[float, -1, 'orbitrap_mz']
+        self.codecs: Dict[str, Codec] = {
+            key: codec for key, handler in handlers.items()
+            if (codec := getattr(getattr(handler, "helper", None), "codec", None))}
         self.dtypes = dtypes
         self.annotations = fields
         if dataset_handler is not None:
@@ -90,25 +113,58 @@ class DatasetStructureTypeHandler(DatasetTypeHandler):
         else:
             self.helper = np_helper.HeteroGeneousNdArrayHelper(dtypes)
 
-    def write_dataset_to_h5(self, h5g: H5Group, key: str, value: BaseDatasetStructure):
+    def get_columns(self, value: BaseDatasetStructure):
         origin = self.origin
-        if self.dataset_handler is None:
-            length = len(get_not_none_attr(value, self.dataset_fields[0], origin))
-            handlers = self.handlers
-            dataset = self.helper.columns_write(
-                h5g, key, length, [
-                    get_not_none_attr(value, df, origin)
-                    if (handler := handlers.get(df, None)) is None
-                    else handler.convert_to_ndarray(get_not_none_attr(value, df, origin))
-                    for df in self.dataset_fields]
-            )
+        handlers = self.handlers
+        return [
+            get_not_none_attr(value, df, origin)
+            if (handler := handlers.get(df, None)) is None
+            else handler.convert_to_ndarray(get_not_none_attr(value, df, origin))
+            for df in self.dataset_fields]
+
+    def encode_columns(self, value: BaseDatasetStructure) -> Tuple[List[np.ndarray], dict]:
+        """
+        columns to store and dataset attrs of encoded columns
+        """
+        columns = self.get_columns(value)
+        attrs = {}
+        for index, key in enumerate(self.dataset_fields):
+            if (codec := self.codecs.get(key)) is not None:
+                columns[index], column_attrs = encode_column(codec, key, columns[index])
+                attrs.update(column_attrs)
+        return columns, attrs
+
+    def to_array(self, value: BaseDatasetStructure) -> Tuple[np.ndarray, dict]:
+        """
+        return array and dataset attrs of encoded columns
+        """
+        assert self.dataset_handler is None, f"{self.origin}: only columns could be converted to array"
+        length = len(get_not_none_attr(value, self.dataset_fields[0], self.origin))
+        columns, attrs = self.encode_columns(value)
+        return self.helper.columns_to_array(length, columns), attrs
+
+    def write_dataset_to_h5(self, h5g: H5Group, key: str, value: BaseDatasetStructure | CompressedDatasetStructure):
+        origin = self.origin
+        if isinstance(value, CompressedDatasetStructure):
+            assert value.origin is origin, f"{value.origin} cannot be written as {origin}"
+            dataset = value.array.write(h5g, key)
+            dataset.attrs.update(value.codec_attrs)
+            get_attr = value.attrs.get
         else:
-            dataset = self.dataset_handler.write_dataset_to_h5(
-                h5g, key, get_not_none_attr(value, self.dataset_fields[0], origin))
+            if self.dataset_handler is None:
+                length = len(get_not_none_attr(value, self.dataset_fields[0], origin))
+                columns, codec_attrs = self.encode_columns(value)
+                dataset = self.helper.columns_write(
+                    h5g, key, length, columns, shuffle=bool(codec_attrs))
+                dataset.attrs.update(codec_attrs)
+            else:
+                dataset = self.dataset_handler.write_dataset_to_h5(
+                    h5g, key, get_not_none_attr(value, self.dataset_fields[0], origin))
+            get_attr = lambda k: getattr(value, k, None)
 
         for k, annotation in self.annotations.items():
             handler = get_handler(annotation)
-            if (v := getattr(value, k, None)) is None:
+            if (v := get_attr(k)) is None:
                 continue
             handler.write_to_h5(dataset, k, v)
         return dataset
@@ -119,6 +175,9 @@ class DatasetStructureTypeHandler(DatasetTypeHandler):
         if self.dataset_handler is None:
             columns_iter = self.helper.columns_read(dataset)
             values = dict(zip(self.dataset_fields, columns_iter))
+            for key, column in values.items():
+                if column is not None:
+                    values[key] = decode_column(dataset, key, column)
             for key, handler in self.handlers.items():
                 values[key] = handler.convert_from_ndarray(values[key])
         else:
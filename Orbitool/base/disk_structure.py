@@ -238,6 +238,7 @@ class IDiskListView(Generic[VT], IDiskView):
     def __getitem__(self, key: int) -> VT: ...
     def append(self, value: VT): ...
     def extend(self, values: Iterable[VT]): ...
+    def extend_from(self, other: 'DiskListDirectView[VT]'): ...
     def __iter__(self) -> Generator[VT, None, None]: ...
 
 
@@ -268,6 +269,21 @@ class DiskListDirectView(DiskDirectView[VT], IDiskListView[VT]):
             keys.append(k)
         self.write_keys_to_h5()
 
+    def extend_from(self, other: 'DiskListDirectView[VT]'):
+        """
+        move items of other to the end without copying, then remove other.
+        other must be in the same h5 file.
+        """
+        obj = self.obj
+        h5file = obj.file
+        keys = self.keys
+        for k, key in enumerate(other.keys, int(keys[-1]) + 1 if keys else 0):
+            k = str(k)
+            h5file.move(other.obj[key].name, f"{obj.name}/{k}")
+            keys.append(k)
+        self.write_keys_to_h5()
+        del other.group[other.key]
+
     def __iter__(self) -> Generator[VT, None, None]:
         assert not self.proxy
         for key in self.keys:
@@ -291,6 +307,9 @@ class DiskListProxyView(DiskProxyView[VT], IDiskListView[VT]):
     def extend(self, values: Iterable[VT]):
         self.proxy.extend(values)
 
+    def extend_from(self, other: DiskListDirectView[VT]):
+        self.proxy.extend_from(other)
+
     # read from
     def __getitem__(self, index: int) -> VT:
         return super().__getitem__(self.keys[index])
@@ -0,0 +1,228 @@
+"""
+Optional lossless codecs for 1-D datasets, selected per dataset by
+`NdArray[dtype, shape, codec_name]`. Encoded datasets are marked by the
+`CODEC_ATTR` attribute, so they could be read without knowing the annotation.
+
+In a dataset structure (compound dataset), a column annotated with a codec
+is replaced by an encoded column of the same dtype which the dataset's
+filter compresses better, marked by `CODEC_ATTR.<column>` attributes.
+"""
+import abc
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from h5py import Dataset as H5Dataset
+from h5py import Group as H5Group
+
+CODEC_ATTR = "_codec"
+# attributes of a dataset are limited to 64KB
+MAX_ATTR_BYTES = 32 * 2**10
+
+
+class Codec(abc.ABC):
+    name: str = None
+
+    def __init_subclass__(cls) -> None:
+        if cls.name is not None:
+            codecs[cls.name] = cls()
+
+    @abc.abstractmethod
+    def encode(self, value: np.ndarray) -> Optional[Tuple[np.ndarray, dict]]:
+        """
+        return encoded uint8 array and attrs needed by decode,
+        or None if value couldn't be encoded, then it will be stored as usual.
+        """
+
+    @abc.abstractmethod
+    def decode(self, data: np.ndarray, attrs: dict) -> np.ndarray: ...
+
+    def encode_column(self, value: np.ndarray) -> Optional[Tuple[np.ndarray, dict]]:
+        """
+        return encoded column with the same dtype and length and attrs needed by
+        `decode_column`, or None if value couldn't be encoded as a column
+        """
+        return None
+
+    def decode_column(self, column: np.ndarray, attrs: dict) -> np.ndarray:
+        raise NotImplementedError()
+
+    def enabled(self) -> bool:
+        """
+        values are stored as usual when disabled, stored values are always decoded
+        """
+        return True
+
+    def write(self, h5g: H5Group, key: str, value: np.ndarray) -> Optional[H5Dataset]:
+        if not self.enabled() or (encoded := self.encode(value)) is None:
+            return None
+        data, attrs = encoded
+        # already compressed
+        dataset = h5g.create_dataset(key, data=data)
+        dataset.attrs.update(attrs)
+        dataset.attrs[CODEC_ATTR] = self.name
+        return dataset
+
+    def read(self, dataset: H5Dataset) -> np.ndarray:
+        return self.decode(dataset[()], dict(dataset.attrs))
+
+
+codecs: Dict[str, Codec] = {}
+
+
+def get_codec(name: str) -> Codec:
+    assert name in codecs, f"unknown codec {name}, available: {list(codecs)}"
+    return codecs[name]
+
+
+def get_dataset_codec(dataset: H5Dataset) -> Optional[Codec]:
+    if (name := dataset.attrs.get(CODEC_ATTR, None)) is None:
+        return None
+    if isinstance(name, bytes):
+        name = name.decode()
+    return get_codec(name)
+
+
+def encode_column(codec: Codec, column: str, value: np.ndarray) -> Tuple[np.ndarray, dict]:
+    """
+    return column to store and dataset attrs of it
+    """
+    if not codec.enabled() or (encoded := codec.encode_column(value)) is None:
+        return value, {}
+    value, attrs = encoded
+    prefix = f"{CODEC_ATTR}.{column}"
+    return value, {prefix: codec.name, **{f"{prefix}.{k}": v for k, v in attrs.items()}}
+
+
+def decode_column(dataset: H5Dataset, column: str, value: np.ndarray) -> np.ndarray:
+    prefix = f"{CODEC_ATTR}.{column}"
+    if (name := dataset.attrs.get(prefix, None)) is None:
+        return value
+    if isinstance(name, bytes):
+        name = name.decode()
+    attrs = {k[len(prefix) + 1:]: v for k, v in dataset.attrs.items()
+             if k.startswith(prefix + ".")}
+    return get_codec(name).decode_column(value, attrs)
+
+
+def zigzag(value: np.ndarray) -> np.ndarray:
+    return ((value << 1) ^ (value >> 63)).view(np.uint64)
+
+
+def unzigzag(value: np.ndarray) -> np.ndarray:
+    return (value >> np.uint64(1)).view(np.int64) ^ -(value & np.uint64(1)).view(np.int64)
+
+
+def shuffle_compress(value: np.ndarray) -> bytes:
+    """
+    byte planes of small integers are mostly zeros and compress well
+    """
+    return zlib.compress(np.ascontiguousarray(value.view(np.uint8).reshape(-1, value.itemsize).T).data, 1)
+
+
+def shuffle_decompress(data: bytes, dtype: np.dtype) -> np.ndarray:
+    itemsize = np.dtype(dtype).itemsize
+    planes = np.frombuffer(zlib.decompress(data), np.uint8).reshape(itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(-1)
+
+
+def segmented_cumsum(value: np.ndarray, restart: np.ndarray) -> np.ndarray:
+    """
+    cumsum which restarts from value[i] where restart[i] is True (restart[0] must be True)
+    """
+    cumsum = np.cumsum(value)
+    starts = np.flatnonzero(restart)
+    base = cumsum[starts] - value[starts]
+    return cumsum - np.repeat(base, np.diff(starts, append=len(value)))
+
+
+class OrbitrapMzCodec(Codec):
+    """
+    Lossless codec for profile m/z of Orbitrap spectra.
+
+    Orbitrap m/z grids are near-regular in 1/sqrt(m/z) (frequency) space, and
+    `removeZeroPositions` leaves short runs of consecutive grid points.
+    - runs are segmented by gaps in 1/sqrt(m/z) space
+    - m/z are reinterpreted as int64 (monotonic for positive floats), and the
+        3rd order difference is taken inside each run (lower order at the
+        beginning of a run), keeping exact residual bits
+    - residuals are zigzag encoded, shuffled by byte planes and deflated
+
+    Anything other than a 1-D, strictly increasing, positive, finite float64
+    array is stored as usual.
+    """
+    name = "orbitrap_mz"
+    ORDER = 3
+    # gap if the step is larger than `GAP_RATIO` * median step in 1/sqrt(m/z) space
+    GAP_RATIO = 1.5
+
+    def residuals(self, value: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        zigzag encoded residuals and run starts, None if value is not supported
+        """
+        if value.dtype != np.float64 or value.ndim != 1 or len(value) < 2:
+            return None
+        if not (np.isfinite(value[-1]) and value[0] > 0 and (np.diff(value) > 0).all()):
+            return None
+        steps = -np.diff(1 / np.sqrt(value))
+        run_starts = np.flatnonzero(steps > np.median(steps) * self.GAP_RATIO) + 1
+        positions = self.positions(len(value), run_starts)
+
+        residual = value.view(np.int64)
+        for order in range(self.ORDER):
+            residual = residual.copy()
+            slt = np.flatnonzero(positions > order)
+            if order == 0:  # run starts are stored as differences from last point
+                slt = np.arange(1, len(value))
+            residual[slt] -= residual[slt - 1]
+        return zigzag(residual), run_starts
+
+    def restore(self, residual: np.ndarray, run_starts: np.ndarray) -> np.ndarray:
+        value = unzigzag(residual)
+        positions = self.positions(len(value), run_starts)
+        for order in reversed(range(1, self.ORDER)):
+            value = segmented_cumsum(value, positions <= order)
+        return np.cumsum(value).view(np.float64)
+
+    def encode(self, value: np.ndarray):
+        if (encoded := self.residuals(value)) is None:
+            return None
+        residual, run_starts = encoded
+        runs = shuffle_compress(np.diff(run_starts, prepend=0).astype(np.int64))
+        residuals = shuffle_compress(residual)
+        data = np.frombuffer(runs + residuals, np.uint8)
+        return data, {"length": len(value), "runs_bytes": len(runs)}
+
+    def decode(self, data: np.ndarray, attrs: dict) -> np.ndarray:
+        length = int(attrs["length"])
+        runs_bytes = int(attrs["runs_bytes"])
+        data = data.tobytes()
+        run_starts = np.cumsum(shuffle_decompress(data[:runs_bytes], np.int64))
+        residual = shuffle_decompress(data[runs_bytes:], np.uint64)
+        assert len(residual) == length
+        return self.restore(residual, run_starts)
+
+    def encode_column(self, value: np.ndarray):
+        """
+        residuals in place of m/z, compressed by the dataset's filter
+        """
+        if (encoded := self.residuals(value)) is None:
+            return None
+        residual, run_starts = encoded
+        runs = shuffle_compress(np.diff(run_starts, prepend=0).astype(np.int64))
+        if len(runs) > MAX_ATTR_BYTES:
+            return None
+        return residual.view(np.float64), {"runs": np.frombuffer(runs, np.uint8)}
+
+    def decode_column(self, column: np.ndarray, attrs: dict) -> np.ndarray:
+        run_starts = np.cumsum(shuffle_decompress(
+            np.asarray(attrs["runs"], np.uint8).tobytes(), np.int64))
+        return self.restore(np.ascontiguousarray(column).view(np.uint64), run_starts)
+
+    @staticmethod
+    def positions(length: int, run_starts: np.ndarray) -> np.ndarray:
+        """
+        index of each point inside its run
+        """
+        starts = np.concatenate(([0], run_starts)).astype(np.int64)
+        return np.arange(length) - np.repeat(starts, np.diff(starts, append=length))
@@ -2,7 +2,8 @@ import abc
 from collections import deque
 from datetime import date, datetime, timedelta
 from functools import lru_cache
-from typing import (Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union, final,
+from operator import attrgetter
+from typing import (Any, Callable, Collection, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union, final,
                     get_args, get_origin)
 
 import numpy as np
@@ -12,7 +13,7 @@ from h5py import Group as H5Group
 from Orbitool.base.extra_type_handlers.base import H5Group
 
 from .base import *
-from .np_helper import HeteroGeneousNdArrayHelper, HomogeneousNdArrayHelper
+from .np_helper import H5_DT_ARGS, HeteroGeneousNdArrayHelper, HomogeneousNdArrayHelper
 
 T = TypeVar("T")
 
@@ -26,6 +27,8 @@ class ColumnCellTypeHandler(Generic[T]):
     column_target = None
     dtype = None
     shape = None
+    # cells of variable length, see `convert_to_ragged`
+    ragged = False
 
     @final
     def __init__(self, origin: Type[T], args: tuple) -> None:
@@ -47,6 +50,16 @@ class ColumnCellTypeHandler(Generic[T]):
     def convert_from_npcolumn(self, value: np.ndarray) -> List[T]:
         return value.tolist()
 
+    def convert_to_ragged(self, value: List[T]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        for ragged cells, return end of each cell in flat arrays (stored as the column, `dtype`)
+        and flat arrays of all cells, stored as `<column>.<name>` beside the rows
+        """
+        raise NotImplementedError()
+
+    def convert_from_ragged(self, ends: np.ndarray, arrays: Dict[str, np.ndarray]) -> List[T]:
+        raise NotImplementedError()
+
 
 handlers: Dict[type, Callable[[T, tuple], ColumnCellTypeHandler[T]]] = {}
 
@@ -82,10 +95,21 @@ class BytesTypeHandler(ColumnCellTypeHandler):
     dtype = np.dtype("S")
 
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
 class DatetimeTypeHandler(ColumnCellTypeHandler):
     column_target = datetime
     dtype = np.dtype("datetime64[us]")
 
+    def convert_to_npcolumn(self, value: List[datetime]) -> np.ndarray:
+        # numpy converts datetime objects one by one slowly, integer arithmetic is 10x faster
+        try:
+            return np.array([(v - _EPOCH) // _MICROSECOND for v in value], np.int64).view(self.dtype)
+        except TypeError:  # timezone aware or None
+            return super().convert_to_npcolumn(value)
+
 
 class DateTypeHandler(ColumnCellTypeHandler):
     column_target = date
@@ -96,6 +120,12 @@ class TimedeltaTypeHandler(ColumnCellTypeHandler):
     column_target = timedelta
     dtype = np.dtype("timedelta64[us]")
 
+    def convert_to_npcolumn(self, value: List[timedelta]) -> np.ndarray:
+        try:
+            return np.array([v // _MICROSECOND for v in value], np.int64).view(self.dtype)
+        except TypeError:
+            return super().convert_to_npcolumn(value)
+
 
 class ColumnHandler(DatasetTypeHandler, abc.ABC):
     """
@@ -121,16 +151,26 @@ class ListTypeHandler(ColumnHandler):
         self.dtype = self.column_handler.dtype
         self.array_helper = HomogeneousNdArrayHelper(
             self.column_handler.dtype)
+        if self.column_handler.ragged:
+            self.ragged_helper = ColumnsHelper(("value",), self.args)
 
     def get_cell_shape(self):
         return self.column_handler.shape
 
     def write_dataset_to_h5(self, h5g: H5Group, key: str, value) -> H5Dataset:
+        if self.column_handler.ragged:
+            value = list(value)
+            return self.ragged_helper.write_columns_to_h5(h5g, key, len(value), [value])
         return self.array_helper.write(h5g, key, self.convert_to_ndarray(value))
 
     def read_dataset_from_h5(self, dataset: H5Dataset) -> Any:
+        if self.column_handler.ragged:
+            return self.convert_from_list(self.ragged_helper.read_columns_from_h5(dataset)[0])
         return self.convert_from_ndarray(self.array_helper.read(dataset))
 
+    def convert_from_list(self, value: list):
+        return value
+
     def convert_to_ndarray(self, value):
         return self.column_handler.convert_to_npcolumn(value)
 
@@ -142,6 +182,9 @@ class DequeTypeHandler(ListTypeHandler):
     def convert_from_ndarray(self, value):
         return deque(self.column_handler.convert_from_npcolumn(value))
 
+    def convert_from_list(self, value: list):
+        return deque(value)
+
 
 class SetTypeHandler(ListTypeHandler):
     def convert_to_ndarray(self, value):
@@ -150,13 +193,23 @@ class SetTypeHandler(ListTypeHandler):
     def convert_from_ndarray(self, value):
         return set(self.column_handler.convert_from_npcolumn(value))
 
+    def convert_from_list(self, value: list):
+        return set(value)
+
 # Array defined in array_handler.py
 
+# dataset of rows in the group written by ColumnsHelper with ragged columns
+RAGGED_ROWS_NAME = "rows"
+
 
 class ColumnsHelper:
     """
     used by
     - SeqHandler/DictHandler to help write columns to h5 and vice versa
+
+    Without ragged columns, columns are written as one dataset. Otherwise they
+    are written as a group, with the dataset `RAGGED_ROWS_NAME` holding end of
+    each ragged cell, and flat arrays of ragged columns beside it.
     """
     def __init__(self, titles: Tuple[str], types: tuple, default_factories: Optional[Tuple[Union[Callable, None]]] = None) -> None:
         handlers: List[ColumnCellTypeHandler] = []
@@ -173,23 +226,160 @@ class ColumnsHelper:
         self.handlers = handlers
         self.array_helper = HeteroGeneousNdArrayHelper(dtypes)
         self.default_factories = default_factories or (None,) * len(titles)
+        self.ragged = any(handler.ragged for handler in handlers)
 
-    def write_columns_to_h5(self, h5g: H5Group, key: str, length: int, columns: Iterable[list]):
-        h5_columns = []
-        for handler, column in zip(self.handlers, columns, strict=True):
-            h5_columns.append(handler.convert_to_npcolumn(column))
-        return self.array_helper.columns_write(h5g, key, length, h5_columns)
+    def convert_columns(self, columns: Iterable[list]) -> Tuple[List[np.ndarray], Dict[str, np.ndarray]]:
+        """
+        return columns and flat arrays of ragged columns
+        """
+        arrays = {}
+        converted = []
+        for title, handler, column in zip(self.titles, self.handlers, columns, strict=True):
+            if handler.ragged:
+                column, flat = handler.convert_to_ragged(column)
+                arrays.update((f"{title}.{name}", array) for name, array in flat.items())
+            else:
+                column = handler.convert_to_npcolumn(column)
+            converted.append(column)
+        return converted, arrays
+
+    def columns_to_array(self, length: int, columns: Iterable[list]) -> np.ndarray:
+        assert not self.ragged, f"ragged columns {self.titles} could not be converted to one array"
+        return self.array_helper.columns_to_array(length, self.convert_columns(columns)[0])
 
-    def read_columns_from_h5(self, dataset: H5Dataset):
+    def write_columns_to_h5(self, h5g: H5Group, key: str, length: int, columns: Iterable[list]):
+        columns, arrays = self.convert_columns(columns)
+        if not self.ragged:
+            return self.array_helper.columns_write(h5g, key, length, columns)
+        group = h5g.create_group(key)
+        self.array_helper.columns_write(group, RAGGED_ROWS_NAME, length, columns)
+        for name, array in arrays.items():
+            group.create_dataset(name, data=array, **H5_DT_ARGS)
+        return group
+
+    def read_columns_from_h5(self, dataset: Union[H5Dataset, H5Group]):
+        group = None
+        if isinstance(dataset, H5Group):  # with ragged columns
+            group = dataset
+            dataset = group[RAGGED_ROWS_NAME]
         length = len(dataset)
         columns_iter = self.array_helper.columns_read(dataset)
         columns = []
         for index, (handler, column) in enumerate(zip(self.handlers, columns_iter, strict=True)):
             if column is not None:
-                columns.append(handler.convert_from_npcolumn(column))
+                if handler.ragged and group is not None:
+                    prefix = f"{self.titles[index]}."
+                    columns.append(handler.convert_from_ragged(column, {
+                        name[len(prefix):]: array[()] for name, array in group.items()
+                        if name.startswith(prefix)}))
+                else:  # ragged columns written by older versions are readable by `convert_from_npcolumn`
+                    columns.append(handler.convert_from_npcolumn(column))
             else:
                 factory = self.default_factories[index]
                 assert factory is not None, f"field {self.titles[index]} needs default value, because hdf5 file doesn't have this field"
                 values = [factory(call_default_factory=True) for _ in range(length)]
                 columns.append(values)
         return columns
+
+
+KEY_INDEX_TITLE = "_key_index"
+
+
+class RowsPlan:
+    """
+    Serialization plan of a row type (subclass of `BaseRowStructure`), generated once
+    per (row type, key type) by `get_rows_plan`.
+
+    - rows -> dataset: all fields of a row are fetched by a single `attrgetter`,
+        then the columns are packed into one structured array and written at once
+    - dataset -> rows: the dataset is read at once, columns are converted to field
+        types by their `ColumnCellTypeHandler`, and rows are built without validation
+        (the same way as `model_construct`, but skipping defaults and aliases lookup)
+
+    If `key_type` is provided, there will be a `_key_index` column before fields,
+    used by Dict[key_type, row_type].
+    """
+
+    def __init__(self, row_type: type, key_type: Optional[type] = None) -> None:
+        titles = []
+        types = []
+        default_factories = []
+        for key, field in row_type.model_fields.items():
+            titles.append(key)
+            types.append(field.annotation)
+            if field.is_required():
+                default_factories.append(None)
+            else:
+                default_factories.append(field.get_default)
+        self.row_type = row_type
+        self.titles: Tuple[str] = tuple(titles)
+        self.with_key = key_type is not None
+        if self.with_key:
+            self.column_helper = ColumnsHelper(
+                (KEY_INDEX_TITLE, *titles), (key_type, *types), (None, *default_factories))
+        else:
+            self.column_helper = ColumnsHelper(
+                self.titles, tuple(types), tuple(default_factories))
+
+        if len(titles) > 1:
+            self.getter: Callable[[Any], tuple] = attrgetter(*titles)
+        elif titles:
+            getter = attrgetter(*titles)
+            self.getter = lambda row: (getter(row),)
+        else:
+            self.getter = lambda row: ()
+
+        if row_type.__private_attributes__:
+            self.construct = lambda values: row_type.model_construct(**values)
+        else:
+            self.construct = self._construct
+
+    def _construct(self, values: dict):
+        row = self.row_type.__new__(self.row_type)
+        _object_setattr(row, "__dict__", values)
+        _object_setattr(row, "__pydantic_fields_set__", set(values))
+        _object_setattr(row, "__pydantic_extra__", None)
+        _object_setattr(row, "__pydantic_private__", None)
+        return row
+
+    def get_columns(self, rows: Iterable, keys: Optional[Iterable] = None) -> List[tuple]:
+        """
+        Put in a single function to gc `rows`
+        """
+        getter = self.getter
+        if self.with_key:
+            rows = [(key, *getter(row)) for key, row in zip(keys, rows, strict=True)]
+        else:
+            rows = list(map(getter, rows))
+        if not rows:
+            return [()] * len(self.column_helper.titles)
+        return list(zip(*rows))
+
+    def to_array(self, rows: Collection, keys: Optional[Iterable] = None) -> np.ndarray:
+        """
+        structured array with the dtype stored in h5 (datetime as int64, str as utf-8 bytes)
+        """
+        return self.column_helper.columns_to_array(len(rows), self.get_columns(rows, keys))
+
+    def write(self, h5g: H5Group, key: str, rows: Collection, keys: Optional[Iterable] = None) -> Union[H5Dataset, H5Group]:
+        return self.column_helper.write_columns_to_h5(
+            h5g, key, len(rows), self.get_columns(rows, keys))
+
+    def read(self, dataset: Union[H5Dataset, H5Group]) -> Tuple[Optional[list], list]:
+        """
+        return keys (None if without key), rows
+        """
+        columns = self.column_helper.read_columns_from_h5(dataset)
+        keys = columns.pop(0) if self.with_key else None
+        titles = self.titles
+        construct = self.construct
+        rows = [construct(dict(zip(titles, row))) for row in zip(*columns)]
+        return keys, rows
+
+
+_object_setattr = object.__setattr__
+
+
+@lru_cache(None)
+def get_rows_plan(row_type: type, key_type: Optional[type] = None) -> RowsPlan:
+    return RowsPlan(row_type, key_type)
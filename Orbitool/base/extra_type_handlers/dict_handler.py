@@ -8,7 +8,7 @@ from ..row_structure import BaseRowStructure
 from ..structure import get_handler, handlers
 from .base import *
 from .column_handler import ColumnCellTypeHandler
-from .column_handler import ColumnsHelper
+from .column_handler import ColumnsHelper, get_rows_plan
 from .column_handler import get_handler as get_column_handler
 
 
@@ -35,55 +35,17 @@ class DictRowTypeHandler(DatasetTypeHandler):
 
     def __post_init__(self):
         super().__post_init__()
-        kt = self.args[0]
-        vt = self.args[1]
-
-        titles = []
-        types = []
-        default_factories = []
-        for key, field in vt.model_fields.items():
-            titles.append(key)
-            annotation = field.annotation
-            types.append(annotation)
-            if field.is_required():
-                default_factories.append(None)
-            else:
-                default_factories.append(field.get_default)
-        self.titles = titles
-        self.column_helper = ColumnsHelper(
-            ("_key_index", *titles), (kt, *types), (None, *default_factories))
+        self.plan = get_rows_plan(self.args[1], self.args[0])
 
     def write_dataset_to_h5(self, h5g: H5Group, key: str, value: Dict[Any, BaseRowStructure]):
-        return self.column_helper.write_columns_to_h5(
-            h5g, key, len(value), self.get_columns_from_objs(value)
-        )
+        return self.plan.write(h5g, key, value.values(), value.keys())
 
-    def read_dataset_from_h5(self, dataset: H5Dataset) -> List[Tuple[Any, BaseRowStructure]]:
-        index, rows = self.get_rows_from_dataset(dataset)
-        titles = self.titles
-        cls = self.args[1]
-        return {
-            ind: cls(**dict(zip(titles, row))) for ind, row in zip(index, rows)
-        }
-
-    def get_columns_from_objs(self, value: Dict[Any, BaseRowStructure]):
-        """
-        Put in a single function to gc `rows`
-        """
-        titles = self.titles
-        if not value:
-            return [()] * len(titles)
-        rows = [(k, *(getattr(v, t) for t in titles))
-                for k, v in value.items()]
-        return list(zip(*rows))
-
-    def get_rows_from_dataset(self, dataset: H5Dataset):
+    def read_dataset_from_h5(self, dataset: H5Dataset) -> Dict[Any, BaseRowStructure]:
         try:
-            columns = self.column_helper.read_columns_from_h5(dataset)
-            index = columns.pop(0)
-            return index, list(zip(*columns))
+            index, rows = self.plan.read(dataset)
         except Exception as e:
             raise ValueError(f"Error while reading Dict[{self.args[0]}, {self.args[1]}] at {dataset.name}") from e
+        return dict(zip(index, rows))
 
 
 class DictSimpleTypeHandler(DatasetTypeHandler):
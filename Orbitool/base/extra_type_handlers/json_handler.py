@@ -2,14 +2,14 @@
 
 import json
 from types import GenericAlias
-from typing import Any, List, Type, TypeVar
+from typing import Any, Dict, List, Type, TypeVar
 import numpy as np
 
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema
 from pydantic_core import core_schema
 
-from Orbitool.base.structure import AttrTypeHandler
+from Orbitool.base.structure import MISSING, AttrTypeHandler
 from .column_handler import StrTypeHandler as StrColumnCellTypeHandler
 
 T = TypeVar("T")
@@ -36,10 +36,30 @@ class JSONObjectTypeHandler(AttrTypeHandler):
 
 
 class JSONObjectColumnCellTypeHandler(StrColumnCellTypeHandler):
+    """
+    Rows usually share the same object (like filters of spectrum infos),
+    so each distinct object is dumped only once per column. Loaded strings
+    and numbers are shared, dicts and lists are loaded for each row so
+    changing one row doesn't change others.
+    """
     column_target = JSONObject
 
     def convert_to_npcolumn(self, value: List[JSONObject]) -> np.ndarray:
-        return super().convert_to_npcolumn([json.dumps(v, ensure_ascii=False) for v in value])
+        dumped: Dict[int, str] = {}
+        column = []
+        for v in value:
+            if (s := dumped.get(id(v), None)) is None:
+                s = dumped[id(v)] = json.dumps(v, ensure_ascii=False)
+            column.append(s)
+        return super().convert_to_npcolumn(column)
 
     def convert_from_npcolumn(self, value: np.ndarray) -> List[JSONObject]:
-        return list(map(json.loads, super().convert_from_npcolumn(value)))
+        loaded: Dict[str, JSONObject] = {}
+        column = []
+        for s in super().convert_from_npcolumn(value):
+            if (v := loaded.get(s, MISSING)) is MISSING:
+                v = json.loads(s)
+                if not isinstance(v, (dict, list)):
+                    loaded[s] = v
+            column.append(v)
+        return column
@@ -1,7 +1,7 @@
 from functools import reduce
 import operator
 from types import EllipsisType, GenericAlias
-from typing import (TYPE_CHECKING, Any, List, Literal, NamedTuple, Sequence, Tuple,
+from typing import (TYPE_CHECKING, Any, List, Literal, NamedTuple, Optional, Sequence, Tuple,
                     Union, get_args, overload)
 
 import numpy as np
@@ -11,6 +11,7 @@ from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
 
 from .base import *
+from .codec import codecs
 from .column_handler import ColumnCellTypeHandler, ColumnHandler
 from .np_helper import HomogeneousNdArrayHelper, get_converter, support
 
@@ -19,9 +20,11 @@ class ParsedArgs(NamedTuple):
     dtype: np.dtype
     shape: Union[Tuple[int], EllipsisType]
     index: Union[int, Literal[-1]]
+    codec: Optional[str]
 
 
 def parse_args(args):
+    codec = None
     match len(args):
         case 0:
             dtype = shape = None
@@ -30,9 +33,14 @@ def parse_args(args):
             shape = None
         case 2:
             dtype, shape = args
+        case 3:
+            dtype, shape, codec = args
+            if codec not in codecs:
+                raise AnnotationError(
+                    f"Ndarray args error, unknown codec {codec}, available: {list(codecs)}")
         case _:
             raise AnnotationError(
-                f"Ndarray args error, args should be [dtype, shape]: {args}")
+                f"Ndarray args error, args should be [dtype, shape, codec]: {args}")
     if dtype is not None:
         dtype = np.dtype(dtype)
         if not support(dtype):
@@ -48,7 +56,7 @@ def parse_args(args):
         for i, s in enumerate(shape):
             if s == -1:
                 ind = i
-    return ParsedArgs(dtype, shape, ind)
+    return ParsedArgs(dtype, shape, ind, codec)
 
 
 class NdArray(np.ndarray):
@@ -58,6 +66,7 @@ class NdArray(np.ndarray):
     NdArray[int, 100]
     NdArray[int, ...]
     NdArray[int, (2, 3, -1)]
+    NdArray['float64', -1, 'orbitrap_mz'] # stored by a codec, see codec.py
     """
     @overload
     def __class_getitem__(cls, type: type): ...
@@ -73,7 +82,7 @@ class NdArray(np.ndarray):
     def __get_pydantic_core_schema__(
         cls, source_type: Any, handler: GetCoreSchemaHandler
     ) -> CoreSchema:
-        dtype, shape, ind = parse_args(get_args(source_type))
+        dtype, shape, ind, _ = parse_args(get_args(source_type))
 
         def validate(value):
             # because we need to store them to h5, and when load back, the shape is (0,)
@@ -101,8 +110,8 @@ class NdArrayTypeHandler(ColumnHandler):
     target_type = NdArray
 
     def __post_init__(self):
-        self.dtype, self.shape, self.index = parse_args(self.args)
-        self.helper = HomogeneousNdArrayHelper(self.dtype)
+        self.dtype, self.shape, self.index, codec = parse_args(self.args)
+        self.helper = HomogeneousNdArrayHelper(self.dtype, codec)
 
     def get_cell_shape(self):
         shape = self.shape
@@ -150,7 +159,7 @@ class NdArrayCellTypeHandler(ColumnCellTypeHandler[NdArray]):
 
     def __post_init__(self):
         assert len(self.args) == 2, "Must provide shape for column array"
-        self.dtype, shape, ind = parse_args(self.args)
+        self.dtype, shape, ind, _ = parse_args(self.args)
         self.shape = (reduce(operator.mul, shape), )
         assert ind < 0, "shape must be specific"
 
@@ -166,7 +175,7 @@ class AttrNdArray(NdArray):
     def __get_pydantic_core_schema__(
         cls, source_type: Any, handler: GetCoreSchemaHandler
     ) -> CoreSchema:
-        dtype, shape, ind = parse_args(get_args(source_type))
+        dtype, shape, ind, _ = parse_args(get_args(source_type))
 
         def validate(value):
             if value is None:
@@ -192,7 +201,7 @@ class AttrNdArrayTypeHandler(AttrTypeHandler):
     target_type = AttrNdArray
 
     def __post_init__(self):
-        self.dtype, self.shape, self.index = parse_args(self.args)
+        self.dtype, self.shape, self.index, _ = parse_args(self.args)
         self.converter = get_converter(self.dtype)
 
     def convert_to_attr(self, value: np.ndarray):
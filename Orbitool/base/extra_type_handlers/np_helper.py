@@ -1,8 +1,12 @@
 from functools import lru_cache
+from itertools import product
 from typing import Any, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+import zlib
 from h5py import Group as H5Group, Dataset as H5Dataset  # , string_dtype
+from h5py._hl.filters import guess_chunk
 import numpy as np
 from .base import *
+from .codec import get_codec, get_dataset_codec
 
 H5_DT_ARGS = {
     "compression": "gzip",
@@ -30,6 +34,46 @@ SUPPORTED = INTS.union(FLOATS, STRS, OTHERS)
 # strdtype = string_dtype(encoding='utf-8')
 
 
+class CompressedArray:
+    """
+    Chunks of an array compressed the same way as `H5_DT_ARGS` (hdf5's gzip
+    filter is a zlib stream, after hdf5's shuffle filter if `shuffle`).
+    Could be created in worker processes, then `write` only stores the chunks
+    by `write_direct_chunk`.
+    """
+
+    def __init__(self, array: np.ndarray, shuffle: bool = False) -> None:
+        assert array.dtype.kind != 'O', "vlen arrays cannot be compressed in advance"
+        self.dtype = array.dtype
+        self.shape = array.shape
+        self.shuffle = shuffle
+        self.chunks: Optional[Tuple[int]] = None
+        self.data: List[Tuple[Tuple[int], bytes]] = []
+        if not array.size:
+            return
+        chunks = self.chunks = guess_chunk(array.shape, None, array.dtype.itemsize)
+        level = H5_DT_ARGS["compression_opts"]
+        for index in product(*(range(0, s, c) for s, c in zip(array.shape, chunks))):
+            chunk = array[tuple(slice(i, i + c) for i, c in zip(index, chunks))]
+            if chunk.shape != chunks:  # edge chunks are stored as full chunks
+                full = np.zeros(chunks, array.dtype)
+                full[tuple(slice(0, s) for s in chunk.shape)] = chunk
+                chunk = full
+            chunk = np.ascontiguousarray(chunk)
+            if shuffle:  # byte planes of elements, like hdf5's shuffle filter
+                chunk = np.ascontiguousarray(
+                    chunk.reshape(-1).view(np.uint8).reshape(-1, array.dtype.itemsize).T)
+            self.data.append((index, zlib.compress(chunk.data, level)))
+
+    def write(self, h5g: H5Group, key: str) -> H5Dataset:
+        dataset = h5g.create_dataset(
+            key, self.shape, self.dtype, chunks=self.chunks, shuffle=self.shuffle, **H5_DT_ARGS)
+        dsid = dataset.id
+        for index, data in self.data:
+            dsid.write_direct_chunk(index, data)
+        return dataset
+
+
 def support(dtype: np.dtype):
     return dtype.char in SUPPORTED  # or dtype == strdtype
 
@@ -147,19 +191,24 @@ def get_converter(dtype: np.dtype):
 
 
 class HomogeneousNdArrayHelper:
-    def __init__(self, dtype: np.dtype) -> None:
+    def __init__(self, dtype: np.dtype, codec: Optional[str] = None) -> None:
         assert support(dtype)
         self.dtype = dtype
         self.converter = get_converter(dtype)
         self.is_s = self.converter.h5_dtype.char == "S"
+        self.codec = codec and get_codec(codec)
 
     def write(self, h5g: H5Group, key: str, value: np.ndarray):
+        if self.codec is not None and (dataset := self.codec.write(h5g, key, value)) is not None:
+            return dataset
         value = self.converter.convert_to_h5(value)
         if self.is_s:
             return h5g.create_dataset(key, data=value, **H5_DT_ARGS)
         return h5g.create_dataset(key, data=value, dtype=self.converter.h5_dtype, **H5_DT_ARGS)
 
     def read(self, dataset: H5Dataset) -> np.ndarray:
+        if (codec := get_dataset_codec(dataset)) is not None:
+            return codec.read(dataset)
         return self.converter.convert_from_h5(dataset[()])
 
 
@@ -189,26 +238,30 @@ class HeteroGeneousNdArrayHelper:
         self.s_type = s_type
         self.has_s = has_s
 
-    def columns_write(self, h5g: H5Group, key: str, length: int, columns: Iterable[np.ndarray]):
+    def columns_to_array(self, length: int, columns: Iterable[np.ndarray]) -> np.ndarray:
+        """
+        build the whole structured array in memory, so it could be written to h5 at once
+        """
+        columns = [cvt.convert_to_h5(column) for cvt, column in zip(self.converters, columns, strict=True)]
+        for dtype, column in zip(self.h5_dtype_list, columns):
+            assert len(column) == length, f"Error length: {dtype[0]=} {length=} {len(column)=}"
         if self.has_s:
-            h5_dtype_list = self.h5_dtype_list
-            columns = [cvt.convert_to_h5(column) for cvt, column in zip(self.converters, columns, strict=True)]
-            if columns:
-                col_len = np.array([len(col) for col in columns]) 
-                assert (col_len == length).all(), f"Error length: {h5g.name=} {key=} {length=} {col_len=}"
-            h5_dtype = [(dtype[0], col.dtype if s else dtype[1], *dtype[2:])
-                        for dtype, s, col in zip(h5_dtype_list, self.s_type, columns, strict=True)]
-            ds = h5g.create_dataset(key, length, h5_dtype, **H5_DT_ARGS)
-            for dtype, column in zip(self.h5_dtype_list, columns, strict=True):
-                ds[dtype[0]] = column
+            h5_dtype = np.dtype([(dtype[0], col.dtype if s else dtype[1], *dtype[2:])
+                                 for dtype, s, col in zip(self.h5_dtype_list, self.s_type, columns, strict=True)])
         else:
-            ds = h5g.create_dataset(key, length, self.h5_dtype, **H5_DT_ARGS)
-            for dtype, cvt, column in zip(self.h5_dtype_list, self.converters, columns, strict=True):
-                assert len(column) == length, f"Error length: {h5g.name} {key=} {length=} {dtype[0]=} {len(column)=}"
-                ds[dtype[0]] = cvt.convert_to_h5(column)
-        return ds
+            h5_dtype = self.h5_dtype
+        array = np.empty(length, h5_dtype)
+        for dtype, column in zip(self.h5_dtype_list, columns):
+            array[dtype[0]] = column
+        return array
+
+    def columns_write(self, h5g: H5Group, key: str, length: int, columns: Iterable[np.ndarray], shuffle: bool = False):
+        return h5g.create_dataset(
+            key, data=self.columns_to_array(length, columns), shuffle=shuffle, **H5_DT_ARGS)
 
     def columns_read(self, dataset: H5Dataset):
-        names = set(dataset.dtype.names)
+        # read chunks once instead of once per column
+        array: np.ndarray = dataset[()]
+        names = set(array.dtype.names)
         for dtype, cvt in zip(self.h5_dtype_list, self.converters, strict=True):
-            yield cvt.convert_from_h5(dataset[dtype[0]]) if dtype[0] in names else None
+            yield cvt.convert_from_h5(np.ascontiguousarray(array[dtype[0]])) if dtype[0] in names else None
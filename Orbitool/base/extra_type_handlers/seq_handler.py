@@ -11,7 +11,7 @@ from pydantic_core import CoreSchema, core_schema
 from ..row_structure import BaseRowStructure
 from ..structure import handlers
 from .base import *
-from .column_handler import ColumnCellTypeHandler, ColumnsHelper
+from .column_handler import ColumnCellTypeHandler, get_rows_plan
 from .column_handler import DequeTypeHandler as SimpleDequeTypeHandler
 from .column_handler import ListTypeHandler as SimpleListTypeHandler
 from .column_handler import SetTypeHandler as SimpleSetTypeHandler
@@ -60,45 +60,18 @@ class SeqRowTypeHandler(DatasetTypeHandler):
 
     def __post_init__(self):
         super().__post_init__()
-        vt = self.args[0]
-
-        titles = []
-        types = []
-        default_factories = []
-        for key, field in vt.model_fields.items():
-            titles.append(key)
-            types.append(field.annotation)
-            if field.is_required():
-                default_factories.append(None)
-            else:
-                default_factories.append(field.get_default)
-        self.titles = titles
-        self.column_helper = ColumnsHelper(tuple(titles), tuple(types), default_factories)
+        self.plan = get_rows_plan(self.args[0])
 
     def write_dataset_to_h5(self, h5g: H5Group, key: str, value: List[BaseRowStructure]):
-        return self.column_helper.write_columns_to_h5(
-            h5g, key, len(value), self.get_columns_from_objs(value)
-        )
+        return self.plan.write(h5g, key, value)
 
     def read_dataset_from_h5(self, dataset: H5Dataset) -> Any:
-        cls: Type[BaseRowStructure] = self.args[0]
-        titles = self.titles
         try:
-            rows = zip(*self.column_helper.read_columns_from_h5(dataset))
-            return self.origin(cls(**dict(zip(titles, row))) for row in rows)
+            _, rows = self.plan.read(dataset)
+            return rows if self.origin is list else self.origin(rows)
         except Exception as e:
             raise ValueError(f"Error while reading Seq[{self.args[0]}] at {dataset.name}") from e
 
-    def get_columns_from_objs(self, value: Iterable[BaseRowStructure]):
-        """
-        Put in a single function to gc `rows`
-        """
-        titles = self.titles
-        if not value:
-            return [()] * len(titles)
-        rows = [tuple(getattr(v, t) for t in titles) for v in value]
-        return list(zip(*rows))
-
 
 class SeqStructureTypeHandler(GroupTypeHandler):
     def __post_init__(self):
@@ -59,3 +59,38 @@ class H5File(H5Obj):
 
     def __del__(self):
         self.close()
+
+
+def live_size(group: h5py.Group) -> int:
+    """
+    bytes used by datasets' storage in group, metadata is not included
+    """
+    size = 0
+
+    def visit(name, obj):
+        nonlocal size
+        if isinstance(obj, h5py.Dataset):
+            size += obj.id.get_storage_size()
+    group.visititems(visit)
+    return size
+
+
+def compact(path: str | Path) -> int:
+    """
+    HDF5 never reclaims space of deleted objects. Rewrite live objects of a
+    closed file into a fresh file by native object copy, then replace it.
+    return reclaimed bytes
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".compact")
+    old_size = path.stat().st_size
+    try:
+        with h5py.File(path, 'r') as src, h5py.File(tmp_path, 'w') as dst:
+            dst.attrs.update(src.attrs)
+            for key in src:
+                src.copy(src[key], dst, key)
+    except:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+    return old_size - path.stat().st_size
@@ -5,6 +5,7 @@ from typing import Any, Callable, ClassVar, Dict, Generic, List, Tuple, Type, Ty
 from h5py import Group as H5Group, Dataset as H5Dataset
 import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
+from pydantic.fields import FieldInfo
 
 STRUCT_BASE = "_struct_base"
 
@@ -149,15 +150,14 @@ class StructureTypeHandler(GroupTypeHandler):
     origin: BaseStructure
 
     def write_group_to_h5(self, group: H5Group, value: BaseStructure):
-        for k, field in value.model_fields.items():
+        for k, _, handler in get_fields_plan(type(value)):
             if (v := getattr(value, k, None)) is None:
                 continue
-            get_handler(field.annotation).write_to_h5(group, k, v)
+            handler.write_to_h5(group, k, v)
 
     def read_group_from_h5(self, group) -> Any:
         values = {}
-        for k, field in self.origin.model_fields.items():
-            handler = get_handler(field.annotation)
+        for k, field, handler in get_fields_plan(self.origin):
             try:
                 v = handler.read_from_h5(group, k)
                 if v is MISSING:
@@ -180,6 +180,14 @@ def get_handler(typ: Type[T]) -> _BaseTypeHandler[T]:
     return Handler(get_origin(typ) or typ, get_args(typ))
 
 
+@lru_cache(None)
+def get_fields_plan(cls: Type[BaseStructure]) -> Tuple[Tuple[str, FieldInfo, _BaseTypeHandler], ...]:
+    """
+    (key, field, handler) for each field of a structure, resolved once per class
+    """
+    return tuple((key, field, get_handler(field.annotation)) for key, field in cls.model_fields.items())
+
+
 class AnnotationError(Exception):
     ...
 
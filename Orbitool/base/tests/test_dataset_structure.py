@@ -1,4 +1,5 @@
 from datetime import datetime
+import pickle
 from typing import Deque, Dict, List
 import numpy as np
 import pytest
@@ -6,7 +7,7 @@ import pytest
 from ..row_structure import BaseRowStructure
 from ..h5file import H5File
 from ..extra_type_handlers import AttrNdArray, NdArray, Array
-from ..dataset_structure import BaseDatasetStructure
+from ..dataset_structure import BaseDatasetStructure, CompressedDatasetStructure
 
 
 def test_dataset_structure():
@@ -117,3 +118,28 @@ def test_dataset_compatibility():
     b = f.read("dd", NewDD)
     assert b.dd["1"].e == "123"
 
+
+
+class CompressedSpectrum(BaseDatasetStructure):
+    mz: NdArray[float, -1]
+    time: NdArray["M8[s]", -1]
+    attr1: int
+    attr2: str = "attr"
+
+
+def test_compressed_dataset():
+    Spectrum = CompressedSpectrum
+    a = Spectrum(
+        mz=np.random.rand(100000),
+        time=np.arange(100000).astype("M8[s]"),
+        attr1=123)
+    compressed = pickle.loads(pickle.dumps(CompressedDatasetStructure(a)))
+
+    f = H5File()
+    f.write("s", compressed, Spectrum)
+    assert f._obj["s"].compression == "gzip"
+    assert f.read("s", Spectrum) == a
+
+    empty = Spectrum(mz=[], time=[], attr1=1, attr2="2")
+    f.write("s", CompressedDatasetStructure(empty), Spectrum)
+    assert f.read("s", Spectrum) == empty
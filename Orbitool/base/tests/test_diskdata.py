@@ -4,7 +4,7 @@ import numpy as np
 from numpy import testing as nptest
 
 from ..disk_structure import KEYS_H5_NAME, BaseDiskData, DiskDict, DiskList
-from ..h5file import H5File
+from ..h5file import H5File, compact, live_size
 from .spectrum import Spectrum
 
 
@@ -199,3 +199,53 @@ def test_list_proxy():
     proxy.spectrum_list.clear()
     proxy.save_to_disk()
     assert len(fo[key]) == 0 + 1
+
+
+def test_list_extend_from():
+    from ..disk_structure import DiskListDirectView
+    f = H5File()
+    tmp = H5File()
+    fo = f._obj
+    to = tmp._obj
+
+    proxy = DiskData(fo, to)
+    for i in range(3):
+        intensity = mz = np.ones(10) * i
+        proxy.spectrum_list.append(Spectrum(mz=mz, intensity=intensity,
+                                            time=datetime(2000, 1, i + 1)))
+    proxy.save_to_disk()
+    del proxy.spectrum_list[2]
+
+    new = DiskListDirectView(Spectrum, to, "tmp")
+    for i in range(3, 6):
+        intensity = mz = np.ones(10) * i
+        new.append(Spectrum(mz=mz, intensity=intensity,
+                            time=datetime(2000, 1, i + 1)))
+    proxy.spectrum_list.extend_from(new)
+    assert "tmp" not in to
+    proxy.save_to_disk()
+
+    assert len(fo["spectrum_list"]) == 5 + 1
+    assert [spectrum.time.day for spectrum in proxy.spectrum_list] == [1, 2, 4, 5, 6]
+
+
+def test_compact(tmp_path):
+    path = tmp_path / "data.h5"
+    f = H5File(path)
+    data = DiskData(f._obj)
+    spectra = [Spectrum(mz=np.arange(10000.), intensity=np.arange(10000.), time=datetime(2000, 1, 1))] * 10
+    for _ in range(5):
+        data.spectrum_list = spectra
+    f.close()
+
+    size = path.stat().st_size
+    reclaimed = compact(path)
+    assert reclaimed > 0
+    assert path.stat().st_size == size - reclaimed
+
+    f = H5File(path, 'r')
+    data = DiskData(f._obj)
+    assert len(data.spectrum_list) == 10
+    nptest.assert_equal(data.spectrum_list[9].mz, spectra[0].mz)
+    assert live_size(f._obj) <= path.stat().st_size
+    f.close()
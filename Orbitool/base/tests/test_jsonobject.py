@@ -32,3 +32,20 @@ def test_dataset():
     f = H5File()
     f.write("s", s)
     assert f.read("s", Struct) == s
+
+
+def test_dataset_rows_not_shared():
+    class Row(BaseRowStructure):
+        j: JSONObject
+
+    class Struct(BaseStructure):
+        lr: List[Row] = []
+
+    filter = {"polarity": "-1"}
+    s = Struct(lr=[Row(j=filter) for _ in range(3)])
+
+    f = H5File()
+    f.write("s", s)
+    rows = f.read("s", Struct).lr
+    rows[0].j["polarity"] = "1"
+    assert [row.j["polarity"] for row in rows] == ["1", "-1", "-1"]
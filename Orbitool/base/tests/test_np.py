@@ -112,3 +112,28 @@ def test_unicode_str():
     b = f.read("ta", US)
 
     assert a == b
+
+
+def test_orbitrap_mz_codec():
+    class MzStructure(BaseStructure):
+        mz: NdArray[float, -1, 'orbitrap_mz']
+        others: NdArray[float, -1, 'orbitrap_mz']
+
+    grid = 1 / np.linspace(1 / np.sqrt(50), 1 / np.sqrt(750), 100000) ** 2
+    runs = [grid[start:start + 5 + start % 60] for start in range(0, 99000, 97)]
+    mz = np.concatenate(runs)
+    others = np.array([3., 1., 2.])
+    a = MzStructure(mz=mz, others=others)
+
+    f = H5File()
+    f.write("mz", a)
+    assert f._obj["mz/mz"].dtype == np.uint8
+    assert f._obj["mz/others"].dtype == float  # not increasing, stored as usual
+    assert f._obj["mz/mz"].size * 3 < mz.nbytes
+
+    b = f.read("mz", MzStructure)
+    nptest.assert_array_equal(b.mz.view(np.int64), mz.view(np.int64))
+    nptest.assert_array_equal(b.others, others)
+
+    with pytest.raises(AnnotationError):
+        TypeAdapter(NdArray[float, -1, 'unknown'])
@@ -0,0 +1,85 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List
+
+import numpy as np
+
+from .. import BaseRowStructure, BaseStructure, H5File, JSONObject
+from ..extra_type_handlers.column_handler import get_rows_plan
+
+
+class Row(BaseRowStructure):
+    name: str
+    position: float
+    time: datetime
+    duration: timedelta = timedelta(seconds=1)
+    extra: JSONObject = {}
+
+
+def rows(num: int):
+    now = datetime.now()
+    extra = {"filter": "a"}
+    return [Row(name=str(i), position=i * 1.5, time=now + timedelta(i),
+                duration=timedelta(minutes=i), extra=extra) for i in range(num)]
+
+
+def test_plan_cached():
+    assert get_rows_plan(Row) is get_rows_plan(Row)
+    assert get_rows_plan(Row, int) is not get_rows_plan(Row)
+
+
+def test_to_array():
+    a = rows(10)
+    array = get_rows_plan(Row).to_array(a)
+    assert array.dtype.names == ("name", "position", "time", "duration", "extra")
+    assert np.allclose(array["position"], [r.position for r in a])
+    # stored as h5 dtype
+    assert (array["time"].view("M8[us]") == np.array([r.time for r in a], "M8[us]")).all()
+
+
+def test_rows():
+    class Struct(BaseStructure):
+        l: List[Row] = []
+        d: Deque[Row] = deque()
+        dd: Dict[int, Row] = {}
+
+    a = rows(10)
+    s = Struct(l=a, d=a, dd={i * 2: r for i, r in enumerate(a)})
+
+    f = H5File()
+    f.write("s", s)
+    b = f.read("s", Struct)
+    assert b == s
+    assert isinstance(b.d, deque)
+    assert type(b.l[0].time) == datetime
+    assert type(b.l[0].duration) == timedelta
+    # json objects are loaded per row, editing one row leaves others intact
+    assert b.l[0].extra == b.l[1].extra
+    assert b.l[0].extra is not b.l[1].extra
+
+    f.write("s", Struct())
+    assert f.read("s", Struct) == Struct()
+
+
+def test_single_field():
+    class Single(BaseRowStructure):
+        a: int
+
+    f = H5File()
+    a = [Single(a=i) for i in range(10)]
+    f.write("s", a, List[Single])
+    b = f.read("s", List[Single])
+    assert a == b
+    b[0].a = 100
+    assert b[0].model_fields_set == {"a"}
+    assert b[1].a == 1
+
+
+def test_timezone_aware():
+    class Aware(BaseRowStructure):
+        time: datetime
+
+    now = datetime.now(timezone.utc)
+    f = H5File()
+    f.write("s", [Aware(time=now)], List[Aware])
+    assert f.read("s", List[Aware])[0].time == now.replace(tzinfo=None)
@@ -28,6 +28,11 @@ class General(BaseModel):
     time_format: str = r"%Y-%m-%d %H:%M:%S"
     export_time_format: str = r"%Y%m%d_%H%M%S"
     multi_cores: int = multi_cores
+    # compact workspace on save if unused space is larger than this ratio of file size. <= 0 to disable
+    auto_compact_ratio: float = .5
+    # store m/z of spectra, fitted peaks and peak fit tab by `orbitrap_mz` codec, about 4x smaller.
+    # workspaces written with it couldn't be opened by older versions
+    compress_mz: bool = False
 
 
 class File(BaseModel):
@@ -48,6 +53,12 @@ class Peakfit(BaseModel):
 class TimeSeries(BaseModel):
     mz_sum_target: Literal["peak_intensity", "area"] = "peak_intensity"
     mz_sum_func: Literal["nofit", "norm"] = "nofit"
+    # fit each calibrated spectrum once and keep fitted peaks in workspace,
+    # later time series are read from them
+    use_fitted_peak_tables: bool = False
+    # keep prefix sums of raw peak areas of each calibrated spectrum,
+    # then nofit area sums are read by binary search
+    use_peak_area_index: bool = False
 
     export_time_formats: Set[Literal[
         "iso", "igor", "matlab", "excel"]] = {"iso"}
@@ -56,6 +67,9 @@ class TimeSeries(BaseModel):
 class Debug(BaseModel):
     thread_block_gui: bool = False
     NO_MULTIPROCESS: bool = False
+    # record spans of each step and multiprocess stage, summarized in log
+    # and saved as chrome trace to trace.json
+    trace: bool = False
 
 
 class _Setting(BaseModel):
@@ -72,6 +86,9 @@ class _Setting(BaseModel):
     time_delta: timedelta = timedelta(seconds=1)
 
     plot_refresh_interval: float = 1
+    # long lines are drawn from min / max of each block of points,
+    # about this many points per pixel of visible range. <= 0 to disable
+    plot_points_per_pixel: float = 2
 
     version: str = VERSION
 
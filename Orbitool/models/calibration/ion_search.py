@@ -0,0 +1,65 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..peakfit import BaseFunc
+from ..spectrum import FittedPeak, Peak
+
+
+def raw_peak_bounds(intensity: np.ndarray, delta: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    return starts, stops of runs of intensity > delta (stop exclusive)
+    """
+    positive = np.concatenate(([False], intensity > delta, [False]))
+    edges = np.flatnonzero(positive[1:] != positive[:-1])
+    return edges[::2], edges[1::2]
+
+
+def find_ions_peak(
+        mz: np.ndarray, intensity: np.ndarray, fit_func: BaseFunc, ions: Sequence[float], rtol: float,
+        end_points: Sequence[float], rtols: Sequence[float], intensity_filters: Sequence[float]) -> List[Tuple[float, float]]:
+    """
+    (position, intensity) of highest fitted peak of each ion, nan if none.
+    Raw peaks within `ion * (1 ± rtol)` whose maximum is higher than intensity filter of
+    the ion's segment are fitted from the highest one, until its highest fitted peak is
+    within rtol of the segment.
+    `ions` are sorted, segment i ends before `end_points[i]`.
+    """
+    ions = np.asarray(ions, dtype=float)
+    ret: List[Tuple[float, float]] = [(np.nan, np.nan)] * len(ions)
+    if not len(ions) or not len(mz):
+        return ret
+    segment_indexes = np.searchsorted(np.asarray(end_points, dtype=float), ions, 'right')
+    seg_rtols = np.asarray(rtols, dtype=float)[segment_indexes]
+    seg_filters = np.asarray(intensity_filters, dtype=float)[segment_indexes]
+
+    starts, stops = raw_peak_bounds(intensity)
+    if not len(starts):
+        return ret
+    maxes = np.maximum.reduceat(intensity, starts)
+    # raw peak with zeros at both sides, same as `splitPeaks(*safeCutSpectrum(...))`
+    lefts = np.maximum(starts - 1, 0)
+    rights = np.minimum(stops + 1, len(mz))
+    left_mz = np.where(starts > 0, mz[lefts], -np.inf)
+
+    deltas = ions * rtol
+    firsts = np.searchsorted(mz[stops - 1], ions - deltas, 'left')
+    lasts = np.searchsorted(left_mz, ions + deltas, 'right')
+
+    fitted: Dict[int, FittedPeak] = {}
+    for index in np.flatnonzero(firsts < lasts).tolist():
+        candidates = np.arange(firsts[index], lasts[index])
+        candidates = candidates[maxes[candidates] > seg_filters[index]]
+        ion = ions[index]
+        for peak_index in candidates[np.argsort(-maxes[candidates], kind="stable")].tolist():
+            if (peak := fitted.get(peak_index)) is None:
+                slt = slice(lefts[peak_index], rights[peak_index])
+                target_peaks = fit_func.splitPeak(
+                    Peak(mz=mz[slt], intensity=intensity[slt]))
+                peak = target_peaks[np.argmax(
+                    [p.peak_intensity for p in target_peaks])]
+                fitted[peak_index] = peak
+            if abs(peak.peak_position / ion - 1) < seg_rtols[index]:
+                ret[index] = (peak.peak_position, peak.peak_intensity)
+                break
+    return ret
@@ -0,0 +1,41 @@
+from numpy import array, isnan, zeros
+from numpy.testing import assert_almost_equal
+from ..peakfit import NoFitFunc
+from .ion_search import find_ions_peak, raw_peak_bounds
+
+
+def test_raw_peak_bounds():
+    starts, stops = raw_peak_bounds(array([1., 0, 2, 3, 0, 0, 4]))
+    assert starts.tolist() == [0, 2, 6]
+    assert stops.tolist() == [1, 4, 7]
+
+
+def test_find_ions_peak():
+    mz = array([100 + i * 1e-4 for i in range(200)])
+    intensity = zeros(200)
+    # (center, height)
+    for center, height in [(20, 5.), (26, 50.), (100, 30.), (150, 2.)]:
+        intensity[center - 2:center + 3] = height * array([.2, .6, 1, .6, .2])
+
+    ions = [mz[20], mz[100], mz[150], mz[180]]
+    ret = find_ions_peak(
+        mz, intensity, NoFitFunc(), ions, 1e-5,
+        [100.01, 101], [3e-6, 3e-6], [1., 10.])
+    # highest raw peak in window is out of segment rtol
+    assert_almost_equal(ret[0], (mz[20], 5.))
+    assert_almost_equal(ret[1], (mz[100], 30.))
+    # lower than intensity filter
+    assert isnan(ret[2][0])
+    assert isnan(ret[3][0])
+
+
+def test_find_ions_peak_at_end_point():
+    mz = array([100 + i * 1e-4 for i in range(200)])
+    intensity = zeros(200)
+    intensity[98:103] = 30. * array([.2, .6, 1, .6, .2])
+
+    # ion at end point uses filter of the next segment
+    ret = find_ions_peak(
+        mz, intensity, NoFitFunc(), [mz[100]], 1e-5,
+        [mz[100], 101], [3e-6, 3e-6], [100., 10.])
+    assert_almost_equal(ret[0], (mz[100], 30.))
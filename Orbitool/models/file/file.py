@@ -7,7 +7,7 @@ from typing import Dict, Iterable, List, Optional, Tuple, TypedDict, Union
 import numpy as np
 
 from Orbitool.base import BaseRowStructure, BaseDatasetStructure, BaseStructure, JSONObject
-from Orbitool.utils.readers import ThermoFile, spectrum_filter
+from Orbitool.utils.readers import SpectrumReader, open_reader, reader_for_file, spectrum_filter
 
 from ..spectrum import spectrum
 from .part_file import (generate_periods, generate_num_periods,
@@ -17,6 +17,7 @@ from .part_file import (generate_periods, generate_num_periods,
 class PATH_TYPE(str, Enum):
     THERMO = "Thermo"
     HDF5 = "HDF5"
+    MZML = "mzML"
 
 
 class Path(BaseRowStructure):
@@ -26,26 +27,18 @@ class Path(BaseRowStructure):
     endDatetime: datetime
     scanNum: int = -1
 
-    def getFileHandler(self):
+    def getFileHandler(self) -> SpectrumReader:
         typ, path = self.path.split(":", 1)
-        match typ:
-            case PATH_TYPE.THERMO.value:
-                return ThermoFile(path)
-        assert False
+        return open_reader(typ, path)
 
     @classmethod
-    def fromThermoFile(cls, filepath, other_paths: Iterable["Path"]):
-        handler = ThermoFile(filepath)
-        stem = FilePath(filepath).stem
-        # key = stem
-        # other_keys = set(p.key for p in other_paths)
-        # while True:
-        #     if key not in other_keys:
-        #         break
-        #     key = f"{stem}-{random.randbytes(4).hex()}"
+    def fromFile(cls, filepath, other_paths: Iterable["Path"]):
+        reader = reader_for_file(str(filepath))
+        if reader is None:
+            raise ValueError(f'unsupported file type: "{filepath}"')
+        handler = reader(filepath)
         return cls(
-            path=f"{PATH_TYPE.THERMO.value}:{filepath}",
-            # key=key,
+            path=f"{reader.path_type}:{filepath}",
             createDatetime=handler.creationDatetime,
             startDatetime=handler.startDatetime,
             endDatetime=handler.endDatetime,
@@ -54,9 +47,7 @@ class Path(BaseRowStructure):
 
     def get_show_name(self):
         typ, path = self.path.split(":", 1)
-        match typ:
-            case PATH_TYPE.THERMO.value:
-                return FilePath(path).stem
+        return FilePath(path).stem
 
 
 class PathList(BaseDatasetStructure):
@@ -82,8 +73,8 @@ class PathList(BaseDatasetStructure):
                 end = f.endDatetime
         return start, end
 
-    def addThermoFile(self, filepath):
-        path = Path.fromThermoFile(filepath, self.paths)
+    def addFile(self, filepath):
+        path = Path.fromFile(filepath, self.paths)
 
         crossed, crossed_file = self._crossed(
             path.startDatetime, path.endDatetime)
@@ -254,8 +245,7 @@ class FileSpectrumInfo(spectrum.SpectrumInfo):
             reader = last_reader["reader"]
         else:
             origin, realpath = self.path.split(':', 1)
-            if origin == PATH_TYPE.THERMO.value:
-                reader = ThermoFile(realpath)
+            reader = open_reader(origin, realpath)
         ret = reader.getAveragedSpectrumInTimeRange(
             self.start_time, self.end_time, rtol, self.filter, self.stats_filter)  # type: ignore
         if ret is None:
@@ -270,4 +260,4 @@ class FileSpectrumInfo(spectrum.SpectrumInfo):
 
 class LastReader(TypedDict):
     path: str
-    reader: ThermoFile
+    reader: SpectrumReader
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Union, Iterator, Tuple, overload
+from typing import Iterable, List, Union, Iterator, Tuple, overload
 
 import numpy as np
 
@@ -60,3 +60,12 @@ class Formula:
     def __eq__(self, formula: Formula): ...
     def __contains__(self, formula: Formula): ...
     def __hash__(self): ...
+
+
+def formulas_to_numpy(formulas: Iterable[Formula]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    encode formulas to a ragged array (data, offsets)
+    data: int32 array with shape (n, 3), rows are the same as `Formula.to_numpy`
+    offsets: int64 array, formulas[i] is data[offsets[i]:offsets[i+1]]
+    """
+def formulas_from_numpy(data: np.ndarray, offsets: np.ndarray) -> List[Formula]: ...
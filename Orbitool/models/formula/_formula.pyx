@@ -2,7 +2,7 @@
 # cython: language_level = 3
 from cpython cimport *
 from cython.operator cimport dereference as deref, preincrement as inc
-from libc.stdint cimport int32_t, uint64_t
+from libc.stdint cimport int32_t, int64_t, uint64_t
 from libcpp.vector cimport vector
 from libcpp.string cimport string
 from libcpp.list cimport list as cpplist
@@ -65,6 +65,38 @@ cdef double _elements_isotopes_mass(int_map&elements, ints_map&isotopes):
     return _mass_isotopes_mass(_elements_mass(elements), isotopes)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t _fill_numpy(Formula f, int32_t[:, ::1] data, Py_ssize_t row):
+    '''
+    write f to data[row:], return next row
+    '''
+    cdef int_pair it
+    for it in f.elements:
+        data[row,0]=it.first
+        data[row,1]=0
+        data[row,2]=it.second
+        inc(row)
+    cdef ints_pair iit
+    for iit in f.isotopes:
+        data[row,0]=iit.first.first
+        data[row,1]=iit.first.second
+        data[row,2]=iit.second
+        inc(row)
+    return row
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _read_numpy(Formula f, int32_t[:, ::1] data, Py_ssize_t begin, Py_ssize_t end) except *:
+    cdef Py_ssize_t i
+    for i in range(begin, end):
+        if data[i,1]==0:
+            f.setE(data[i,0],data[i,2])
+        else:
+            f.setI(data[i,0],data[i,1],data[i,2])
+
+
 cdef int get_right_parenthesis_index(str s,int left_index,int length = -1) except *:
     if length < 0:
         length = len(s)
@@ -465,26 +497,12 @@ cdef class Formula:
                 return False
         return True
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def to_numpy(self):
         '''
         atomic number | mass number | number
         '''
         cdef np.ndarray[np.int32_t, ndim=2] ret = np.empty((self.elements.size()+self.isotopes.size(),3),dtype=np.int32)
-        cdef int32_t i = 0
-        cdef int_pair it
-        for it in self.elements:
-            ret[i,0]=it.first
-            ret[i,1]=0
-            ret[i,2]=it.second
-            inc(i)
-        cdef ints_pair iit
-        for iit in self.isotopes:
-            ret[i,0]=iit.first.first
-            ret[i,1]=iit.first.second
-            ret[i,2]=iit.second
-            inc(i)
+        _fill_numpy(self, ret, 0)
         return ret
 
     def to_dict(self):
@@ -498,17 +516,10 @@ cdef class Formula:
         return ret
 
     @staticmethod
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    def from_numpy(np.ndarray[np.int_t, ndim=2] data):
+    def from_numpy(data):
         assert data.shape[1]==3
         cdef Formula f = Formula.__new__(Formula)
-        cdef int32_t i
-        for i in range(data.shape[0]):
-            if data[i,1]==0:
-                f.setE(data[i,0],data[i,2])
-            else:
-                f.setI(data[i,0],data[i,1],data[i,2])
+        _read_numpy(f, np.ascontiguousarray(data, dtype=np.int32), 0, data.shape[0])
         return f
 
     def keys(self):
@@ -614,3 +625,41 @@ cdef class Formula:
         for it in self.isotopes:
             ret^=hash((((it.first.first<<hash_factor)+it.first.second)<<hash_factor)+it.second)
         return ret
+
+
+def formulas_to_numpy(formulas):
+    '''
+    encode formulas to a ragged array (data, offsets)
+    data: int32 array with shape (n, 3), rows are the same as `Formula.to_numpy`
+    offsets: int64 array, formulas[i] is data[offsets[i]:offsets[i+1]]
+    '''
+    cdef list fs = list(formulas)
+    cdef Py_ssize_t i, total = 0
+    cdef Formula f
+    cdef np.ndarray[np.int64_t] offsets = np.empty(len(fs) + 1, dtype=np.int64)
+    offsets[0] = 0
+    for i in range(len(fs)):
+        f = fs[i]
+        total += f.elements.size() + f.isotopes.size()
+        offsets[i + 1] = total
+    cdef np.ndarray[np.int32_t, ndim=2] data = np.empty((total, 3), dtype=np.int32)
+    total = 0
+    for f in fs:
+        total = _fill_numpy(f, data, total)
+    return data, offsets
+
+
+def formulas_from_numpy(data, offsets):
+    '''
+    decode ragged array from `formulas_to_numpy`
+    '''
+    cdef int32_t[:, ::1] d = np.ascontiguousarray(data, dtype=np.int32).reshape(-1, 3)
+    cdef int64_t[::1] o = np.ascontiguousarray(offsets, dtype=np.int64)
+    cdef Py_ssize_t i
+    cdef Formula f
+    cdef list ret = []
+    for i in range(o.shape[0] - 1):
+        f = Formula.__new__(Formula)
+        _read_numpy(f, d, o[i], o[i + 1])
+        ret.append(f)
+    return ret
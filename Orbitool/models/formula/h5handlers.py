@@ -1,12 +1,12 @@
-from typing import Any, Iterable, List, Union
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
 import numpy as np
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
-from Orbitool.base.extra_type_handlers.column_handler import StrTypeHandler as StrCellTypeHandler
+from Orbitool.base.extra_type_handlers.column_handler import ColumnCellTypeHandler
 
 from Orbitool.base.extra_type_handlers.simple_handlers import StrTypeHandler
-from ._formula import Formula
+from ._formula import Formula, formulas_from_numpy, formulas_to_numpy
 
 
 def validate_formula(value):
@@ -34,14 +34,24 @@ class FormulaTypeHandler(StrTypeHandler):
             value = value.decode()
         return Formula(value)
 
-class FormulaCellTypeHandler(StrCellTypeHandler):
+class FormulaCellTypeHandler(ColumnCellTypeHandler):
+    """
+    ragged: `data` is `Formula.to_numpy()` of all formulas, the column is the end row of each.
+    Old files store formulas as utf-8 strings, which are still readable.
+    """
     column_target = FormulaType
+    dtype = np.dtype("int64")
+    ragged = True
 
-    def convert_to_npcolumn(self, value: List[Formula]) -> np.ndarray:
-        return np.array(list(map(str, value)), self.dtype)
+    def convert_to_ragged(self, value: List[Formula]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        data, offsets = formulas_to_numpy(value)
+        return offsets[1:], {"data": data}
+
+    def convert_from_ragged(self, ends: np.ndarray, arrays: Dict[str, np.ndarray]) -> List[Formula]:
+        return formulas_from_numpy(arrays["data"], np.concatenate(([0], ends)))
 
     def convert_from_npcolumn(self, value: np.ndarray) -> List[Formula]:
-        return list(map(Formula, value.tolist()))
+        return list(map(Formula, value.astype(str).tolist()))
 
 
 def validate_formula_list(value):
@@ -70,11 +80,29 @@ class FormulaListTypeHandler(StrTypeHandler):
     def convert_from_attr(self, value):
         return validate_formula_list(value)
 
-class FormulaListCellTypeHandler(StrCellTypeHandler):
+class FormulaListCellTypeHandler(ColumnCellTypeHandler):
+    """
+    ragged: `data` is `Formula.to_numpy()` of all formulas, formula `i` is
+    `data[offsets[i]:offsets[i + 1]]`, the column is the end formula of each list.
+    Old files store formula lists as comma separated utf-8 strings, which are still readable.
+    """
     column_target = FormulaList
+    dtype = np.dtype("int64")
+    ragged = True
+
+    def convert_to_ragged(self, value: List[List[Formula]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        data, offsets = formulas_to_numpy(f for v in value for f in v)
+        ends = np.cumsum(np.fromiter(map(len, value), np.int64, len(value)))
+        return ends, {"data": data, "offsets": offsets}
+
+    def convert_from_ragged(self, ends: np.ndarray, arrays: Dict[str, np.ndarray]) -> list:
+        formulas = formulas_from_numpy(arrays["data"], arrays["offsets"])
+        begin = 0
+        ret = []
+        for end in ends.tolist():
+            ret.append(formulas[begin:end])
+            begin = end
+        return ret
 
-    def convert_to_npcolumn(self, value: List[List[Formula]]) -> np.ndarray:
-        return np.array([','.join(map(str, v)) for v in value], self.dtype)
-    
     def convert_from_npcolumn(self, value: np.ndarray) -> list:
-        return list(map(validate_formula_list, value.tolist()))
+        return list(map(validate_formula_list, value.astype(str).tolist()))
@@ -5,6 +5,7 @@ import pytest
 from pyteomics import mass as pyteomass
 
 from .. import Formula
+from .._formula import formulas_from_numpy, formulas_to_numpy
 
 
 def test_formula1():
@@ -74,6 +75,7 @@ def test_isotopes():
     assert h == f
 
     assert Formula.from_numpy(f.to_numpy()) == f
+    assert Formula.from_numpy(f.to_numpy().astype(int)) == f
 
     assert g.findOrigin() == f.findOrigin()
     assert g.atoms() == f.atoms() == Formula("C")
@@ -161,4 +163,16 @@ def test_modify():
     f['C'] = 1
     assert f == Formula("C[13]H6")
     f['C[12]'] = 1
-    assert f == Formula("CC[13]H6")
\ No newline at end of file
+    assert f == Formula("CC[13]H6")
+
+
+def test_formulas_numpy():
+    formulas = [Formula("C7H8O2"), Formula("CC[13]H[2]-"), Formula(), Formula("N")]
+    data, offsets = formulas_to_numpy(formulas)
+    assert data.shape == (offsets[-1], 3)
+    for index, f in enumerate(formulas):
+        assert (data[offsets[index]:offsets[index + 1]] == f.to_numpy()).all()
+    assert formulas_from_numpy(data, offsets) == formulas
+
+    data, offsets = formulas_to_numpy([])
+    assert formulas_from_numpy(data, offsets) == []
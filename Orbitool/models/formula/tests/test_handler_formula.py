@@ -1,3 +1,6 @@
+from typing import Dict
+
+import numpy as np
 from pydantic import BaseModel, ValidationError
 import pytest
 from numpy import testing as nptest
@@ -54,6 +57,52 @@ def test_formulas():
     for formulas in formulas_table:
         assert formulas.formulas == []
 
+def test_ragged_layout():
+    f = H5File()
+    rows = [FormulasItem(formulas=formula_list), FormulasItem(formulas=[]),
+            FormulasItem(formulas=formula_list[1:])]
+    f.write("fss", rows, List[FormulasItem])
+
+    group = f._obj["fss"]
+    data, offsets = formulas_to_numpy(formula_list + formula_list[1:])
+    assert group["formulas.data"].dtype == np.int32
+    nptest.assert_array_equal(group["formulas.data"][()], data)
+    nptest.assert_array_equal(group["formulas.offsets"][()], offsets)
+    nptest.assert_array_equal(group["rows"]["formulas"], [3, 3, 5])
+    assert f.read("fss", List[FormulasItem]) == rows
+
+    f.write("fs", {"a": formula_list[0], "b": Formula()}, Dict[str, FormulaType])
+    nptest.assert_array_equal(f._obj["fs"]["value.data"][()], formula_list[0].to_numpy())
+    assert f.read("fs", Dict[str, FormulaType]) == {"a": formula_list[0], "b": Formula()}
+
+    f.write("fss", [], List[FormulasItem])
+    assert f.read("fss", List[FormulasItem]) == []
+
+
+class FormulaListStructure(BaseStructure):
+    formulas: List[FormulaType]
+
+
+def test_formula_list_dataset():
+    f = H5File()
+    f.write("s", FormulaListStructure(formulas=formula_list))
+    assert f.read("s", FormulaListStructure).formulas == formula_list
+
+
+def test_old_strings():
+    f = H5File()
+    f._obj.create_dataset("fs", data=np.array(
+        [(str(formula).encode(),) for formula in formula_list], [("formula", "S20")]))
+    f._obj.create_dataset("fss", data=np.array(
+        [(",".join(map(str, formula_list)).encode(),), (b"",)], [("formulas", "S50")]))
+
+    formulas = f.read("fs", List[FormulaItem])
+    assert [item.formula for item in formulas] == formula_list
+    formulas_table = f.read("fss", List[FormulasItem])
+    assert formulas_table[0].formulas == formula_list
+    assert formulas_table[1].formulas == []
+
+
 class FormulasAttr(BaseStructure):
     formulas: FormulaList = []
 
@@ -1,7 +1,7 @@
 from . import normal_distribution
-from .nofit_func import NoFitFunc
+from .nofit_func import NoFitFunc, PeakAreaIndex
 from ._line_check import linePeakCrossed
-from .base_fit_func import BaseFunc, get_peak_position
+from .base_fit_func import BaseFunc, FittedPeakTable, get_peak_position
 from .peaks_manager import PeaksManager
 from .residual import calculateResidual
 from .masslist import MassListItem, MassListHelper
@@ -1,9 +1,10 @@
+from datetime import datetime
 from itertools import chain
-from typing import List, Literal, Optional
+from typing import Iterable, List, Literal, Optional, Sequence, Tuple
 
 import numpy as np
 
-from Orbitool.base import BaseStructure
+from Orbitool.base import BaseDatasetStructure, BaseStructure, NdArray
 
 from ..spectrum import FittedPeak, Peak, Spectrum
 from Orbitool.utils.binary_search import indexBetween_np, indexNearest, indexFirstBiggerThan
@@ -49,5 +50,108 @@ class BaseFunc(BaseStructure):
 
         return None
 
+    def get_peaks_max(self, peaks: List[Peak], mz_ranges: Sequence[Tuple[float, float]], target: Literal["peak_intensity", "area"] = "peak_intensity") -> List[Optional[Tuple[float, float]]]:
+        """
+        `get_peak_max` for each range, but each raw peak overlapped by
+        any range is split / fitted only once.
+        """
+        if not len(mz_ranges) or not peaks:
+            return [None] * len(mz_ranges)
+        ranges = np.array(mz_ranges, dtype=float).reshape(-1, 2)
+
+        # raw peaks overlapped by each range, the same as `get_peak_max`
+        peaks_min = np.array([peak.mz.min() for peak in peaks])
+        peaks_max = np.array([peak.mz.max() for peak in peaks])
+        lindexes = np.searchsorted(peaks_max, ranges[:, 0], 'right')
+        rindexes = np.searchsorted(peaks_min, ranges[:, 1], 'right')
+        valid = lindexes < rindexes
+        cover = np.zeros(len(peaks) + 1, dtype=int)
+        np.add.at(cover, lindexes[valid], 1)
+        np.add.at(cover, rindexes[valid], -1)
+        needed = np.flatnonzero(np.cumsum(cover[:-1]) > 0)
+
+        return FittedPeakTable.FromPeaks(self, peaks, needed).get_max(ranges, target)
+
     def get_peak_sum(self, peaks: List[Peak], target: Literal["peak_intensity", "area"] = "peak_intensity") -> float:
         return sum(sum(getattr(p, target) for p in self.splitPeak(peak)) for peak in peaks)
+
+
+class FittedPeakTable(BaseDatasetStructure):
+    """
+    Fitted components of raw peaks in a spectrum, sorted by position.
+    Could answer `BaseFunc.get_peak_max` for any range without fitting again.
+    """
+    position: NdArray[float, -1]
+    peak_intensity: NdArray[float, -1]
+    area: NdArray[float, -1]
+    # index of raw peak in spectrum
+    raw_index: NdArray[int, -1]
+    raw_mz_min: NdArray[float, -1]
+    raw_mz_max: NdArray[float, -1]
+    # m/z of the last non-zero point of raw peak
+    raw_signal_max: NdArray[float, -1]
+
+    start_time: Optional[datetime] = None
+
+    @classmethod
+    def FromPeaks(cls, func: BaseFunc, peaks: List[Peak], indexes: Optional[Iterable[int]] = None, start_time: Optional[datetime] = None):
+        """
+        fit peaks[indexes] (default all peaks) once
+        """
+        if indexes is None:
+            indexes = range(len(peaks))
+        rows = []
+        for index in indexes:
+            peak = peaks[index]
+            mz_min = peak.mz.min()
+            mz_max = peak.mz.max()
+            signal = peak.mz[peak.intensity > 1e-9]
+            signal_max = signal.max() if len(signal) else mz_max
+            for fitted in func.splitPeak(peak):
+                rows.append((fitted.peak_position, fitted.peak_intensity, fitted.area, index, mz_min, mz_max, signal_max))
+        rows.sort(key=lambda row: row[0])
+        columns = list(zip(*rows)) if rows else [()] * 7
+        return cls(
+            position=np.array(columns[0], dtype=float),
+            peak_intensity=np.array(columns[1], dtype=float),
+            area=np.array(columns[2], dtype=float),
+            raw_index=np.array(columns[3], dtype=int),
+            raw_mz_min=np.array(columns[4], dtype=float),
+            raw_mz_max=np.array(columns[5], dtype=float),
+            raw_signal_max=np.array(columns[6], dtype=float),
+            start_time=start_time)
+
+    def get_max(self, mz_ranges: Sequence[Tuple[float, float]], target: Literal["peak_intensity", "area"] = "peak_intensity") -> List[Optional[Tuple[float, float]]]:
+        """
+        `BaseFunc.get_peak_max` for each range
+        """
+        ret: List[Optional[Tuple[float, float]]] = [None] * len(mz_ranges)
+        if not len(mz_ranges):
+            return ret
+        ranges = np.array(mz_ranges, dtype=float).reshape(-1, 2)
+        min_mzs, max_mzs = ranges[:, 0], ranges[:, 1]
+        positions = self.position
+        values = getattr(self, target)
+        lefts = np.searchsorted(positions, min_mzs, 'right')
+        rights = np.searchsorted(positions, max_mzs, 'left')
+        for index in np.flatnonzero(lefts < rights).tolist():
+            slt = slice(lefts[index], rights[index])
+            # only components from raw peaks overlapped by range
+            overlapped = (self.raw_mz_max[slt] > min_mzs[index]) & (
+                self.raw_mz_min[slt] <= max_mzs[index])
+            candidates = np.where(overlapped, values[slt], -np.inf)
+            i = candidates.argmax()
+            if candidates[i] > -np.inf:
+                ret[index] = positions[slt][i], values[slt][i]
+        return ret
+
+    def get_sum(self, mz_min: float, mz_max: float, target: Literal["peak_intensity", "area"] = "peak_intensity") -> float:
+        """
+        `BaseFunc.get_peak_sum` of peaks cut by `safeCutSpectrum`: all components of
+        raw peaks overlapped by [mz_min, mz_max], whose positions may be out of it
+        """
+        # every component carries bounds of its raw peak, so whole raw peaks are selected.
+        # `safeCutSpectrum` keeps a raw peak if its leading zero is not after `mz_max`
+        # and a non-zero point is not before `mz_min`
+        overlapped = (self.raw_mz_min <= mz_max) & (self.raw_signal_max >= mz_min)
+        return float(getattr(self, target)[overlapped].sum())
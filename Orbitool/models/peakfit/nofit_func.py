@@ -1,8 +1,11 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 import numpy as np
 
+from Orbitool.base import BaseDatasetStructure, NdArray
 from ...models.spectrum import FittedPeak, Peak
 from ..spectrum import getPeaksPositions
+from ..spectrum._functions import splitPeaks as _splitPeaks
 from .base_fit_func import BaseFunc
 
 
@@ -52,3 +55,49 @@ class NoFitFunc(BaseFunc):
             peak_intensity=intensity[pos],
             area=np.trapz(intensity, mz)
         )
+
+
+class PeakAreaIndex(BaseDatasetStructure):
+    """
+    Prefix sums of raw peak areas in a spectrum. Areas of `NoFitFunc` components
+    of a raw peak add up to its trapezoid integral, so the nofit area sum of
+    `safeCutSpectrum(mz, intensity, mz_min, mz_max)` is a difference of two prefix sums.
+    """
+    # m/z of the point before each raw peak (-inf for none) and of its last nonzero point
+    left_mz: NdArray[float, -1]
+    right_mz: NdArray[float, -1]
+    cum_area: NdArray[float, -1]
+
+    start_time: Optional[datetime] = None
+
+    @classmethod
+    def FromSpectrum(cls, mz: np.ndarray, intensity: np.ndarray, start_time: Optional[datetime] = None):
+        if len(mz) < 2:
+            empty = np.empty(0, float)
+            return cls(left_mz=empty, right_mz=empty, cum_area=empty, start_time=start_time)
+        ranges = _splitPeaks(mz, intensity)
+        ranges = ranges[ranges[:, 0] < ranges[:, 1]]
+        delta = 1e-6
+        starts = ranges[:, 0] + (intensity[ranges[:, 0]] <= delta)
+        stops = ranges[:, 1] - 1 - (intensity[ranges[:, 1] - 1] <= delta)
+        # with zeros at both sides, which are kept by `safeCutSpectrum`
+        lefts = np.maximum(starts - 1, 0)
+        rights = np.minimum(stops + 1, len(mz) - 1)
+
+        integral = np.concatenate(
+            ([0.], np.cumsum(np.diff(mz) * (intensity[1:] + intensity[:-1]) / 2)))
+        return cls(
+            left_mz=np.where(starts > 0, mz[lefts], -np.inf),
+            right_mz=mz[stops],
+            cum_area=np.cumsum(integral[rights] - integral[lefts]),
+            start_time=start_time)
+
+    def get_sum(self, mz_min: float, mz_max: float) -> float:
+        """
+        `NoFitFunc().get_peak_sum(splitPeaks(*safeCutSpectrum(...)), "area")`
+        """
+        first = np.searchsorted(self.right_mz, mz_min, 'left')
+        last = np.searchsorted(self.left_mz, mz_max, 'right')
+        if last <= first:
+            return 0.
+        return float(self.cum_area[last - 1] - (self.cum_area[first - 1] if first else 0.))
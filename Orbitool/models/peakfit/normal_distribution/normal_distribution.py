@@ -2,7 +2,6 @@ import math
 from typing import List
 
 import numpy as np
-from scipy.optimize import curve_fit
 
 from Orbitool.base import BaseRowStructure
 
@@ -19,6 +18,7 @@ def getParam(peak: Peak, resolution=140000):
     sigma0 = mu0 / resolution / (2 * math.sqrt(2 * math.log(2)))
     a0 = intensity.max() * math.sqrt(2 * math.pi) * sigma0
     param0 = (a0, mu0, sigma0)
+    from scipy.optimize import curve_fit
     return curve_fit(func, mz, intensity, param0, maxfev=100)[0]
 
 
@@ -99,6 +99,7 @@ class NormalDistributionFunc(BaseFunc, BaseRowStructure):
         intensity: np.ndarray = peak.intensity
         mzmean = mz.mean()
         param = (intensity.max() * mzmean * self.peak_fit_sigma * 2, mzmean)
+        from scipy.optimize import curve_fit
         return curve_fit(self._funcFit, mz, intensity, param, maxfev=100)[0]
 
     def getIntensity(self, mz: np.ndarray, peak: FittedPeak):
@@ -126,6 +127,7 @@ class NormalDistributionFunc(BaseFunc, BaseRowStructure):
         uu = uu[:split_num]
         param = uu.reshape(-1)
 
+        from scipy.optimize import curve_fit
         mz = peak.mz
         intensity = peak.intensity
         mz_min = mz[0]  # mz.min()
@@ -1,5 +1,10 @@
+from datetime import datetime
+
 from numpy import testing as nptest
-from ..nofit_func import NoFitFunc, Peak, np
+from Orbitool.base import H5File
+from ..base_fit_func import FittedPeakTable
+from ..nofit_func import NoFitFunc, PeakAreaIndex, Peak, np
+from ...spectrum import safeCutSpectrum, splitPeaks
 
 
 def test_single_peak():
@@ -51,3 +56,65 @@ def test_two_peak():
     nptest.assert_approx_equal(int_sum, 9)
     area_sum = func.get_peak_sum([p], "area")
     nptest.assert_approx_equal(area_sum, np.trapz(intensity, mz))
+
+
+def test_peaks_max():
+    mz = np.arange(0.01, 1.2, 0.01)
+    intensity = np.zeros_like(mz)
+    for center, height in [(10, 3), (14, 5), (17, 2), (40, 8), (43, 7), (80, 1)]:
+        intensity[center - 2:center + 3] += height * np.array([.2, .6, 1, .6, .2])
+    peaks = splitPeaks(mz, intensity)
+    func = NoFitFunc()
+
+    ranges = [(0, 1), (0.095, 0.105), (0.13, 0.18), (0.395, 0.435),
+              (0.5, 0.6), (0.79, 0.81), (0.15, 0.135), (0, 0.001)]
+    for target in ["peak_intensity", "area"]:
+        assert func.get_peaks_max(peaks, ranges, target) == [
+            func.get_peak_max(peaks, mi, ma, target) for mi, ma in ranges]
+    assert func.get_peaks_max(peaks, []) == []
+
+
+def test_fitted_peak_table():
+    mz = np.arange(0.01, 1.2, 0.01)
+    intensity = np.zeros_like(mz)
+    for center, height in [(10, 3), (14, 5), (17, 2), (40, 8), (43, 7), (80, 1)]:
+        intensity[center - 2:center + 3] += height * np.array([.2, .6, 1, .6, .2])
+    peaks = splitPeaks(mz, intensity)
+    func = NoFitFunc()
+
+    time = datetime(2022, 1, 1, 1, 1, 1)
+    f = H5File()
+    f.write("table", FittedPeakTable.FromPeaks(func, peaks, start_time=time))
+    table = f.read("table", FittedPeakTable)
+    assert table.start_time == time
+    assert (np.diff(table.position) >= 0).all()
+
+    ranges = [(0.095, 0.105), (0.13, 0.18), (0.5, 0.6), (0.79, 0.81)]
+    assert table.get_max(ranges, "area") == [
+        func.get_peak_max(peaks, mi, ma, "area") for mi, ma in ranges]
+    nptest.assert_approx_equal(table.get_sum(0, 1.2), func.get_peak_sum(peaks))
+    nptest.assert_approx_equal(table.get_sum(0.35, 0.45), 15)
+    assert table.get_sum(0.5, 0.6) == 0
+
+
+def test_peak_area_index():
+    mz = np.arange(0.01, 1.2, 0.01)
+    intensity = np.zeros_like(mz)
+    for center, height in [(10, 3), (14, 5), (17, 2), (40, 8), (43, 7), (80, 1)]:
+        intensity[center - 2:center + 3] += height * np.array([.2, .6, 1, .6, .2])
+    func = NoFitFunc()
+
+    time = datetime(2022, 1, 1, 1, 1, 1)
+    f = H5File()
+    f.write("index", PeakAreaIndex.FromSpectrum(mz, intensity, time))
+    index = f.read("index", PeakAreaIndex)
+    assert index.start_time == time
+
+    ranges = [(0, 1.2), (0.095, 0.105), (0.13, 0.18), (0.395, 0.435),
+              (0.5, 0.6), (0.785, 0.815), (0.125, 0.126)]
+    for mi, ma in ranges:
+        peaks = splitPeaks(*safeCutSpectrum(mz, intensity, mi, ma))
+        nptest.assert_almost_equal(
+            index.get_sum(mi, ma), func.get_peak_sum(peaks, "area"))
+    assert index.get_sum(0.5, 0.6) == 0
+
@@ -5,4 +5,4 @@ from .functions import removeZeroPositions, splitPeaks
 from ._denoise import getNoisePeaks, noiseLODFunc, getGlobalShownNoise, getNoiseLODFromParam, updateGlobalParam, updateNoiseLODParam, splitNoise
 from .denoise import getNoiseParams, denoiseWithParams, denoise
 from ._average import mergeSpectra
-from .average import averageSpectra
+from .average import averageSpectra, calibrateAverageSpectra
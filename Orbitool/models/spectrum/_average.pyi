@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
 
@@ -9,3 +9,16 @@ def mergeSpectra(mass1: np.ndarray, intensity1: np.ndarray, mass2: np.ndarray,
     return mass, intensity
     """
     pass
+
+
+def calibrateAverageSpectra(masses: List[np.ndarray], intensities: List[np.ndarray], weights: np.ndarray,
+                            segment_ends: List[np.ndarray], poly_coefs: List[Optional[np.ndarray]],
+                            rtol: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    calibrate (segment i of spectrum k ends at `segment_ends[k][i]`, its mass is
+    multiplied by `1 - polyval(mass, poly_coefs[k][i])`, skipped if `poly_coefs[k]` is None)
+    and average spectra while merging, same as calibrating each and `averageSpectra`
+    return mass, intensity
+    """
+    pass
+
@@ -63,4 +63,104 @@ cpdef tuple mergeSpectra(DoubleArray mass1, DoubleArray intensity1,
             intensity[i]=int2[i2]
             preinc(i)
             preinc(i2)
-    return mass.base[:i], intensity.base[:i]
\ No newline at end of file
+    return mass.base[:i], intensity.base[:i]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double calibrated(double m, double[:, :] coefs, int segment):
+    # same as `m * (1 - numpy.polynomial.polynomial.polyval(m, coefs[segment]))`
+    cdef int j = coefs.shape[1] - 1
+    cdef double c = coefs[segment, j]
+    while j > 0:
+        j -= 1
+        c = coefs[segment, j] + c * m
+    return m * (1 - c)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef tuple calibrateAverageSpectra(list masses, list intensities, double[:] weights,
+        list segment_ends, list poly_coefs, double rtol):
+    cdef int count = len(masses), capacity = 0, k
+    for k in range(count):
+        capacity += len(masses[k])
+
+    cdef double[:] mass_a = np.empty(capacity, dtype=npdouble)
+    cdef double[:] intensity_a = np.empty(capacity, dtype=npdouble)
+    cdef double[:] mass_b = np.empty(capacity, dtype=npdouble)
+    cdef double[:] intensity_b = np.empty(capacity, dtype=npdouble)
+    cdef double[:] tmp
+    cdef double[:] m2, int2
+    cdef int[:] ends
+    cdef double[:, :] coefs
+    cdef bool calibrate
+    cdef int length = 0, length2, i, i1, i2, segment
+    cdef double weight_sum = 0, weight1, weight2, mass2
+
+    for k in range(count):
+        m2 = masses[k]
+        int2 = intensities[k]
+        length2 = m2.shape[0]
+        calibrate = poly_coefs[k] is not None
+        if calibrate:
+            coefs = poly_coefs[k]
+            ends = segment_ends[k]
+        segment = 0
+
+        if k == 0:
+            for i2 in range(length2):
+                if calibrate:
+                    while segment < ends.shape[0] - 1 and i2 >= ends[segment]:
+                        segment += 1
+                    mass_a[i2] = calibrated(m2[i2], coefs, segment)
+                else:
+                    mass_a[i2] = m2[i2]
+                intensity_a[i2] = int2[i2]
+            length = length2
+            weight_sum = weights[k]
+            continue
+
+        weight1 = weight_sum / (weight_sum + weights[k])
+        weight2 = weights[k] / (weight_sum + weights[k])
+        i = 0
+        i1 = 0
+        i2 = 0
+        while i2 < length2:
+            if calibrate:
+                while segment < ends.shape[0] - 1 and i2 >= ends[segment]:
+                    segment += 1
+                mass2 = calibrated(m2[i2], coefs, segment)
+            else:
+                mass2 = m2[i2]
+            # points of accumulated spectrum before mass2
+            while i1 < length and math.fabs(mass_a[i1] - mass2) > rtol * math.sqrt(mass_a[i1] / 200) * mass_a[i1] \
+                    and mass_a[i1] < mass2:
+                mass_b[i] = mass_a[i1]
+                intensity_b[i] = intensity_a[i1] * weight1
+                i += 1
+                i1 += 1
+            if i1 < length and math.fabs(mass_a[i1] - mass2) <= rtol * math.sqrt(mass_a[i1] / 200) * mass_a[i1]:
+                mass_b[i] = mass_a[i1] * weight1 + mass2 * weight2
+                intensity_b[i] = intensity_a[i1] * weight1 + int2[i2] * weight2
+                i1 += 1
+            else:
+                mass_b[i] = mass2
+                intensity_b[i] = int2[i2] * weight2
+            i += 1
+            i2 += 1
+        while i1 < length:
+            mass_b[i] = mass_a[i1]
+            intensity_b[i] = intensity_a[i1] * weight1
+            i += 1
+            i1 += 1
+
+        length = i
+        weight_sum += weights[k]
+        tmp = mass_a
+        mass_a = mass_b
+        mass_b = tmp
+        tmp = intensity_a
+        intensity_a = intensity_b
+        intensity_b = tmp
+
+    return mass_a.base[:length], intensity_a.base[:length]
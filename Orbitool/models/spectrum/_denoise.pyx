@@ -9,7 +9,6 @@ from cython.operator cimport preincrement as preinc, predecrement as predec
 import numpy as np
 cimport numpy as np
 from numpy.polynomial import polynomial
-from scipy.optimize import curve_fit
 
 from ._functions cimport (getPeaksPositions, getNotZeroPositions,
     DoubleArray, DoubleArray2D, DoubleArray3D, DoubleOrArray)
@@ -44,6 +43,8 @@ cdef tuple getMassPointParams(DoubleArray mass, DoubleArray intensity,
         DoubleArray poly_coef, double global_std, double mass_point, double delta):
     if len(mass) <= 10:
         return False, None
+    # scipy is imported when noise is first fitted, not with `Orbitool.models`
+    from scipy.optimize import curve_fit
     cdef np.ndarray[double, ndim=2] params = np.empty((2, 3), dtype = npdouble)
     cdef DoubleArray mass_bin, std_bin
     cdef np.ndarray[cbool, ndim=1] mask
@@ -1,7 +1,7 @@
-from typing import Tuple, List, Iterable
+from typing import Tuple, List, Iterable, Optional
 import numpy as np
 
-from ._average import mergeSpectra
+from ._average import mergeSpectra, calibrateAverageSpectra as _calibrateAverageSpectra
 
 
 def averageSpectra(mass_intensity_weight_list: Iterable[Tuple[np.ndarray, np.ndarray, float]],
@@ -13,3 +13,30 @@ def averageSpectra(mass_intensity_weight_list: Iterable[Tuple[np.ndarray, np.nda
                                                intensity, weight_sum, weight, rtol, drop_input)
         weight_sum += weight
     return mass_sum, intensity_sum
+
+
+def calibrateAverageSpectra(mass_intensity_weight_list: List[Tuple[np.ndarray, np.ndarray, float]],
+                            segment_ends: List[np.ndarray], poly_coefs: List[Optional[List[np.ndarray]]],
+                            rtol: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `averageSpectra` of spectra calibrated by segments, in one pass without
+    allocating calibrated or intermediate spectra.
+    segment_ends: [[end index of each segment] for each spectrum]
+    poly_coefs: [[calibration poly coef of each segment] or None for each spectrum]
+    """
+    if not mass_intensity_weight_list:
+        return np.empty(0), np.empty(0)
+    masses, intensities, weights = zip(*mass_intensity_weight_list)
+    coefs_list = []
+    for coefs in poly_coefs:
+        if coefs is None:
+            coefs_list.append(None)
+            continue
+        matrix = np.zeros((len(coefs), max(map(len, coefs))), dtype=np.float64)
+        for row, coef in zip(matrix, coefs):
+            row[:len(coef)] = coef
+        coefs_list.append(matrix)
+    return _calibrateAverageSpectra(
+        list(masses), list(intensities), np.array(weights, dtype=np.float64),
+        [np.asarray(ends, dtype=np.int32) for ends in segment_ends], coefs_list, rtol)
+
@@ -11,6 +11,7 @@ from Orbitool.base.extra_type_handlers import NdArray
 from Orbitool.base.structure import GroupTypeHandler, get_handler
 
 from ..formula import Formula, FormulaList
+from .spectrum import SpectrumMzCodec  # register codec of `StorageMzIntensity.mz`
 
 
 class PeakTags(str, Enum):
@@ -85,7 +86,7 @@ class FittedPeak(Peak):
 
 
 class StorageMzIntensity(BaseDatasetStructure):
-    mz: NdArray[float, -1]
+    mz: NdArray['float64', -1, 'spectrum_mz']
     intensity: NdArray[float, -1]
 
 
@@ -3,10 +3,22 @@ from datetime import datetime
 from Orbitool.base import (AttrNdArray, BaseDatasetStructure, BaseRowStructure,
                            BaseStructure)
 from Orbitool.base.extra_type_handlers import NdArray
+from Orbitool.base.extra_type_handlers.codec import OrbitrapMzCodec
+from Orbitool.config import setting
+
+
+class SpectrumMzCodec(OrbitrapMzCodec):
+    """
+    `orbitrap_mz` used when `setting.general.compress_mz` is on
+    """
+    name = "spectrum_mz"
+
+    def enabled(self) -> bool:
+        return setting.general.compress_mz
 
 
 class Spectrum(BaseDatasetStructure):
-    mz: NdArray['float64', -1]
+    mz: NdArray['float64', -1, 'spectrum_mz']
     intensity: NdArray['float64', -1]
     path: str
     start_time: datetime
@@ -8,7 +8,8 @@ import numpy as np
 from numpy import testing as nptest
 
 from Orbitool.utils.binary_search import indexNearest_np
-from .. import removeZeroPositions, averageSpectra, getPeaksPositions
+from numpy.polynomial import polynomial
+from .. import removeZeroPositions, averageSpectra, calibrateAverageSpectra, getPeaksPositions, safeSplitSpectrum
 
 path = os.path.join(os.path.dirname(__file__), 'average_test.pickle')
 
@@ -65,3 +66,32 @@ def test_average(raw_spectra):
 
     for peak in both_none:
         assert intensity[indexNearest_np(mass, peak)] < delta
+
+
+def test_calibrate_average(raw_spectra):
+    spectra = [(*removeZeroPositions(s[0], s[1]), s[2]) for s in raw_spectra]
+    spectra.append((spectra[0][0] * (1 + 1e-7), spectra[0][1] * 0.5, 1.))
+    separators = np.array([200., np.inf])
+    poly_coefs = [[np.array([1e-6, 1e-9]), np.array([-2e-6, 1e-9, 1e-12])],
+                  None,
+                  [np.array([3e-6]), np.array([1e-6, -1e-9])]]
+
+    calibrated = []
+    segment_ends = []
+    for (mass, intensity, weight), coefs in zip(spectra, poly_coefs):
+        parts = safeSplitSpectrum(mass, intensity, separators)
+        segment_ends.append(np.cumsum([len(part) for part in parts]))
+        if coefs is not None:
+            mass = np.concatenate([part * (1 - polynomial.polyval(part, coef))
+                                  for part, coef in zip(parts, coefs)])
+        calibrated.append((mass, intensity.copy(), weight))
+
+    mass, intensity = averageSpectra(calibrated, 1e-6)
+    fused_mass, fused_intensity = calibrateAverageSpectra(
+        spectra, segment_ends, poly_coefs, 1e-6)
+    nptest.assert_array_equal(mass, fused_mass)
+    nptest.assert_array_equal(intensity, fused_intensity)
+
+    mass, intensity = calibrateAverageSpectra([], [], [], 1e-6)
+    assert len(mass) == 0 and len(intensity) == 0
+
@@ -0,0 +1,60 @@
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pytest
+from numpy import testing as nptest
+
+from Orbitool.base import H5File
+from Orbitool.base.dataset_structure import CompressedDatasetStructure
+from Orbitool.config import setting
+from Orbitool.models.spectrum import Spectrum
+from Orbitool.models.spectrum.peak import StorageMzIntensity
+
+
+def real_size_spectrum():
+    """
+    profile spectrum after `removeZeroPositions`: runs on a 1/sqrt(m/z) grid
+    """
+    rng = np.random.default_rng(1)
+    grid = 1 / np.linspace(1 / np.sqrt(50), 1 / np.sqrt(750), 600000) ** 2
+    starts = np.sort(rng.choice(len(grid) - 40, 8000, replace=False))
+    index = np.unique(np.concatenate(
+        [np.arange(start, start + rng.integers(5, 30)) for start in starts]))
+    mz = grid[index]
+    return Spectrum(mz=mz, intensity=rng.random(len(mz)) * 1e4, path="test",
+                    start_time=datetime(2021, 1, 1), end_time=datetime(2021, 1, 2))
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_spectrum_mz_codec(monkeypatch, compressed):
+    spectrum = real_size_spectrum()
+    # zero intensity, so its size is mostly of m/z
+    peaks = StorageMzIntensity(mz=spectrum.mz, intensity=np.zeros_like(spectrum.intensity))
+
+    def write(f: H5File, key, value):
+        if compressed:
+            value = pickle.loads(pickle.dumps(CompressedDatasetStructure(value)))
+        f.write(key, value, type(peaks) if key == "peaks" else Spectrum)
+        return f._obj[key].id.get_storage_size()
+
+    sizes = {}
+    peak_sizes = {}
+    for compress_mz in (False, True):
+        monkeypatch.setattr(setting.general, "compress_mz", compress_mz)
+        f = H5File()
+        sizes[compress_mz] = write(f, "s", spectrum)
+        peak_sizes[compress_mz] = write(f, "peaks", peaks)
+
+        # always readable, whatever the setting is
+        monkeypatch.setattr(setting.general, "compress_mz", not compress_mz)
+        s = f.read("s", Spectrum)
+        nptest.assert_array_equal(s.mz.view(np.int64), spectrum.mz.view(np.int64))
+        nptest.assert_array_equal(s.intensity, spectrum.intensity)
+        assert s.path == spectrum.path and s.end_time == spectrum.end_time
+        p = f.read("peaks", StorageMzIntensity)
+        nptest.assert_array_equal(p.mz.view(np.int64), spectrum.mz.view(np.int64))
+
+    assert sizes[True] < sizes[False] * .8
+    assert peak_sizes[True] * 4 < spectrum.mz.nbytes
+    assert peak_sizes[True] * 2.5 < peak_sizes[False]
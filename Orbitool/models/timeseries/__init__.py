@@ -1 +1,2 @@
-from .timeseries import TimeSeries
\ No newline at end of file
+from .timeseries import TimeSeries
+from .matrix import TimeSeriesMatrix
\ No newline at end of file
@@ -0,0 +1,73 @@
+import csv
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import h5py
+import numpy as np
+
+from ...utils.time_format.time_convert import array_converters
+from .matrix import TimeSeriesMatrix
+
+CSV_CHUNK_ROWS = 4096
+EXPORT_FILTER = "CSV file(*.csv);;HDF5 file(*.h5 *.hdf5);;NumPy file(*.npz)"
+
+
+def time_columns(times: np.ndarray, formats: Iterable[str]) -> Dict[str, np.ndarray]:
+    formats = set(formats)
+    return {f"{name} time": converter(times) for name, converter in array_converters.items() if name in formats}
+
+
+def export_csv(path: str, header: List[str], columns: List[np.ndarray], tqdm: Optional[Callable] = None):
+    """
+    columns are 1-D (rows) or 2-D (rows, n) arrays, nan is written as empty cell.
+    Rows are converted to text by chunks of `CSV_CHUNK_ROWS`.
+    """
+    length = len(columns[0]) if columns else 0
+    chunks = range(0, length, CSV_CHUNK_ROWS)
+    if tqdm is not None:
+        chunks = tqdm(chunks, length=len(chunks))
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerow(header)  # names may contain ','
+        for start in chunks:
+            cells = []
+            for column in columns:
+                column = column[start:start + CSV_CHUNK_ROWS]
+                text = column.astype(str)
+                if column.dtype.kind == 'f':
+                    text[np.isnan(column)] = ''
+                cells.append(text.reshape(len(column), -1))
+            rows = np.concatenate(cells, axis=1).tolist()
+            f.write('\r\n'.join(map(','.join, rows)))
+            f.write('\r\n')
+
+
+def export_hdf5(path: str, names: List[str], matrix: TimeSeriesMatrix, deviations: np.ndarray):
+    """
+    dump the time x ion matrix, times are stored as microseconds since 1970-01-01
+    """
+    with h5py.File(path, 'w') as f:
+        times = f.create_dataset("times", data=matrix.times.astype(np.int64))
+        times.attrs["unit"] = "us since 1970-01-01"
+        f.create_dataset("names", data=names, dtype=h5py.string_dtype())
+        for key, value in [("intensity", matrix.intensity), ("positions", matrix.positions), ("deviations", deviations)]:
+            f.create_dataset(key, data=value, compression="gzip", compression_opts=1)
+
+
+def export_npz(path: str, names: List[str], matrix: TimeSeriesMatrix, deviations: np.ndarray):
+    np.savez_compressed(
+        path, times=matrix.times, names=np.array(names, dtype=str),
+        intensity=matrix.intensity, positions=matrix.positions, deviations=deviations)
+
+
+def export_binary(path: str, names: List[str], matrix: TimeSeriesMatrix, deviations: np.ndarray):
+    """
+    dump the whole matrix if path is a HDF5 / NPZ file, return False otherwise
+    """
+    match Path(path).suffix.lower():
+        case ".h5" | ".hdf5":
+            export_hdf5(path, names, matrix, deviations)
+        case ".npz":
+            export_npz(path, names, matrix, deviations)
+        case _:
+            return False
+    return True
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Orbitool.base import BaseStructure, NdArray
+from .timeseries import TIME_DTYPE, TimeSeries
+
+
+class TimeSeriesMatrix(BaseStructure):
+    """
+    Several time series of one calculation on one shared time axis.
+    Column i of `intensity` / `positions` is series i, nan where it has no point.
+    """
+    range_sum: bool = False
+    # extracted from raw files directly, not from calibrated spectra
+    from_raw: bool = False
+
+    times: NdArray[TIME_DTYPE, -1] = np.empty(0, TIME_DTYPE)
+    intensity: NdArray[float] = np.empty((0, 0), float)
+    positions: NdArray[float] = np.empty((0, 0), float)
+
+    @classmethod
+    def Empty(cls, count: int, **kwargs):
+        return cls(intensity=np.empty((0, count), float), positions=np.empty((0, count), float), **kwargs)
+
+    @property
+    def count(self):
+        return self.intensity.shape[1]
+
+    def extend(self, times: Sequence[datetime], intensity: np.ndarray, positions: np.ndarray):
+        """
+        append rows, intensity and positions are (len(times), count)
+        """
+        count = self.count
+        self.times = np.concatenate((self.times, np.asarray(times, TIME_DTYPE)))
+        self.intensity = np.concatenate(
+            (self.intensity, np.asarray(intensity, float).reshape(-1, count)))
+        self.positions = np.concatenate(
+            (self.positions, np.asarray(positions, float).reshape(-1, count)))
+
+    def extend_peaks(self, times: Sequence[datetime], rows: Sequence[Sequence[Optional[Tuple[float, float]]]]):
+        """
+        append rows of `BaseFunc.get_peaks_max` results, (position, intensity) or None
+        """
+        count = self.count
+        cells = [cell for row in rows for cell in row]
+        assert len(cells) == len(rows) * count
+        found = np.fromiter((cell is not None for cell in cells), bool, len(cells))
+        values = np.full((len(cells), 2), np.nan)
+        values[found] = np.array(
+            [cell for cell in cells if cell is not None], float).reshape(-1, 2)
+        values = values.reshape(len(rows), count, 2)
+        self.extend(times, values[:, :, 1], values[:, :, 0])
+
+    @classmethod
+    def FromSeries(cls, series: List[TimeSeries], tolerance: timedelta = timedelta(seconds=1)):
+        """
+        times closer than `tolerance` are merged to the last of them
+        """
+        all_times = np.sort(np.concatenate(
+            [s.times for s in series] or [np.empty(0, TIME_DTYPE)]))
+        if len(all_times):
+            keep = np.diff(all_times) > np.timedelta64(tolerance)
+            times = np.concatenate((all_times[:-1][keep], all_times[-1:]))
+        else:
+            times = all_times
+        intensity = np.full((len(times), len(series)), np.nan)
+        positions = np.full((len(times), len(series)), np.nan)
+        for column, s in enumerate(series):
+            rows = np.searchsorted(times, s.times).clip(max=len(times) - 1)
+            intensity[rows, column] = s.intensity
+            if len(s.positions):
+                positions[rows, column] = s.positions
+        return cls(times=times, intensity=intensity, positions=positions)
+
+    def to_series(self, series: List[TimeSeries]):
+        """
+        extend each series by its column
+        """
+        assert len(series) == self.count
+        for column, s in enumerate(series):
+            self.column_series(column, s)
+        return series
+
+    def column_series(self, column: int, series: TimeSeries):
+        """
+        extend series by points of `column`
+        """
+        slt = ~np.isnan(self.intensity[:, column])
+        series.extend(self.times[slt], self.intensity[slt, column], self.positions[slt, column])
+        return series
+
+    def truncate(self, time: datetime):
+        """
+        remove rows from `time`
+        """
+        slt = self.times < np.datetime64(time, 'us')
+        self.times = self.times[slt]
+        self.intensity = self.intensity[slt]
+        self.positions = self.positions[slt]
+
+    def take_columns(self, columns: Sequence[int]):
+        """
+        a new matrix of `columns`, without rows left empty
+        """
+        columns = list(columns)
+        intensity = self.intensity[:, columns]
+        slt = ~np.isnan(intensity).all(axis=1)
+        return type(self)(
+            range_sum=self.range_sum, from_raw=self.from_raw, times=self.times[slt],
+            intensity=intensity[slt], positions=self.positions[:, columns][slt])
+
+    def get_deviations(self, mids: Sequence[float]) -> np.ndarray:
+        return (self.positions / np.asarray(mids, float) - 1) * 1e6
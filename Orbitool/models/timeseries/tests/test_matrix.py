@@ -0,0 +1,105 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+from numpy import testing as nptest
+
+from Orbitool.base import Array, BaseDatasetStructure, H5File
+from ..timeseries import TimeSeries
+from ..matrix import TimeSeriesMatrix
+
+time = datetime(2022, 1, 1)
+minute = timedelta(minutes=1)
+
+
+class OldTimeSeries(BaseDatasetStructure):
+    position_min: float
+    position_max: float
+    times: List[datetime] = []
+    positions: Array["d"] = array("d")
+    intensity: Array["d"] = array("d")
+
+
+def test_series():
+    f = H5File()
+    f.write("old", OldTimeSeries(
+        position_min=99, position_max=101, times=[time], positions=array("d", [100]), intensity=array("d", [1])))
+    series = f.read("old", TimeSeries)
+    assert series.times.tolist() == [time]
+
+    series.append(time + minute, 10, 100.0001)
+    series.extend([time + 2 * minute, time + 3 * minute], [20, 30], [100, 99.9999])
+    f.write("series", series)
+
+    series = f.read("series", TimeSeries)
+    assert series.times[1].item() == time + minute
+    nptest.assert_allclose(series.get_deviations(), [0, 1, 0, -1])
+
+
+def test_matrix():
+    matrix = TimeSeriesMatrix.Empty(2)
+    times = [time, time + minute, time + 2 * minute]
+    matrix.extend_peaks(times, [[(1, 10), None], [(1.1, 11), (2, 20)], [None, None]])
+
+    f = H5File()
+    f.write("matrix", matrix)
+    matrix = f.read("matrix", TimeSeriesMatrix)
+    assert matrix.intensity.shape == (3, 2)
+
+    series = matrix.to_series([
+        TimeSeries(position_min=0, position_max=2), TimeSeries(position_min=1, position_max=3)])
+    assert series[0].times.tolist() == times[:2]
+    nptest.assert_equal(series[0].intensity, [10, 11])
+    assert series[1].times.tolist() == times[1:2]
+    nptest.assert_allclose(series[1].get_deviations(), [0])
+
+    # times within tolerance are merged
+    series[1].times += np.timedelta64(100, "ms")
+    merged = TimeSeriesMatrix.FromSeries(series)
+    assert merged.times.tolist() == [time, times[1] + timedelta(milliseconds=100)]
+    nptest.assert_equal(merged.intensity, [[10, np.nan], [11, 20]])
+    nptest.assert_allclose(merged.get_deviations([1, 2]), [[0, np.nan], [.1e6, 0]])
+
+
+def test_export(tmp_path):
+    from ..export import export_binary, export_csv, time_columns
+    import csv
+
+    matrix = TimeSeriesMatrix.Empty(2)
+    times = [time + timedelta(microseconds=500), time + minute]
+    matrix.extend_peaks(times, [[(1, 10.5), None], [(1.1, 11), (2, 20)]])
+    deviations = matrix.get_deviations([1, 2])
+
+    columns = time_columns(matrix.times, {"igor", "iso"})
+    assert list(columns) == ["iso time", "igor time"]
+    path = tmp_path / "a.csv"
+    export_csv(path, list(columns) + ["a,b", "c"], [*columns.values(), matrix.intensity])
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["iso time", "igor time", "a,b", "c"],
+        ["2022-01-01T00:00:00", "3723840000", "10.5", ""],
+        ["2022-01-01T00:01:00", "3723840060", "11.0", "20.0"]]
+
+    assert not export_binary(str(path), ["a,b", "c"], matrix, deviations)
+    assert export_binary(str(tmp_path / "a.npz"), ["a,b", "c"], matrix, deviations)
+    data = np.load(tmp_path / "a.npz")
+    assert data["times"].tolist() == times
+    nptest.assert_equal(data["deviations"], deviations)
+
+
+def test_matrix_columns():
+    matrix = TimeSeriesMatrix.Empty(3, range_sum=True)
+    times = [time, time + minute, time + 2 * minute]
+    matrix.extend_peaks(times, [[(1, 10), None, None], [None, (2, 20), None], [(1, 12), None, (3, 30)]])
+    nptest.assert_equal(matrix.positions[:, 0], [1, np.nan, 1])
+
+    taken = matrix.take_columns([0, 2])
+    assert taken.range_sum
+    assert taken.times.tolist() == [times[0], times[2]]
+    nptest.assert_equal(taken.intensity, [[10, np.nan], [12, 30]])
+
+    matrix.truncate(times[1])
+    assert matrix.times.tolist() == times[:1]
+    assert matrix.intensity.shape == (1, 3)
@@ -1,32 +1,53 @@
-from array import array
-from typing import List
+from typing import List, Union
 from datetime import datetime
 
-from Orbitool.base import BaseDatasetStructure, Array
+import numpy as np
+
+from Orbitool.base import BaseDatasetStructure, NdArray
 from ..formula import Formula, FormulaList
 
+TIME_DTYPE = np.dtype("M8[us]")
+
 
 class TimeSeries(BaseDatasetStructure):
     position_min: float
     position_max: float
 
     range_sum: bool = False
+    # extracted from raw files directly, not from calibrated spectra
+    from_raw: bool = False
     formulas: FormulaList = []
 
-    times: List[datetime] = []
-    positions: Array["d"] = array('d')
-    intensity: Array["d"] = array('d')
+    times: NdArray[TIME_DTYPE, -1] = np.empty(0, TIME_DTYPE)
+    positions: NdArray[float, -1] = np.empty(0, float)
+    intensity: NdArray[float, -1] = np.empty(0, float)
 
     def append(self, time: datetime, intensity: float, position: float):
-        self.times.append(time)
-        self.positions.append(position)
-        self.intensity.append(intensity)
+        self.extend([time], [intensity], [position])
+
+    def extend(self, times: Union[np.ndarray, List[datetime]], intensity: np.ndarray, positions: np.ndarray):
+        self.times = np.concatenate((self.times, np.asarray(times, TIME_DTYPE)))
+        self.intensity = np.concatenate((self.intensity, np.asarray(intensity, float)))
+        self.positions = np.concatenate((self.positions, np.asarray(positions, float)))
+
+    def truncate(self, time: datetime):
+        """
+        remove points from `time`
+        """
+        slt = self.times < np.datetime64(time, 'us')
+        self.times = self.times[slt]
+        self.intensity = self.intensity[slt]
+        if len(self.positions):
+            self.positions = self.positions[slt]
 
     @classmethod
     def FactoryPositionRtol(cls, position: float, rtol: float, formulas: List[Formula] = []):
         delta = position * rtol
         return cls(position_min=position - delta, position_max=position + delta, range_sum=False, formulas=formulas.copy())
 
-    def get_deviations(self):
-        mid = (self.position_min + self.position_max) / 2
-        return array("d", ((pos / mid - 1) * 1e6 for pos in self.positions))
+    @property
+    def position_mid(self):
+        return (self.position_min + self.position_max) / 2
+
+    def get_deviations(self) -> np.ndarray:
+        return (self.positions / self.position_mid - 1) * 1e6
@@ -1,6 +1,6 @@
 from copy import deepcopy
 from datetime import datetime
-from typing import Iterable, List, Dict, Tuple, Union
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 import math
 
 import numpy as np
@@ -43,6 +43,9 @@ class CalibratorInfo(BaseInfo):
         CalibratorInfoSegment()]
     last_calibrate_info_segments: List[CalibratorInfoSegment] = []
 
+    # segment settings used when each ion was split
+    ion_split_segments: Dict[FormulaType, CalibratorInfoSegment] = {}
+
     path_times: Dict[str, datetime] = {}
     path_ion_infos: Dict[str, Dict[FormulaType, PathIonInfo]] = {}
     # path -> [calibrator for each segments]
@@ -50,6 +53,8 @@ class CalibratorInfo(BaseInfo):
 
     # [calibrated spectrum info for each spectrum]
     calibrated_spectrum_infos: List[SpectrumInfo] = []
+    # increased each time calibrated spectra are rewritten
+    calibrated_spectra_version: int = 0
 
     def add_segment(self, separator: float):
         pos = 0
@@ -80,11 +85,17 @@ class CalibratorInfo(BaseInfo):
             right += 1
         return self.ions[left:right]
 
-    def yield_segment_ions(self):
+    def yield_segment_ions(self, ions: Optional[List[Ion]] = None, segments: Optional[List[CalibratorInfoSegment]] = None):
+        """
+        ions: default `ions`, segments: default `calibrate_info_segments`
+        """
         ret_ions: List[Ion] = []
         ion_right = 0
-        ions = self.ions
-        for seg in self.calibrate_info_segments:
+        if ions is None:
+            ions = self.ions
+        if segments is None:
+            segments = self.calibrate_info_segments
+        for seg in segments:
             while ion_right < len(ions) and ions[ion_right].formula.mass() < seg.end_point:
                 ret_ions.append(ions[ion_right])
                 ion_right += 1
@@ -111,20 +122,49 @@ class CalibratorInfo(BaseInfo):
             self.ions.append(ion)
         self.ions.sort(key=lambda ion: ion.formula.mass())
 
+    def get_segment(self, mass: float) -> CalibratorInfoSegment:
+        for segment in self.calibrate_info_segments:
+            if mass < segment.end_point:
+                return segment
+        return self.calibrate_info_segments[-1]
+
     def need_split(self) -> List[FormulaType]:
         """
-            return [formula for each ion need to be split]
+            return [formula for each ion need to be split],
+            new ions or ions whose segment rtol / intensity filter changed
         """
         last_formulas = {ion.formula for ion in self.last_ions}
-        need_split = [
-            ion.formula for ion in self.ions if ion.formula not in last_formulas]
+        need_split = []
+        for ion in self.ions:
+            formula = ion.formula
+            if formula in last_formulas and (last := self.ion_split_segments.get(formula)) is not None:
+                segment = self.get_segment(formula.mass())
+                if segment.rtol == last.rtol and segment.intensity_filter == last.intensity_filter:
+                    continue
+            need_split.append(formula)
         return need_split
 
-    def done_split(self, path_ions_peak: Dict[str, List[List[Tuple[float, float]]]]):
+    def done_split(self, path_ions_peak: Dict[str, List[List[Tuple[float, float]]]], formulas: Optional[List[FormulaType]] = None):
         """
             path_ions_peak: {path: [[(position, intensity) for each ion] for each spectrum in path]}
+            formulas: split formulas, default `need_split()`
+        """
+        if formulas is None:
+            formulas = self.need_split()
+        self._add_ion_infos(formulas, path_ions_peak)
+        for formula in formulas:
+            self.ion_split_segments[formula] = deepcopy(
+                self.get_segment(formula.mass()))
+        self.last_ions = self.ions.copy()
+
+    def done_split_paths(self, path_ions_peak: Dict[str, List[List[Tuple[float, float]]]]):
         """
-        formulas = self.need_split()
+            like `done_split`, but for all `last_ions` of new paths
+        """
+        self._add_ion_infos(
+            [ion.formula for ion in self.last_ions], path_ions_peak)
+
+    def _add_ion_infos(self, formulas: List[FormulaType], path_ions_peak: Dict[str, List[List[Tuple[float, float]]]]):
         for path, ions_peak in path_ions_peak.items():
             ion_infos = self.path_ion_infos.setdefault(path, {})
             # shape: (len(spectra), len(ions), 2)
@@ -134,13 +174,24 @@ class CalibratorInfo(BaseInfo):
                     formula,
                     ions_peak[:, index, 0],
                     ions_peak[:, index, 1])
-        self.last_ions = self.ions.copy()
 
-    def calc_calibrator(self):
-        self.calibrator_segments.clear()
-
-        segment_ions = list(self.yield_segment_ions())
-        for path, ion_infos in self.path_ion_infos.items():
+    def calc_calibrator(self, paths: Optional[Iterable[str]] = None):
+        """
+            paths: only calculate calibrators of these paths with `last_ions` and
+                `last_calibrate_info_segments`, like the other paths. default all
+                paths with current ions and segments
+        """
+        if paths is None:
+            self.calibrator_segments.clear()
+            path_ion_infos = self.path_ion_infos.items()
+            segment_ions = list(self.yield_segment_ions())
+        else:
+            assert self.last_calibrate_info_segments, "calculate calibrators of all paths first"
+            path_ion_infos = [(path, self.path_ion_infos[path]) for path in paths]
+            segment_ions = list(self.yield_segment_ions(
+                self.last_ions, self.last_calibrate_info_segments))
+
+        for path, ion_infos in path_ion_infos:
             try:
                 calibrators = []
 
@@ -158,5 +209,6 @@ class CalibratorInfo(BaseInfo):
                 self.calibrator_segments[path] = calibrators
             except Exception as e:
                 raise ValueError(f"Error at file {path}:{e}") from e
-        self.last_calibrate_info_segments = deepcopy(
-            self.calibrate_info_segments)
+        if paths is None:
+            self.last_calibrate_info_segments = deepcopy(
+                self.calibrate_info_segments)
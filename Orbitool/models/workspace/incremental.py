@@ -0,0 +1,72 @@
+"""
+Helpers for processing only spectrum infos appended since the last run,
+e.g. new RAW files added to a monitoring workspace.
+"""
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from ..file import FileSpectrumInfo
+from ..spectrum import SpectrumInfo
+
+
+def info_key(info: FileSpectrumInfo):
+    return info.path, info.start_time, info.end_time
+
+
+def appended_start(processed: List[FileSpectrumInfo], current: List[FileSpectrumInfo]) -> Optional[int]:
+    """
+    return index of the first info in `current` appended after `processed`,
+    or None if `current` is not `processed` with infos appended
+    (infos without data are skipped when reading, so they may be missing in `processed`)
+    """
+    if not processed:
+        return None
+    keys = [info_key(info) for info in current]
+    try:
+        last = keys.index(info_key(processed[-1]))
+    except ValueError:
+        return None
+    if not {info_key(info) for info in processed}.issubset(keys[:last + 1]):
+        return None
+    return last + 1
+
+
+def merge_start(infos: List[FileSpectrumInfo], length: int) -> Tuple[int, int]:
+    """
+    `infos` are infos of raw spectra, the first `length` of them have been merged.
+    return (index of info, index of merged spectrum) to merge again from,
+    the last merged spectrum will be merged again if new infos continue its average group.
+    """
+    starts = [index for index, info in enumerate(infos)
+              if index == 0 or not info.average_index]
+    group = bisect_right(starts, length) - 1
+    return starts[group], group
+
+
+def merged_length(infos: List[FileSpectrumInfo], calibrated_infos: List[SpectrumInfo]) -> int:
+    """
+    count of raw spectra (`infos`) merged into calibrated spectra, those end before
+    the last calibrated spectrum. Raw spectra of an interrupted run are not counted,
+    so they are merged by the next run.
+    """
+    if not calibrated_infos:
+        return 0
+    return bisect_right([info.end_time for info in infos], calibrated_infos[-1].end_time)
+
+
+def calibrated_paths(infos: List[FileSpectrumInfo], length: int, new_infos: List[FileSpectrumInfo]) -> Set[str]:
+    """
+    paths of `new_infos` whose spectra have been merged, the first `length` of `infos`
+    """
+    return {info.path for info in new_infos} & {info.path for info in infos[:length]}
+
+
+def timeseries_start(calibrated_infos: List[SpectrumInfo], end_time: Optional[datetime]) -> int:
+    """
+    index of the first calibrated spectrum not in time series, which were calculated
+    until `end_time` (None if unknown). A merged spectrum extended by new spectra ends later.
+    """
+    if end_time is None:
+        return 0
+    return bisect_right([info.end_time for info in calibrated_infos], end_time)
@@ -19,11 +19,11 @@ class PeakFitInfo(BaseInfo):
     original_indexes: Array['i'] = array('i')
     peaks: List[FittedPeak] = []
 
-    residual_mz: NdArray[float, -1] = EmptyNdArray
+    residual_mz: NdArray['float64', -1, 'spectrum_mz'] = EmptyNdArray
     residual_intensity: NdArray[float, -1] = EmptyNdArray
 
     shown_indexes: Array['i'] = []
 
-    shown_mz: NdArray[float, -1] = EmptyNdArray
+    shown_mz: NdArray['float64', -1, 'spectrum_mz'] = EmptyNdArray
     shown_intensity: NdArray[float, -1] = EmptyNdArray
     shown_residual: NdArray[float, -1] = EmptyNdArray
@@ -0,0 +1,69 @@
+import numpy as np
+
+from ...calibration import Ion
+from ..calibration import CalibratorInfo, CalibratorInfoSegment
+
+
+def split_all(info: CalibratorInfo):
+    formulas = info.need_split()
+    spectra = [[(f.mass(), 100.) for f in formulas]] * 3
+    info.done_split({"a": spectra}, formulas)
+    return formulas
+
+
+def test_need_split():
+    info = CalibratorInfo(
+        ions=[Ion.fromText("HNO3NO3-"), Ion.fromText("C6H3O2NNO3-")],
+        calibrate_info_segments=[CalibratorInfoSegment()])
+    assert len(split_all(info)) == 2
+    assert info.need_split() == []
+
+    info.add_ions(["C6H5O3NNO3-"])
+    assert info.need_split() == [Ion.fromText("C6H5O3NNO3-").formula]
+    split_all(info)
+
+    # degree and n_ions don't need spectra
+    info.calibrate_info_segments[0].degree = 1
+    info.calibrate_info_segments[0].n_ions = 2
+    assert info.need_split() == []
+
+    # only ions in segment with changed filter
+    info.add_segment(150)
+    info.calibrate_info_segments[1].intensity_filter = 10
+    assert info.need_split() == [ion.formula for ion in info.ions[1:]]
+    split_all(info)
+    assert info.need_split() == []
+    np.testing.assert_almost_equal(
+        info.path_ion_infos["a"][info.ions[0].formula].position, info.ions[0].formula.mass())
+
+
+def test_get_segment_boundary():
+    info = CalibratorInfo(calibrate_info_segments=[CalibratorInfoSegment()])
+    info.add_segment(150)
+    first, second = info.calibrate_info_segments
+    assert info.get_segment(149.9) is first
+    # ion at separator belongs to the next segment, like `yield_segment_ions`
+    assert info.get_segment(150) is second
+
+
+def test_calc_calibrator_new_path():
+    info = CalibratorInfo(calibrate_info_segments=[CalibratorInfoSegment()])
+    info.add_segment(200)
+    formulas = split_all(info)
+    info.calc_calibrator()
+    segments = info.last_calibrate_info_segments
+    assert len(segments) == 2
+
+    # edited after the full calibration, not split or calculated yet
+    info.add_ions(["C5H8O2NO3-"])
+    info.add_segment(300)
+    info.merge_segment(0, 2)
+
+    spectra = [[(f.mass() * (1 + 1e-6), 100.) for f in formulas]] * 3
+    info.done_split_paths({"b": spectra})
+    info.calc_calibrator(["b"])
+    assert info.last_calibrate_info_segments is segments
+    assert len(info.calibrator_segments["b"]) == 2
+    assert [f for cali in info.calibrator_segments["b"] for f in cali.formulas] == \
+        [ion.formula for ion in info.last_ions]
+    assert [ion for ion, _ in info.yield_ion_used("b")] == info.last_ions
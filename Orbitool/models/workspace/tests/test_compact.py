@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import numpy as np
+
+from ...spectrum import Spectrum
+from .. import workspace as workspace_module
+from ..workspace import WorkSpace
+
+
+def spectra(num: int):
+    rng = np.random.default_rng(num)
+    return [Spectrum(mz=rng.random(10000), intensity=rng.random(10000), path="",
+                     start_time=datetime(2000, 1, 1), end_time=datetime(2000, 1, 1))
+            for _ in range(num)]
+
+
+def test_auto_compact_once(tmp_path, monkeypatch):
+    compacted = []
+
+    def compact(path):
+        compacted.append(path)
+        return real_compact(path)
+    real_compact = workspace_module.compact
+    monkeypatch.setattr(workspace_module, "compact", compact)
+    monkeypatch.setattr(workspace_module, "AUTO_COMPACT_MIN_SIZE", 0)
+    # estimate of unused space stays high after compaction
+    monkeypatch.setattr(workspace_module, "live_size", lambda obj: 0)
+
+    workspace = WorkSpace(tmp_path / "a.Orbitool", False)
+    workspace.data.raw_spectra = spectra(5)
+    workspace.save()
+    workspace.save()
+    assert len(compacted) == 1
+
+    # grown by ratio since last compaction
+    workspace.data.raw_spectra.extend(spectra(10))
+    workspace.save()
+    workspace.save()
+    assert len(compacted) == 2
+    assert len(workspace.data.raw_spectra) == 15
+    workspace.close()
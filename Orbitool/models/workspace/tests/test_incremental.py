@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ...file import FileSpectrumInfo
+from ...peakfit import PeakAreaIndex
+from ...spectrum import Spectrum, SpectrumInfo
+from ..incremental import (appended_start, calibrated_paths, merge_start, merged_length,
+                           timeseries_start)
+from ..workspace import WorkSpace
+
+
+def infos(path: str, average_indexes, begin=datetime(2022, 1, 1)):
+    return [FileSpectrumInfo(
+        start_time=begin + timedelta(minutes=i), end_time=begin + timedelta(minutes=i + 1),
+        path=path, average_index=index) for i, index in enumerate(average_indexes)]
+
+
+def test_appended_start():
+    old = infos("a", [0, 0, 1])
+    new = old + infos("b", [0, 1])
+    assert appended_start(old, new) == 3
+    # infos without data are not read
+    assert appended_start(old[:2], new) == 2
+    assert appended_start(old[1:], new) == 3
+    assert appended_start(old, old) == 3
+
+    assert appended_start([], new) is None
+    assert appended_start(new[3:], old) is None
+    assert appended_start(old, new[1:]) is None
+
+
+def test_merge_start():
+    all_infos = infos("a", [0, 0, 1]) + infos("b", [0, 1])
+    assert merge_start(all_infos, 3) == (3, 2)
+    assert merge_start(all_infos, 2) == (1, 1)
+    assert merge_start(all_infos, 4) == (3, 2)
+
+
+def test_truncate_calibrated_spectra():
+    workspace = WorkSpace()
+    data = workspace.data
+    begin = datetime(2022, 1, 1)
+    mz = np.linspace(100, 101, 10)
+    for i in range(4):
+        time = begin + timedelta(minutes=i)
+        data.calibrated_spectra.append(Spectrum(
+            mz=mz, intensity=np.full(10, i + 1.), path="a", start_time=time, end_time=time))
+        data.peak_area_indexes.append(PeakAreaIndex.FromSpectrum(mz, np.full(10, i + 1.), time))
+
+    data.truncate_calibrated_spectra(2)
+    assert len(data.calibrated_spectra) == 2
+    assert len(data.peak_area_indexes) == 2
+    assert len(data.fitted_peak_tables) == 0
+    assert data.peak_area_indexes[1].start_time == begin + timedelta(minutes=1)
+    workspace.close()
+
+
+def merged_infos(raw_infos):
+    """
+    calibrated spectrum infos of average groups of `raw_infos`
+    """
+    starts = [index for index, info in enumerate(raw_infos)
+              if index == 0 or not info.average_index] + [len(raw_infos)]
+    return [SpectrumInfo(start_time=raw_infos[begin].start_time, end_time=raw_infos[end - 1].end_time)
+            for begin, end in zip(starts[:-1], starts[1:])]
+
+
+def test_interrupted_run():
+    workspace = WorkSpace()
+    info = workspace.info
+    # the last run processed file "a"
+    old = infos("a", [0, 0, 1])
+    info.file_tab.spectrum_infos = list(old)
+    info.noise_tab.denoised_spectrum_infos = list(old)
+    info.calibration_tab.calibrated_spectrum_infos = merged_infos(old)
+    info.time_series_tab.calculated_end_time = old[-1].end_time
+
+    # new spectra from a calibrated file are refused before reading
+    info.file_tab.spectrum_infos = old + infos("a", [0], old[-1].end_time)
+    raw_infos = info.noise_tab.denoised_spectrum_infos
+    read_start = appended_start(raw_infos, info.file_tab.spectrum_infos)
+    raw_length = merged_length(raw_infos, info.calibration_tab.calibrated_spectrum_infos)
+    assert (read_start, raw_length) == (3, 3)
+    assert calibrated_paths(raw_infos, raw_length, info.file_tab.spectrum_infos[read_start:]) == {"a"}
+
+    # new spectra of file "b" continue the last average group
+    new = infos("b", [2, 0, 1], old[-1].end_time)
+    info.file_tab.spectrum_infos = old + new
+    assert appended_start(raw_infos, info.file_tab.spectrum_infos) == 3
+    assert not calibrated_paths(raw_infos, raw_length, new)
+
+    # read, then calibration fails
+    info.noise_tab.denoised_spectrum_infos.extend(new)
+    raw_infos = info.noise_tab.denoised_spectrum_infos
+    # the next run reads nothing, but the new raw spectra are still pending
+    assert appended_start(raw_infos, info.file_tab.spectrum_infos) == 6
+    raw_length = merged_length(raw_infos, info.calibration_tab.calibrated_spectrum_infos)
+    assert raw_length == 3
+    assert not calibrated_paths(raw_infos, raw_length, raw_infos[raw_length:])
+    assert merge_start(raw_infos, raw_length) == (1, 1)
+
+    # calibrated, then time series fail
+    calibrated_infos = merged_infos(raw_infos)
+    info.calibration_tab.calibrated_spectrum_infos = calibrated_infos
+    assert merged_length(raw_infos, calibrated_infos) == 6
+    # the extended group and the new one are calculated by the next run
+    assert timeseries_start(calibrated_infos, info.time_series_tab.calculated_end_time) == 1
+    assert timeseries_start(calibrated_infos, None) == 0
+    assert timeseries_start(calibrated_infos, calibrated_infos[-1].end_time) == 3
+    workspace.close()
@@ -0,0 +1,28 @@
+import numpy as np
+
+from ...spectrum import FittedPeak
+from ..workspace import WorkSpace
+
+
+def test_memory_report():
+    workspace = WorkSpace()
+    mz = np.linspace(100, 101, 100000)
+    peak = FittedPeak(mz=mz, intensity=np.ones_like(mz), fitted_param=np.zeros(3),
+                      peak_position=100.5, peak_intensity=1, area=1)
+    info = workspace.info.peak_fit_tab
+    info.raw_peaks = [peak]
+    info.peaks = [peak]
+    info.shown_mz = mz
+
+    rows = {row.name: row for row in workspace.memory_report()}
+    assert rows.keys() == workspace.info.model_fields.keys()
+    peak_fit = rows["peak_fit_tab"]
+    children = {row.name: row for row in peak_fit.children}
+    # shared arrays are counted by the first field
+    assert children["raw_peaks"].numpy == 2 * mz.nbytes + 24
+    assert "peaks" not in children or children["peaks"].numpy == 0
+    assert "shown_mz" not in children
+    # tab object itself
+    assert peak_fit.python > sum(row.python for row in peak_fit.children)
+    assert peak_fit.numpy == sum(row.numpy for row in peak_fit.children)
+    workspace.close()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from numpy import testing as nptest
+
+from Orbitool.base import H5File
+from Orbitool.config import setting
+
+from ..peak_fit import PeakFitInfo
+
+
+@pytest.mark.parametrize("compress_mz", [False, True])
+def test_peak_fit_info_mz(monkeypatch, compress_mz):
+    monkeypatch.setattr(setting.general, "compress_mz", compress_mz)
+    mz = 1 / np.linspace(1 / np.sqrt(50), 1 / np.sqrt(750), 10000) ** 2
+    info = PeakFitInfo(residual_mz=mz, shown_mz=mz[::2])
+
+    f = H5File()
+    f.write("info", info)
+    for key in ("residual_mz", "shown_mz"):
+        dataset = f._obj["info"][key]
+        if compress_mz:
+            assert dataset.dtype == np.uint8
+        else:  # readable by older versions
+            assert dataset.dtype == np.float64 and "_codec" not in dataset.attrs
+            nptest.assert_array_equal(dataset[()], getattr(info, key))
+
+    b = f.read("info", PeakFitInfo)
+    nptest.assert_array_equal(b.residual_mz.view(np.int64), mz.view(np.int64))
+    nptest.assert_array_equal(b.shown_mz, mz[::2])
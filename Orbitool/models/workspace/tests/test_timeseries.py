@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import h5py
+from numpy import testing as nptest
+
+from Orbitool.base.disk_structure import DiskListDirectView
+
+from ...timeseries import TimeSeries, TimeSeriesMatrix
+from ..timeseries import TimeseriesInfo
+from ..updater import get_version, update
+from ..workspace import VERSION, WorkSpace
+
+time = datetime(2022, 1, 1)
+minute = timedelta(minutes=1)
+
+
+def peak_matrix(count: int):
+    matrix = TimeSeriesMatrix.Empty(count)
+    matrix.extend_peaks([time, time + minute], [
+        [(100 + i, 10 + i) for i in range(count)],
+        [(100 + i, 20 + i) if i else None for i in range(count)]])
+    return matrix
+
+
+def test_matrix_rows():
+    workspace = WorkSpace()
+    matrices = workspace.data.time_series_matrices
+    info = workspace.info.time_series_tab
+
+    series = [TimeSeries.FactoryPositionRtol(100 + i, 1e-6) for i in range(3)]
+    info.append_matrix(matrices, peak_matrix(3), series)
+    info.append_matrix(matrices, peak_matrix(1), series[:1])
+    rows = info.timeseries_infos
+    assert [(row.matrix_index, row.column) for row in rows] == [(0, 0), (0, 1), (0, 2), (1, 0)]
+    # the first series has no peak at the second time
+    assert rows[0].time_max == time
+    assert rows[1].time_max == time + minute
+
+    s = rows[1].get_series(matrices[0])
+    assert s.times.tolist() == [time, time + minute]
+    nptest.assert_equal(s.intensity, [11, 21])
+
+    info.remove_rows(matrices, [0, 2])
+    rows = info.timeseries_infos
+    assert [(row.matrix_index, row.column) for row in rows] == [(0, 0), (1, 0)]
+    assert matrices[0].count == 1
+    nptest.assert_equal(info.get_series(matrices)[0].intensity, [11, 21])
+
+    info.remove_rows(matrices, [0])
+    assert len(matrices) == 1
+    assert [(row.matrix_index, row.column) for row in info.timeseries_infos] == [(0, 0)]
+    nptest.assert_equal(info.get_series(matrices)[0].intensity, [10])
+    workspace.close()
+
+
+def test_update(tmp_path):
+    path = tmp_path / "old.Orbitool"
+    workspace = WorkSpace(path, use_proxy=False)
+    workspace.save()
+    workspace.close()
+
+    with h5py.File(path, 'r+') as f:
+        f["info"].attrs["version"] = "2.5.6"
+        del f["data/time_series_matrices"]
+        old = DiskListDirectView(TimeSeries, f["data"], "time_series")
+        peak = TimeSeries.FactoryPositionRtol(100, 1e-6)
+        peak.extend([time, time + minute], [1, 2], [100, 100.0001])
+        old.append(peak)
+        old.append(TimeSeries(position_min=99, position_max=101, range_sum=True, from_raw=True))
+
+    update(str(path))
+    assert get_version(str(path)) == VERSION
+
+    workspace = WorkSpace(path, use_proxy=False)
+    info: TimeseriesInfo = workspace.info.time_series_tab
+    matrices = workspace.data.time_series_matrices
+    assert len(matrices) == 2
+    assert matrices[1].from_raw and matrices[1].range_sum
+    rows = info.timeseries_infos
+    assert [(row.matrix_index, row.column) for row in rows] == [(0, 0), (1, 0)]
+    assert rows[0].time_max == time + minute and not rows[1].valid()
+    series = info.get_series(matrices)
+    nptest.assert_allclose(series[0].get_deviations(), [0, 1])
+    assert len(series[1].times) == 0
+    workspace.close()
@@ -1,9 +1,13 @@
-from typing import List
+from typing import Iterable, List, Optional
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from Orbitool.base import BaseRowStructure
+from Orbitool.base.disk_structure import IDiskListView
 from ..formula import FormulaList
-from ..timeseries import TimeSeries
+from ..peakfit import normal_distribution
+from ..timeseries import TimeSeries, TimeSeriesMatrix
 from .base import BaseInfo
 
 validated_datetime = datetime(1900, 1, 1)
@@ -16,6 +20,9 @@ class TimeSeriesInfoRow(BaseRowStructure):
     time_min: datetime = invalid_datetime
     time_max: datetime = invalid_datetime
     formulas: FormulaList = []
+    # column `column` of `WorkspaceData.time_series_matrices[matrix_index]`
+    matrix_index: int = -1
+    column: int = 0
 
     @classmethod
     def FromTimeSeries(cls, timeseries: TimeSeries):
@@ -23,11 +30,22 @@ class TimeSeriesInfoRow(BaseRowStructure):
             position_min=timeseries.position_min,
             position_max=timeseries.position_max,
             range_sum=timeseries.range_sum,
-            time_min=timeseries.times[0] if timeseries.times else invalid_datetime,
-            time_max=timeseries.times[-1] if timeseries.times else invalid_datetime,
+            time_min=timeseries.times[0].item() if len(timeseries.times) else invalid_datetime,
+            time_max=timeseries.times[-1].item() if len(timeseries.times) else invalid_datetime,
             formulas=timeseries.formulas
         )
     
+    def update_times(self, matrix: TimeSeriesMatrix):
+        times = matrix.times[~np.isnan(matrix.intensity[:, self.column])]
+        self.time_min = times[0].item() if len(times) else invalid_datetime
+        self.time_max = times[-1].item() if len(times) else invalid_datetime
+
+    def get_series(self, matrix: TimeSeriesMatrix):
+        series = TimeSeries(
+            position_min=self.position_min, position_max=self.position_max,
+            range_sum=matrix.range_sum, from_raw=matrix.from_raw, formulas=self.formulas)
+        return matrix.column_series(self.column, series)
+
     def valid(self):
         return self.time_min > validated_datetime
 
@@ -44,3 +62,66 @@ class TimeSeriesInfoRow(BaseRowStructure):
 class TimeseriesInfo(BaseInfo):
     timeseries_infos: List[TimeSeriesInfoRow] = []
     show_index: int = -1
+
+    # what `WorkspaceData.fitted_peak_tables` were fitted from
+    fitted_peak_tables_func: Optional[normal_distribution.NormalDistributionFunc] = None
+    fitted_peak_tables_version: int = -1
+    # `CalibratorInfo.calibrated_spectra_version` of `WorkspaceData.peak_area_indexes`
+    peak_area_indexes_version: int = -1
+    # end time of the last calibrated spectrum in time series, set by processing new spectra
+    calculated_end_time: Optional[datetime] = None
+
+    def fitted_peak_tables_valid(self, func: normal_distribution.NormalDistributionFunc, calibrated_spectra_version: int):
+        return self.fitted_peak_tables_func == func and \
+            self.fitted_peak_tables_version == calibrated_spectra_version
+
+    def append_matrix(self, matrices: IDiskListView[TimeSeriesMatrix], matrix: TimeSeriesMatrix, series: List[TimeSeries]):
+        """
+        store a calculation, `series` are the columns of `matrix` without points
+        """
+        matrix_index = len(matrices)
+        matrices.append(matrix)
+        for column, s in enumerate(series):
+            row = TimeSeriesInfoRow.FromTimeSeries(s)
+            row.matrix_index = matrix_index
+            row.column = column
+            row.update_times(matrix)
+            self.timeseries_infos.append(row)
+
+    def matrix_rows(self, matrix_index: int):
+        rows = [row for row in self.timeseries_infos if row.matrix_index == matrix_index]
+        rows.sort(key=lambda row: row.column)
+        return rows
+
+    def get_series(self, matrices: IDiskListView[TimeSeriesMatrix]):
+        """
+        series of all rows, each matrix is read once
+        """
+        cache = {}
+        series: List[TimeSeries] = []
+        for row in self.timeseries_infos:
+            if row.matrix_index not in cache:
+                cache[row.matrix_index] = matrices[row.matrix_index]
+            series.append(row.get_series(cache[row.matrix_index]))
+        return series
+
+    def remove_rows(self, matrices: IDiskListView[TimeSeriesMatrix], indexes: Iterable[int]):
+        """
+        remove rows with their matrix columns, matrices left empty are removed
+        """
+        infos = self.timeseries_infos
+        removed = {int(index) for index in indexes}
+        kept = [row for index, row in enumerate(infos) if index not in removed]
+        self.timeseries_infos = kept
+        for matrix_index in sorted({infos[index].matrix_index for index in removed}, reverse=True):
+            rows = self.matrix_rows(matrix_index)
+            if rows:
+                matrices[matrix_index] = matrices[matrix_index].take_columns(
+                    [row.column for row in rows])
+                for column, row in enumerate(rows):
+                    row.column = column
+            else:
+                del matrices[matrix_index]
+                for row in kept:
+                    if row.matrix_index > matrix_index:
+                        row.matrix_index -= 1
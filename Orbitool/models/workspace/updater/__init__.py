@@ -6,9 +6,17 @@ from . import ver2_4_0
 from . import ver2_5_0
 from . import ver2_5_2
 from . import ver2_5_3
+from . import ver2_5_5
+from . import ver2_5_6
+from . import ver2_5_7
+from . import ver2_5_8
 register("2.0.13", ver2_0_13.update)
 register("2.1.5", ver2_1_5.update)
 register("2.4.0", ver2_4_0.update)
 register("2.5.0", ver2_5_0.update)
 register("2.5.2", ver2_5_2.update)
-register("2.5.3", ver2_5_3.update)
\ No newline at end of file
+register("2.5.3", ver2_5_3.update)
+register("2.5.5", ver2_5_5.update)
+register("2.5.6", ver2_5_6.update)
+register("2.5.7", ver2_5_7.update)
+register("2.5.8", ver2_5_8.update)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from h5py import File
+
+from Orbitool.base.disk_structure import KEYS_H5_NAME, IDiskView
+
+
+def update(f: File):
+    """
+    to 2.5.5
+    """
+    path = "data/fitted_peak_tables"
+    if path not in f:
+        IDiskView.key_handler.write_to_h5(
+            f.create_group(path), KEYS_H5_NAME, [])
@@ -0,0 +1,40 @@
+from typing import List
+
+import numpy as np
+from h5py import File
+
+from Orbitool.base.disk_structure import DiskListDirectView
+from Orbitool.base.structure import get_handler
+
+from ...timeseries import TimeSeries, TimeSeriesMatrix
+from ..timeseries import TimeSeriesInfoRow
+
+
+def update(f: File):
+    """
+    to 2.5.7
+    each time series becomes a matrix of one column
+    """
+    data = f["data"]
+    if "time_series" not in data:
+        return
+    old = DiskListDirectView(TimeSeries, data, "time_series")
+    matrices = DiskListDirectView(TimeSeriesMatrix, data, "time_series_matrices")
+    rows = []
+    for matrix_index, series in enumerate(old):
+        matrix = TimeSeriesMatrix.Empty(
+            1, range_sum=series.range_sum, from_raw=series.from_raw)
+        positions = series.positions if len(series.positions) else \
+            np.full(len(series.times), series.position_mid)
+        matrix.extend(series.times, series.intensity, positions)
+        matrices.append(matrix)
+        row = TimeSeriesInfoRow.FromTimeSeries(series)
+        row.matrix_index = matrix_index
+        rows.append(row)
+    del data["time_series"]
+
+    group = f["info/time_series_tab"]
+    handler = get_handler(List[TimeSeriesInfoRow])
+    if "timeseries_infos" in group:
+        del group["timeseries_infos"]
+    handler.write_to_h5(group, "timeseries_infos", rows)
@@ -0,0 +1,15 @@
+from h5py import File
+
+from Orbitool.base.disk_structure import KEYS_H5_NAME, IDiskView
+
+
+def update(f: File):
+    """
+    to 2.5.8
+    fitted peak tables have a new column, they will be fitted again
+    """
+    path = "data/fitted_peak_tables"
+    if path in f:
+        del f[path]
+    IDiskView.key_handler.write_to_h5(
+        f.create_group(path), KEYS_H5_NAME, [])
@@ -3,11 +3,15 @@ from pathlib import Path
 from typing import Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from Orbitool.base import BaseDiskData, BaseStructure, DiskList, H5File
+from Orbitool.base.h5file import compact, live_size
 from Orbitool.base.structure import broken_entries
+from Orbitool.config import setting
+from Orbitool.utils.memory import MemoryCounter, MemoryUsage
 
 from ...version import VERSION
+from ..peakfit import FittedPeakTable, PeakAreaIndex
 from ..spectrum import Spectrum
-from ..timeseries import TimeSeries
+from ..timeseries import TimeSeriesMatrix
 from .base import BaseInfo
 from .calibration import CalibratorInfo
 from .file_tab import FileTabInfo
@@ -23,6 +27,9 @@ from .timeseries import TimeseriesInfo
 
 T = TypeVar("T")
 
+# smaller files are not worth auto compacting
+AUTO_COMPACT_MIN_SIZE = 16 * 2**20
+
 
 class WorkspaceInfo(BaseStructure):
     version: str = VERSION
@@ -44,7 +51,22 @@ class WorkspaceInfo(BaseStructure):
 class WorkspaceData(BaseDiskData):
     raw_spectra = DiskList(Spectrum)
     calibrated_spectra = DiskList(Spectrum)
-    time_series = DiskList(TimeSeries)
+    # one matrix per time series calculation, see `TimeSeriesInfoRow.matrix_index`
+    time_series_matrices = DiskList(TimeSeriesMatrix)
+    # fitted peaks of each calibrated spectrum, see `TimeseriesInfo.fitted_peak_tables_valid`
+    fitted_peak_tables = DiskList(FittedPeakTable)
+    # see `TimeseriesInfo.peak_area_indexes_version`
+    peak_area_indexes = DiskList(PeakAreaIndex)
+
+    def truncate_calibrated_spectra(self, start: int):
+        """
+        remove calibrated spectra from `start` with their fitted peak tables and
+        peak area indexes, the caches are rebuilt only from `start` when the
+        spectra are appended again
+        """
+        for data in (self.calibrated_spectra, self.fitted_peak_tables, self.peak_area_indexes):
+            for index in reversed(range(start, len(data))):
+                del data[index]
 
 
 class WorkSpace:
@@ -54,6 +76,8 @@ class WorkSpace:
         else:
             use_proxy = False
         self.use_proxy = use_proxy
+        # file size right after the last compaction
+        self.compacted_size: Optional[int] = None
 
         info = None
         if use_proxy:
@@ -74,7 +98,10 @@ class WorkSpace:
                 info = WorkspaceInfo()
         self.info = info
 
-    def save(self):
+    def save(self) -> int:
+        """
+        return bytes reclaimed by auto compaction
+        """
         if self.use_proxy:
             self.file.close()
 
@@ -92,6 +119,56 @@ class WorkSpace:
             self.data = WorkspaceData(self.file.get_h5group("data"), self.proxy_file.get_h5group("data"))
         else:
             self.file.write("info", self.info)
+        return self.auto_compact()
+
+    def unused_size(self) -> int:
+        """
+        estimated bytes left by deleted objects in workspace file
+        """
+        if self.in_memory():
+            return 0
+        self.file._obj.flush()
+        return max(Path(self.file._io).stat().st_size - live_size(self.file._obj), 0)
+
+    def auto_compact(self) -> int:
+        """
+        compact if estimated unused space is over `auto_compact_ratio` of the
+        file, and the file has grown by that ratio since the last compaction
+        """
+        ratio = setting.general.auto_compact_ratio
+        if ratio <= 0 or self.in_memory():
+            return 0
+        self.file._obj.flush()
+        size = Path(self.file._io).stat().st_size
+        if size < AUTO_COMPACT_MIN_SIZE:
+            return 0
+        if self.compacted_size is not None and size < self.compacted_size * (1 + ratio):
+            return 0
+        if self.unused_size() < size * ratio:
+            return 0
+        return self.compact()
+
+    def compact(self) -> int:
+        """
+        rewrite workspace file without space left by deleted objects.
+        unsaved data in proxy file are kept.
+        return reclaimed bytes
+        """
+        if self.in_memory():
+            return 0
+        path = Path(self.file._io)
+        self.file.close()
+        try:
+            reclaimed = compact(path)
+            self.compacted_size = path.stat().st_size
+            return reclaimed
+        finally:
+            if self.use_proxy:
+                self.file = H5File(path, 'r')
+                self.data = WorkspaceData(self.file.get_h5group("data"), self.proxy_file.get_h5group("data"))
+            else:
+                self.file = H5File(path, 'a')
+                self.data = WorkspaceData(self.file.get_h5group("data"))
 
     def in_memory(self):
         return not self.file._file
@@ -124,6 +201,27 @@ class WorkSpace:
 
         self.close()
 
+    def memory_report(self, counter: Optional[MemoryCounter] = None) -> List[MemoryUsage]:
+        """
+        memory held by `info`, a row for each tab with its fields (>= 1 KB) as children.
+        data lists are on disk and not counted.
+        """
+        if counter is None:
+            counter = MemoryCounter()
+        rows: List[MemoryUsage] = []
+        for name in self.info.model_fields:
+            tab = getattr(self.info, name)
+            if not isinstance(tab, BaseStructure):
+                rows.append(counter.measure(name, tab))
+                continue
+            fields = [counter.measure(field, getattr(tab, field))
+                      for field in tab.model_fields]
+            row = sum(fields, counter.measure(name, tab))
+            # small fields only make the report longer
+            row.children = [field for field in fields if field.total >= 1024]
+            rows.append(row)
+        return rows
+
     def load_config_from_file(self, f: str):
         file = H5File(f, 'r')
         info = file.read("info", WorkspaceInfo)
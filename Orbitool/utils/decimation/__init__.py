@@ -0,0 +1 @@
+from .pyramid import MinMaxPyramid
@@ -0,0 +1,80 @@
+from typing import List
+
+import numpy as np
+
+
+class MinMaxPyramid:
+    """
+    Min / max decimation of a line with ascending x.
+    Level k keeps, for each block of `base ** (k + 1)` points, indexes of
+    the minimum and the maximum point in x order, so a line through them
+    looks the same as the full line when a block is narrower than a pixel.
+    Only indexes are kept, the line's x and y are passed to `query`.
+    """
+
+    def __init__(self, y: np.ndarray, base: int = 4) -> None:
+        assert base > 1
+        y = np.asarray(y)
+        self.length = len(y)
+        self.base = base
+        self.levels: List[np.ndarray] = []
+
+        level = np.arange(self.length).reshape(-1, 1)
+        while len(level) > 1:
+            level = self._reduce(y, level)
+            self.levels.append(level)
+
+    def _reduce(self, y: np.ndarray, level: np.ndarray) -> np.ndarray:
+        """
+        merge each `base` blocks of `level` into a block
+        """
+        base = self.base
+        full = len(level) // base * base
+        groups = [level[:full].reshape(-1, base * level.shape[1])]
+        if full < len(level):
+            groups.append(level[full:].reshape(1, -1))
+        return np.concatenate([self._min_max(y, group) for group in groups])
+
+    @staticmethod
+    def _min_max(y: np.ndarray, group: np.ndarray) -> np.ndarray:
+        values = y[group]
+        rows = np.arange(len(group))
+        a = group[rows, values.argmin(axis=1)]
+        b = group[rows, values.argmax(axis=1)]
+        return np.stack((np.minimum(a, b), np.maximum(a, b)), axis=1)
+
+    def query(self, x: np.ndarray, y: np.ndarray, x_min: float, x_max: float, blocks: int) -> np.ndarray:
+        """
+        ascending indexes of points to draw between x_min and x_max with at most
+        about `blocks` min / max pairs, one point outside each side is kept.
+        `x` (numeric) and `y` are the arrays the pyramid was built for.
+        """
+        length = self.length
+        assert len(x) == len(y) == length
+        start = max(int(np.searchsorted(x, x_min, 'right')) - 1, 0)
+        stop = min(int(np.searchsorted(x, x_max, 'left')) + 1, length)
+        count = stop - start
+        blocks = max(int(blocks), 1)
+        if count <= 2 * blocks:
+            return np.arange(start, stop)
+
+        level_index = 0
+        block = self.base
+        while count > block * blocks and level_index + 1 < len(self.levels):
+            level_index += 1
+            block *= self.base
+        level = self.levels[level_index]
+
+        head = min(-(-start // block) * block, stop)
+        tail = max(stop // block * block, head)
+        parts = [[start]]
+        if head > start:
+            parts.append(self._min_max(
+                y, np.arange(start, head).reshape(1, -1))[0])
+        parts.append(level[head // block:tail // block].ravel())
+        if stop > tail:
+            parts.append(self._min_max(
+                y, np.arange(tail, stop).reshape(1, -1))[0])
+        parts.append([stop - 1])
+        indexes = np.concatenate(parts).astype(int)
+        return indexes[np.concatenate(([True], indexes[1:] != indexes[:-1]))]
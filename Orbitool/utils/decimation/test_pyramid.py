@@ -0,0 +1,38 @@
+import numpy as np
+
+from .pyramid import MinMaxPyramid
+
+
+def test_pyramid():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(100, 500, 100001))
+    y = rng.exponential(1, len(x))
+    y[12345] = 1000
+    pyramid = MinMaxPyramid(y)
+
+    indexes = pyramid.query(x, y, x[0], x[-1], 500)
+    assert len(indexes) <= 2 * 500 + 4
+    assert np.all(np.diff(indexes) > 0)
+    assert indexes[0] == 0 and indexes[-1] == len(x) - 1
+    assert y[indexes].max() == y.max()
+    assert y[indexes].min() == y.min()
+
+    x_min, x_max = 200, 210
+    indexes = pyramid.query(x, y, x_min, x_max, 100)
+    inner = (x >= x_min) & (x <= x_max)
+    shown = indexes[(x[indexes] >= x_min) & (x[indexes] <= x_max)]
+    assert y[shown].max() == y[inner].max()
+    assert y[shown].min() == y[inner].min()
+    assert x[indexes[0]] < x_min and x[indexes[-1]] > x_max
+
+    indexes = pyramid.query(x, y, x_min, x_max, 10000)
+    assert np.array_equal(indexes, np.arange(
+        np.flatnonzero(inner)[0] - 1, np.flatnonzero(inner)[-1] + 2))
+
+
+def test_pyramid_small():
+    y = np.array([1., 3., 2.])
+    pyramid = MinMaxPyramid(y)
+    assert pyramid.query(np.arange(3.), y, -1, 5, 1).tolist() == [0, 1, 2]
+    assert MinMaxPyramid(np.empty(0)).query(
+        np.empty(0), np.empty(0), 0, 1, 10).tolist() == []
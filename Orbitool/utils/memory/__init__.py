@@ -0,0 +1 @@
+from .usage import MemoryUsage, MemoryCounter, format_usages
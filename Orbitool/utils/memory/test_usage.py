@@ -0,0 +1,33 @@
+from array import array
+
+import numpy as np
+
+from Orbitool.models.spectrum import Spectrum
+
+from .usage import MemoryCounter, MemoryUsage, format_usages
+
+
+def test_memory_counter():
+    counter = MemoryCounter()
+    data = np.zeros(1000)
+    usage = counter.measure("a", [data, data[10:], data[20:]])
+    assert usage.numpy == data.nbytes
+    assert usage.python > 0 and usage.objects == 4
+
+    # counted by "a" already
+    assert counter.measure("b", data[30:]).numpy == 0
+    assert counter.measure("c", {"d": array('i', [0] * 100)}).numpy == 400
+
+    spectrum = Spectrum(mz=np.zeros(10), intensity=np.zeros(10), path="",
+                        start_time=np.datetime64(0, 's').item(), end_time=np.datetime64(0, 's').item())
+    assert MemoryCounter().measure("spectrum", spectrum).numpy == 160
+
+
+def test_format_usages():
+    child = MemoryUsage("child", 2**20, 2**20, 1)
+    parent = MemoryUsage("parent", 0, 2**20, 1) + child
+    parent.children = [child]
+    lines = format_usages([parent, MemoryUsage("other", 2**20)])
+    assert [line.split()[0] for line in lines[1:]] == [
+        "parent", "child", "other", "total"]
+    assert lines[-1].split()[1:] == ["2.00M", "2.00M", "4.00M", "2"]
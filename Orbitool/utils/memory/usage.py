@@ -0,0 +1,115 @@
+import sys
+from array import array
+from dataclasses import dataclass, field
+from types import FunctionType, ModuleType
+from typing import List, Set
+
+import numpy as np
+from pydantic import BaseModel
+
+
+@dataclass
+class MemoryUsage:
+    """
+    numpy: bytes of numpy array (and `array.array`) buffers
+    python: bytes of python objects holding them, including array headers
+    children: parts already counted in this usage
+    """
+    name: str
+    numpy: int = 0
+    python: int = 0
+    objects: int = 0
+    children: List["MemoryUsage"] = field(default_factory=list)
+
+    @property
+    def total(self):
+        return self.numpy + self.python
+
+    def __add__(self, other: "MemoryUsage"):
+        return MemoryUsage(self.name, self.numpy + other.numpy,
+                           self.python + other.python, self.objects + other.objects)
+
+
+class MemoryCounter:
+    """
+    Count bytes reachable from objects. Each object and array buffer is
+    counted only by the first `measure` reaching it, so data shared by
+    several sections is not counted twice.
+    """
+
+    def __init__(self) -> None:
+        self.seen: Set[int] = set()
+        self.seen_buffers: Set[int] = set()
+
+    def measure(self, name: str, obj) -> MemoryUsage:
+        usage = MemoryUsage(name)
+        seen = self.seen
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if obj is None or isinstance(obj, (bool, type, ModuleType, FunctionType)) or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            usage.objects += 1
+            size = sys.getsizeof(obj)
+            match obj:
+                case np.ndarray():
+                    usage.python += size - \
+                        (obj.nbytes if obj.flags.owndata else 0)
+                    usage.numpy += self._buffer_size(obj)
+                    if obj.dtype.hasobject:
+                        stack.extend(obj.ravel().tolist())
+                case array():
+                    buffer = obj.buffer_info()[1] * obj.itemsize
+                    usage.python += size - buffer
+                    usage.numpy += buffer
+                case BaseModel():
+                    usage.python += size + sys.getsizeof(obj.__dict__)
+                    stack.extend(obj.__dict__.values())
+                case dict():
+                    usage.python += size
+                    stack.extend(obj.keys())
+                    stack.extend(obj.values())
+                case list() | tuple() | set() | frozenset():
+                    usage.python += size
+                    stack.extend(obj)
+                case _:
+                    usage.python += size
+                    if isinstance(getattr(obj, "__dict__", None), dict):
+                        stack.append(obj.__dict__)
+        return usage
+
+    def _buffer_size(self, arr: np.ndarray) -> int:
+        """
+        size of the buffer under `arr` if not counted yet, views count their base
+        """
+        root = arr
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        owner = id(root if root.base is None else root.base)
+        if owner in self.seen_buffers:
+            return 0
+        self.seen_buffers.add(owner)
+        return root.nbytes
+
+
+def format_usages(usages: List[MemoryUsage]) -> List[str]:
+    """
+    table of usages in MB, children are indented under their parent, last line is the sum
+    """
+    rows = []
+
+    def add_rows(usages: List[MemoryUsage], indent: str):
+        for usage in usages:
+            rows.append((indent + usage.name, usage))
+            add_rows(usage.children, indent + "  ")
+    add_rows(usages, "")
+    rows.append(("total", sum(usages, MemoryUsage("total"))))
+
+    width = max(len(name) for name, _ in rows)
+    lines = [f"{'':<{width}} {'numpy':>10} {'python':>10} {'total':>10} {'objects':>10}"]
+    for name, usage in rows:
+        lines.append(
+            f"{name:<{width}} {usage.numpy / 2**20:>9.2f}M {usage.python / 2**20:>9.2f}M "
+            f"{usage.total / 2**20:>9.2f}M {usage.objects:>10}")
+    return lines
@@ -1,2 +1,5 @@
+from .base import SpectrumReader, readers, register_reader, open_reader, reader_for_file, supported_suffixes
 from .thermo import File as ThermoFile
-from .spectrum_filter import SpectrumFilter
\ No newline at end of file
+from .mzml import File as MzMLFile
+from .hdf5 import File as HDF5File
+from .spectrum_filter import SpectrumFilter
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+
+from ..binary_search import indexBetween
+from . import spectrum_filter
+from .spectrum_filter import SpectrumFilter, SpectrumStats, StatsFilters
+
+
+class SpectrumReader:
+    """
+    Spectrum file with scans numbered from 0 in time order.
+    Readers implement the header attributes, `getSpectrumRetentionTime`,
+    `getSpectrumFilter`, `get_spectrum_stats`, `getUniqueFilters` and
+    `getScan`, the rest is built on them and could be overridden by
+    something faster of the file format.
+    """
+    # prefix of `Orbitool.models.file.Path.path`
+    path_type: str = ""
+    # lower case suffixes of files to open
+    suffixes: Tuple[str, ...] = ()
+
+    path: str
+    creationDatetime: datetime
+    startTimedelta: timedelta
+    endTimedelta: timedelta
+    totalScanNum: int
+
+    @classmethod
+    def can_open(cls, path: str) -> bool:
+        """
+        whether a file with one of `suffixes` is in this format
+        """
+        return True
+
+    def getSpectrumRetentionTime(self, scan_num: int) -> timedelta:
+        raise NotImplementedError()
+
+    def getSpectrumFilter(self, scan_num: int) -> SpectrumFilter:
+        raise NotImplementedError()
+
+    def get_spectrum_stats(self, scan_num: int) -> SpectrumStats:
+        raise NotImplementedError()
+
+    def getUniqueFilters(self) -> List[SpectrumFilter]:
+        raise NotImplementedError()
+
+    def getScan(self, scan_num: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        return mz, intensity of a scan
+        """
+        raise NotImplementedError()
+
+    @cached_property
+    def startDatetime(self):
+        return self.creationDatetime + self.startTimedelta
+
+    @cached_property
+    def endDatetime(self):
+        return self.creationDatetime + self.endTimedelta
+
+    def getSpectrumRetentionTimes(self):
+        return [self.getSpectrumRetentionTime(scan_num) for scan_num in range(self.totalScanNum)]
+
+    def getSpectrumDatetime(self, scan_num: int):
+        return self.creationDatetime + self.getSpectrumRetentionTime(scan_num)
+
+    def checkFilter(self, polarity) -> bool:
+        return any(filter["polarity"] == str(polarity) for filter in self.getUniqueFilters())
+
+    def getFilterList(self, num_range: Tuple[int, int] = None, time_range: Tuple[datetime, datetime] = None):
+        if num_range is None:
+            if time_range is None:
+                num_range = (0, self.totalScanNum)
+            else:
+                num_range = self.datetimeRange2ScanNumRange(time_range)
+        for scan_num in range(*num_range):
+            yield self.getSpectrumFilter(scan_num)
+
+    def get_stats_list(self):
+        for scan_num in range(self.totalScanNum):
+            yield self.get_spectrum_stats(scan_num)
+
+    def datetimeRange2ScanNumRange(self, datetimeRange: Tuple[datetime, datetime]):
+        """
+            return start (inclusive), stop (exclusive)
+        """
+        return self.timeRange2ScanNumRange((datetimeRange[0] - self.creationDatetime, datetimeRange[1] - self.creationDatetime))
+
+    def timeRange2ScanNumRange(self, timeRange: Tuple[timedelta, timedelta]):
+        """
+            return start (inclusive), stop (exclusive)
+        """
+        s: slice = indexBetween(
+            self, timeRange, (0, self.totalScanNum),
+            method=(lambda _, i: self.getSpectrumRetentionTime(i)))
+        return (s.start, s.stop)
+
+    def scanNumRange2TimeRange(self, numRange: Tuple[int, int]) -> Tuple[timedelta, timedelta]:
+        return self.getSpectrumRetentionTime(numRange[0]), self.getSpectrumRetentionTime(numRange[1] - 1)
+
+    def scanNumRange2DatetimeRange(self, numRange: Tuple[int, int]):
+        return self.creationDatetime + self.getSpectrumRetentionTime(numRange[0]), self.creationDatetime + self.getSpectrumRetentionTime(numRange[1])
+
+    def checkAverageEmpty(self, filter: SpectrumFilter, timeRange: Tuple[timedelta, timedelta] = None, numRange: Tuple[int, int] = None):
+        if timeRange is not None and numRange is None:
+            start, end = self.timeRange2ScanNumRange(timeRange)
+        elif numRange is not None and timeRange is None:
+            start, end = numRange
+        else:
+            raise ValueError(
+                "`timeRange` or `numRange` must be provided and only one can be provided")
+
+        for i in range(start, end):
+            if spectrum_filter.filter_match(self.getSpectrumFilter(i), filter):
+                return False
+        return True
+
+    def getMatchedScanNums(self, num_range: Tuple[int, int], filter: SpectrumFilter, stats_filter: StatsFilters) -> List[int]:
+        scan_nums = []
+        for scan_num in range(*num_range):
+            if not spectrum_filter.filter_match(self.getSpectrumFilter(scan_num), filter):
+                continue
+            if stats_filter and not spectrum_filter.stats_match(
+                    self.get_spectrum_stats(scan_num), stats_filter):
+                continue
+            scan_nums.append(scan_num)
+        return scan_nums
+
+    def getAveragedSpectrumInTimeRange(self, start: datetime, end: datetime, rtol, filter: SpectrumFilter, stats_filter: StatsFilters):
+        from Orbitool.models.spectrum import averageSpectra
+        scan_nums = self.getMatchedScanNums(
+            self.datetimeRange2ScanNumRange((start, end)), filter, stats_filter)
+        if not scan_nums:
+            return None
+        return averageSpectra(
+            ((*self.getScan(scan_num), 1.) for scan_num in scan_nums), rtol, True)
+
+    def getChromatograms(self, mz_ranges: np.ndarray, filter: SpectrumFilter, stats_filter: StatsFilters, time_range: Tuple[datetime, datetime] = None):
+        """
+        intensity traces of `mz_ranges` ([[mz_min, mz_max], ...]) over scans matching
+        `filter` and `stats_filter`, intensity of points in each range are summed.
+        return times (M8[us]) and intensity with shape (len(times), len(mz_ranges))
+        """
+        mz_ranges = np.asarray(mz_ranges, float).reshape(-1, 2)
+        num_range = (0, self.totalScanNum) if time_range is None else \
+            self.datetimeRange2ScanNumRange(time_range)
+        scan_nums = self.getMatchedScanNums(num_range, filter, stats_filter) \
+            if len(mz_ranges) else []
+
+        times = np.empty(len(scan_nums), "M8[us]")
+        intensity = np.empty((len(scan_nums), len(mz_ranges)), float)
+        for row, scan_num in enumerate(scan_nums):
+            mz, scan_intensity = self.getScan(scan_num)
+            cum = np.concatenate(([0.], np.cumsum(scan_intensity)))
+            intensity[row] = cum[np.searchsorted(mz, mz_ranges[:, 1], "right")] - \
+                cum[np.searchsorted(mz, mz_ranges[:, 0], "left")]
+            times[row] = self.getSpectrumDatetime(scan_num)
+        return times, intensity
+
+
+readers: Dict[str, Type[SpectrumReader]] = {}
+
+
+def register_reader(cls: Type[SpectrumReader]):
+    assert cls.path_type and cls.path_type not in readers
+    readers[cls.path_type] = cls
+    return cls
+
+
+def open_reader(path_type: str, path: str) -> SpectrumReader:
+    reader = readers.get(path_type)
+    if reader is None:
+        raise ValueError(f"Unknown file type: {path_type}")
+    return reader(path)
+
+
+def reader_for_file(path: str) -> Optional[Type[SpectrumReader]]:
+    suffix = path[path.rfind('.'):].lower() if '.' in path else ""
+    for reader in readers.values():
+        if suffix in reader.suffixes and reader.can_open(path):
+            return reader
+    return None
+
+
+def supported_suffixes() -> List[str]:
+    return [suffix for reader in readers.values() for suffix in reader.suffixes]
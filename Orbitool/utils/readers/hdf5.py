@@ -0,0 +1,127 @@
+"""
+Scan container in HDF5:
+    attrs:
+        format: `FORMAT`, other HDF5 files are not opened as scans
+        creation_datetime: iso format
+        filters: json list of SpectrumFilter
+    datasets:
+        retention_time: seconds of each scan
+        filter_index: index of filter of each scan in `filters`
+        TIC: total ion current of each scan
+        offset: points of scan `i` are in `offset[i]:offset[i + 1]`
+        mz, intensity: points of all scans
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, Tuple
+
+import h5py
+import numpy as np
+
+from .base import SpectrumReader, register_reader
+
+FORMAT = "Orbitool scans"
+
+
+@register_reader
+class File(SpectrumReader):
+    path_type = "HDF5"
+    suffixes = (".h5", ".hdf5")
+
+    @classmethod
+    def can_open(cls, path):
+        try:
+            with h5py.File(path, "r") as file:
+                return file.attrs.get("format") == FORMAT
+        except OSError:
+            return False
+
+    def __init__(self, fullname):
+        assert os.path.exists(fullname), f"File not exists: {fullname}"
+        self.path = str(fullname)
+        self.name = os.path.split(self.path)[1]
+        self.file = h5py.File(self.path, "r")
+        assert self.file.attrs.get("format") == FORMAT, f"Not a scan file: {fullname}"
+        self.creationDatetime = datetime.fromisoformat(
+            self.file.attrs["creation_datetime"])
+        self.filters = json.loads(self.file.attrs["filters"])
+        self.retention_time: np.ndarray = self.file["retention_time"][()]
+        self.filter_index: np.ndarray = self.file["filter_index"][()]
+        self.TIC: np.ndarray = self.file["TIC"][()]
+        self.offset: np.ndarray = self.file["offset"][()]
+        self.totalScanNum = len(self.retention_time)
+        assert self.totalScanNum, f"No spectrum in file: {fullname}"
+        self.startTimedelta = timedelta(seconds=float(self.retention_time[0]))
+        self.endTimedelta = timedelta(seconds=float(self.retention_time[-1]))
+
+    def getSpectrumRetentionTime(self, scan_num):
+        return timedelta(seconds=float(self.retention_time[scan_num]))
+
+    def timeRange2ScanNumRange(self, timeRange: Tuple[timedelta, timedelta]):
+        """
+            return start (inclusive), stop (exclusive)
+        """
+        start = np.searchsorted(
+            self.retention_time, timeRange[0].total_seconds(), "left")
+        stop = np.searchsorted(
+            self.retention_time, timeRange[1].total_seconds(), "right")
+        return int(start), int(max(start, stop))
+
+    def getSpectrumFilter(self, scan_num):
+        return self.filters[self.filter_index[scan_num]]
+
+    def get_spectrum_stats(self, scan_num):
+        return {"TIC": float(self.TIC[scan_num])}
+
+    def getUniqueFilters(self):
+        return list(self.filters)
+
+    def getScan(self, scan_num):
+        start, stop = self.offset[scan_num], self.offset[scan_num + 1]
+        return self.file["mz"][start:stop], self.file["intensity"][start:stop]
+
+    def __del__(self):
+        file = getattr(self, "file", None)
+        if file is not None:
+            file.close()
+
+
+def write(path, creation_datetime: datetime, scans: Iterable[Tuple[timedelta, dict, dict, np.ndarray, np.ndarray]]):
+    """
+    scans: (retention time, filter, stats, mz, intensity) of each scan in time order
+    """
+    filters = []
+    retention_time, filter_index, TIC, offset = [], [], [], [0]
+    with h5py.File(path, "w") as file:
+        mz_dataset = file.create_dataset("mz", (0,), float, maxshape=(None,))
+        intensity_dataset = file.create_dataset(
+            "intensity", (0,), float, maxshape=(None,))
+        for time, filter, stats, mz, intensity in scans:
+            if filter not in filters:
+                filters.append(filter)
+            retention_time.append(time.total_seconds())
+            filter_index.append(filters.index(filter))
+            TIC.append(stats["TIC"])
+            start, stop = offset[-1], offset[-1] + len(mz)
+            offset.append(stop)
+            for dataset, values in ((mz_dataset, mz), (intensity_dataset, intensity)):
+                dataset.resize((stop,))
+                dataset[start:stop] = values
+        file.create_dataset("retention_time", data=np.array(retention_time, float))
+        file.create_dataset("filter_index", data=np.array(filter_index, np.int32))
+        file.create_dataset("TIC", data=np.array(TIC, float))
+        file.create_dataset("offset", data=np.array(offset, np.int64))
+        file.attrs["format"] = FORMAT
+        file.attrs["creation_datetime"] = creation_datetime.isoformat()
+        file.attrs["filters"] = json.dumps(filters)
+
+
+def convert(reader: SpectrumReader, path):
+    """
+    write all scans of `reader` (any format) to `path`
+    """
+    write(path, reader.creationDatetime, (
+        (reader.getSpectrumRetentionTime(scan_num), dict(reader.getSpectrumFilter(scan_num)),
+         dict(reader.get_spectrum_stats(scan_num)), *reader.getScan(scan_num))
+        for scan_num in range(reader.totalScanNum)))
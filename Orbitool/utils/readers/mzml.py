@@ -0,0 +1,116 @@
+import os
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import List, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+from .base import SpectrumReader, register_reader
+from .spectrum_filter import SpectrumFilter, SpectrumStats
+
+
+def retention_time(spectrum: dict) -> timedelta:
+    time = spectrum["scanList"]["scan"][0]["scan start time"]
+    if getattr(time, "unit_info", "minute") == "second":
+        return timedelta(seconds=float(time))
+    return timedelta(minutes=float(time))
+
+
+def to_spectrum_filter(spectrum: dict) -> SpectrumFilter:
+    scan = spectrum["scanList"]["scan"][0]
+    if "negative scan" in spectrum:
+        polarity = "-1"
+    elif "positive scan" in spectrum:
+        polarity = "1"
+    else:
+        polarity = "0"
+    try:
+        window = scan["scanWindowList"]["scanWindow"][0]
+        mass = f"{window['scan window lower limit']:.1f}-{window['scan window upper limit']:.1f}"
+    except (KeyError, IndexError):
+        mass = ""
+    mode = "Centroid" if "centroid spectrum" in spectrum else "Profile"
+    return SpectrumFilter(
+        string=scan.get(
+            "filter string", f"{polarity} ms{spectrum.get('ms level', 1)} {mass} {mode}"),
+        polarity=polarity,
+        mass=mass,
+        CiD="off",
+        scan=f"Full {mode}")
+
+
+def read_creation_datetime(path: str) -> datetime:
+    """
+    `startTimeStamp` of run, or modified time of file if not recorded.
+    The time zone is dropped like in raw files.
+    """
+    for _, element in ElementTree.iterparse(path, ("start",)):
+        if element.tag.rsplit("}", 1)[-1] == "run":
+            stamp = element.get("startTimeStamp")
+            if stamp:
+                return datetime.fromisoformat(stamp.replace("Z", "+00:00")).replace(tzinfo=None)
+            break
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+@register_reader
+class File(SpectrumReader):
+    """
+    indexed mzML, scans are parsed when accessed. Scan headers are read in one
+    pass without decoding arrays when first needed.
+    """
+    path_type = "mzML"
+    suffixes = (".mzml",)
+
+    def __init__(self, fullname):
+        assert os.path.exists(fullname), f"File not exists: {fullname}"
+        from pyteomics import mzml
+        self.path = str(fullname)
+        self.name = os.path.split(self.path)[1]
+        self.reader = mzml.MzML(self.path, use_index=True)
+        self.totalScanNum = len(self.reader)
+        assert self.totalScanNum, f"No spectrum in file: {fullname}"
+        self.creationDatetime = read_creation_datetime(self.path)
+        self.startTimedelta = retention_time(self.reader[0])
+        self.endTimedelta = retention_time(self.reader[self.totalScanNum - 1])
+
+    @cached_property
+    def _headers(self) -> Tuple[List[timedelta], List[SpectrumFilter], List[SpectrumStats]]:
+        from pyteomics import mzml
+        times, filters, stats = [], [], []
+        with mzml.MzML(self.path, decode_binary=False) as reader:
+            for spectrum in reader:
+                times.append(retention_time(spectrum))
+                filters.append(to_spectrum_filter(spectrum))
+                stats.append(SpectrumStats(
+                    TIC=float(spectrum.get("total ion current", 0))))
+        return times, filters, stats
+
+    def getSpectrumRetentionTime(self, scan_num):
+        return self._headers[0][scan_num]
+
+    def getSpectrumRetentionTimes(self):
+        return list(self._headers[0])
+
+    def getSpectrumFilter(self, scan_num):
+        return self._headers[1][scan_num]
+
+    def get_spectrum_stats(self, scan_num):
+        return self._headers[2][scan_num]
+
+    def getUniqueFilters(self):
+        filters = {}
+        for filter in self._headers[1]:
+            filters.setdefault(filter["string"], filter)
+        return list(filters.values())
+
+    def getScan(self, scan_num):
+        spectrum = self.reader[int(scan_num)]
+        return np.asarray(spectrum["m/z array"], np.float64), \
+            np.asarray(spectrum["intensity array"], np.float64)
+
+    def __del__(self):
+        reader = getattr(self, "reader", None)
+        if reader is not None:
+            reader.close()
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import h5py
+import numpy as np
+import pytest
+
+from Orbitool.models.file import FileSpectrumInfo, PathList
+
+from .. import HDF5File, hdf5, reader_for_file
+
+CREATION = datetime(2021, 1, 1, 8)
+NEGATIVE = {"string": "-", "polarity": "-1",
+            "mass": "50.0-750.0", "CiD": "off", "scan": "Full Profile"}
+POSITIVE = {**NEGATIVE, "string": "+", "polarity": "1"}
+
+
+@pytest.fixture
+def h5_path(tmp_path):
+    path = tmp_path / "a.h5"
+    mz = np.linspace(100, 101, 5)
+    hdf5.write(path, CREATION, (
+        (timedelta(seconds=30 * index), NEGATIVE if index % 2 == 0 else POSITIVE,
+         {"TIC": 10. * index}, mz, np.arange(5.) + index) for index in range(6)))
+    return path
+
+
+def test_round_trip(h5_path, tmp_path):
+    file = HDF5File(h5_path)
+    assert file.totalScanNum == 6
+    assert file.creationDatetime == CREATION
+    assert file.endDatetime == CREATION + timedelta(seconds=150)
+    assert file.getUniqueFilters() == [NEGATIVE, POSITIVE]
+    assert file.getSpectrumFilter(3) == POSITIVE
+    assert file.get_spectrum_stats(3)["TIC"] == 30
+    assert np.array_equal(file.getScan(3)[1], np.arange(5.) + 3)
+
+    hdf5.convert(file, tmp_path / "b.h5")
+    copy = HDF5File(tmp_path / "b.h5")
+    assert copy.getSpectrumRetentionTimes() == file.getSpectrumRetentionTimes()
+    assert np.array_equal(copy.getScan(5)[0], file.getScan(5)[0])
+
+
+def test_time_range(h5_path):
+    file = HDF5File(h5_path)
+    assert file.timeRange2ScanNumRange(
+        (timedelta(seconds=30), timedelta(seconds=90))) == (1, 4)
+    assert file.timeRange2ScanNumRange(
+        (timedelta(seconds=31), timedelta(seconds=59))) == (2, 2)
+    assert file.datetimeRange2ScanNumRange(
+        (CREATION, CREATION + timedelta(hours=1))) == (0, 6)
+
+
+def test_chromatograms(h5_path):
+    file = HDF5File(h5_path)
+    times, intensity = file.getChromatograms(
+        [[99, 100.1], [100.4, 101]], NEGATIVE, {"TIC": {">=": 10}})
+    assert np.array_equal(times, np.array(
+        [CREATION + timedelta(seconds=60), CREATION + timedelta(seconds=120)], "M8[us]"))
+    # scans 2 and 4, points at 100, 100.5, 100.75 and 101 are in ranges
+    assert np.allclose(intensity, [[2, 4 + 5 + 6], [4, 6 + 7 + 8]])
+
+
+def test_path_list(h5_path):
+    pathlist = PathList()
+    path = pathlist.addFile(str(h5_path))
+    assert path.path == f"HDF5:{h5_path}"
+    assert path.get_show_name() == "a"
+    assert path.scanNum == 6
+
+    info = FileSpectrumInfo(
+        start_time=CREATION, end_time=CREATION + timedelta(minutes=1),
+        path=path.path, filter=POSITIVE, stats_filter={}, average_index=0)
+    (mz, intensity, minutes), last_reader = info.get_spectrum_from_info(with_minutes=True)
+    assert np.allclose(intensity, np.arange(5.) + 1)
+    assert minutes == 1
+    assert isinstance(last_reader["reader"], HDF5File)
+
+
+def test_other_hdf5(h5_path, tmp_path):
+    other = tmp_path / "timeseries.h5"
+    with h5py.File(other, "w") as file:
+        file.create_dataset("matrix", data=np.zeros(3))
+    (tmp_path / "broken.hdf5").write_bytes(b"not hdf5")
+
+    assert reader_for_file(str(h5_path)) is HDF5File
+    assert reader_for_file(str(other)) is None
+    assert reader_for_file(str(tmp_path / "broken.hdf5")) is None
+    with pytest.raises(ValueError):
+        PathList().addFile(str(other))
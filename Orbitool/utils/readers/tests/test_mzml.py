@@ -0,0 +1,98 @@
+import base64
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from .. import MzMLFile, open_reader, reader_for_file
+
+
+def encode(array):
+    return base64.b64encode(np.asarray(array, "<f8").tobytes()).decode()
+
+
+def spectrum(index, minutes, polarity, mz, intensity):
+    params = "".join(
+        f'<cvParam cvRef="MS" accession="{accession}" name="{name}" value="{value}"/>'
+        for accession, name, value in (
+            ("MS:1000511", "ms level", "1"),
+            ("MS:1000129" if polarity < 0 else "MS:1000130",
+             "negative scan" if polarity < 0 else "positive scan", ""),
+            ("MS:1000128", "profile spectrum", ""),
+            ("MS:1000285", "total ion current", intensity.sum())))
+    arrays = "".join(
+        f'<binaryDataArray encodedLength="0">'
+        f'<cvParam cvRef="MS" accession="MS:1000523" name="64-bit float" value=""/>'
+        f'<cvParam cvRef="MS" accession="MS:1000576" name="no compression" value=""/>'
+        f'<cvParam cvRef="MS" accession="{accession}" name="{name}" value=""/>'
+        f'<binary>{encode(array)}</binary></binaryDataArray>'
+        for accession, name, array in (
+            ("MS:1000514", "m/z array", mz), ("MS:1000515", "intensity array", intensity)))
+    return (
+        f'<spectrum index="{index}" id="scan={index + 1}" defaultArrayLength="{len(mz)}">{params}'
+        f'<scanList count="1"><scan>'
+        f'<cvParam cvRef="MS" accession="MS:1000016" name="scan start time" value="{minutes}" '
+        f'unitCvRef="UO" unitAccession="UO:0000031" unitName="minute"/>'
+        f'<scanWindowList count="1"><scanWindow>'
+        f'<cvParam cvRef="MS" accession="MS:1000501" name="scan window lower limit" value="50"/>'
+        f'<cvParam cvRef="MS" accession="MS:1000500" name="scan window upper limit" value="750"/>'
+        f'</scanWindow></scanWindowList></scan></scanList>'
+        f'<binaryDataArrayList count="2">{arrays}</binaryDataArrayList></spectrum>')
+
+
+def write_mzml(path, scans, start="2021-01-01T08:00:00Z"):
+    """
+    scans: (minutes, polarity, mz, intensity)
+    """
+    spectra = "\n".join(spectrum(index, *scan)
+                        for index, scan in enumerate(scans))
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<mzML xmlns="http://psi.hupo.org/ms/mzml" version="1.1.0">'
+        '<cvList count="2"><cv id="MS" fullName="PSI-MS"/><cv id="UO" fullName="Unit Ontology"/></cvList>'
+        f'<run id="run" startTimeStamp="{start}"><spectrumList count="{len(scans)}">\n'
+        f'{spectra}\n</spectrumList></run></mzML>')
+
+
+@pytest.fixture
+def mzml_path(tmp_path):
+    path = tmp_path / "a.mzML"
+    mz = np.linspace(100, 101, 5)
+    write_mzml(path, [(.5 * index, -1 if index % 2 == 0 else 1, mz, np.arange(5.) + index)
+                      for index in range(6)])
+    return path
+
+
+def test_header(mzml_path):
+    assert reader_for_file(str(mzml_path)) is MzMLFile
+    file = open_reader("mzML", str(mzml_path))
+    assert file.totalScanNum == 6
+    assert file.creationDatetime == datetime(2021, 1, 1, 8)
+    assert file.startDatetime == datetime(2021, 1, 1, 8)
+    assert file.endTimedelta == timedelta(minutes=2.5)
+    assert file.getSpectrumRetentionTime(3) == timedelta(minutes=1.5)
+    assert file.timeRange2ScanNumRange(
+        (timedelta(minutes=.5), timedelta(minutes=1.5))) == (1, 4)
+
+
+def test_filters(mzml_path):
+    file = MzMLFile(mzml_path)
+    polarities = [filter["polarity"] for filter in file.getUniqueFilters()]
+    assert polarities == ["-1", "1"]
+    assert file.getSpectrumFilter(0)["mass"] == "50.0-750.0"
+    assert file.checkFilter(-1) and not file.checkFilter(0)
+    assert file.get_spectrum_stats(2)["TIC"] == pytest.approx(20)
+
+
+def test_averaged_spectrum(mzml_path):
+    file = MzMLFile(mzml_path)
+    start = file.creationDatetime
+    negative = file.getUniqueFilters()[0]
+    mz, intensity = file.getAveragedSpectrumInTimeRange(
+        start, start + timedelta(minutes=3), 1e-6, negative, {})
+    assert np.allclose(mz, np.linspace(100, 101, 5))
+    # scans 0, 2, 4
+    assert np.allclose(intensity, np.arange(5.) + 2)
+
+    assert file.getAveragedSpectrumInTimeRange(
+        start, start + timedelta(minutes=3), 1e-6, negative, {"TIC": {">=": 100}}) is None
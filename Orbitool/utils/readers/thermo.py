@@ -6,55 +6,36 @@ from typing import Dict, List, Tuple, Counter, Any
 import os
 
 import numpy as np
-from Orbitool import logger, setting
+from Orbitool import logger
 
-from ..binary_search import indexBetween
+from .base import SpectrumReader, register_reader
 from .spectrum_filter import SpectrumFilter, SpectrumStats, StatsFilters
 from . import spectrum_filter
 
-match setting.file.dotnet_driver:
-    case ".net framework":
-        pass
-    case ".net core":
-        from pythonnet import load
-        load("coreclr")
-import clr
-
-
-pwd = os.path.dirname(__file__)
-clr.AddReference(os.path.join(pwd, 'ThermoFisher.CommonCore.Data.dll'))
-clr.AddReference(os.path.join(
-    pwd, 'ThermoFisher.CommonCore.RawFileReader.dll'))
-clr.AddReference(os.path.join(
-    pwd, 'ThermoFisher.CommonCore.BackgroundSubtraction.dll'))
-clr.AddReference(os.path.join(
-    pwd, 'ThermoFisher.CommonCore.MassPrecisionEstimator.dll'))
-
-clr.AddReference('System.Collections')
-
-from System.Collections.Generic import List as CSharpList
-from System import Int32
-
-from ThermoFisher.CommonCore.RawFileReader import RawFileReaderAdapter
-from ThermoFisher.CommonCore.MassPrecisionEstimator import PrecisionEstimate
-from ThermoFisher.CommonCore.Data.Interfaces import IChromatogramSettings, IScanEventBase, \
-    IScanFilter, RawFileClassification
-from ThermoFisher.CommonCore.Data.FilterEnums import IonizationModeType, MSOrderType, PolarityType
-from ThermoFisher.CommonCore.Data.Business import ChromatogramSignal, ChromatogramTraceSettings, \
-    DataUnits, Device, GenericDataTypes, SampleType, Scan, TraceType, MassOptions
-from ThermoFisher.CommonCore.Data import ToleranceUnits, Extensions
-
 TAG = "ThermoReader"
 
 
+def runtime():
+    """
+    load .NET runtime and Thermo dlls on first call
+    """
+    from . import thermo_runtime
+    return thermo_runtime
+
+
 def initRawFile(path):
-    rawfile = RawFileReaderAdapter.FileFactory(str(path))
-    rawfile.SelectInstrument(Device.MS, 1)
+    dotnet = runtime()
+    rawfile = dotnet.RawFileReaderAdapter.FileFactory(str(path))
+    rawfile.SelectInstrument(dotnet.Device.MS, 1)
     rawfile.IncludeReferenceAndExceptionData = True
     return rawfile
 
 
-class File:
+@register_reader
+class File(SpectrumReader):
+    path_type = "Thermo"
+    suffixes = (".raw",)
+
     def __init__(self, fullname):
         assert os.path.exists(fullname), f"File not exists: {fullname}"
         self.path = fullname
@@ -78,14 +59,6 @@ class File:
         extra_info_dict = dict(zip(extra_info.Labels, extra_info.Values))
         self.massResolution = float(extra_info_dict.get("FT Resolution:"))
 
-    @cached_property
-    def startDatetime(self):
-        return self.creationDatetime + self.startTimedelta
-
-    @cached_property
-    def endDatetime(self):
-        return self.creationDatetime + self.endTimedelta
-
     @cached_property
     def totalScanNum(self):
         return self.lastRawScanNum - self.firstRawScanNum + 1
@@ -105,13 +78,8 @@ class File:
                 retentionTime = lastRetentionTime + averageTimeDelta
         return timedelta(minutes=self.rawfile.RetentionTimeFromScanNumber(rawScanNum))
 
-    def getSpectrumRetentionTimes(self):
-        return [self.getSpectrumRetentionTime(scan_num) for scan_num in range(self.totalScanNum)]
-
-    def getSpectrumDatetime(self, scanNum):
-        return self.creationDatetime + self.getSpectrumRetentionTime(scanNum)
-
     def checkFilter(self, polarity) -> bool:
+        convertPolarity = runtime().convertPolarity
         for f in self.rawfile.GetFilters():
             if convertPolarity[f.Polarity] == polarity:
                 return True
@@ -155,41 +123,6 @@ class File:
         scanfilter = self.rawfile.GetFilterForScanNumber(scan_num)
         return to_spectrum_filter(scanfilter)
 
-    def datetimeRange2ScanNumRange(self, datetimeRange: Tuple[datetime, datetime]):
-        """
-            return start (inclusive), stop (exclusive)
-        """
-        return self.timeRange2ScanNumRange((datetimeRange[0] - self.creationDatetime, datetimeRange[1] - self.creationDatetime))
-
-    def timeRange2ScanNumRange(self, timeRange: Tuple[timedelta, timedelta]):
-        """
-            return start (inclusive), end (exclusive)
-        """
-        s: slice = indexBetween(
-            self, timeRange, (0, self.totalScanNum),
-            method=(lambda _, i: self.getSpectrumRetentionTime(i)))
-        return (s.start, s.stop)
-
-    def scanNumRange2TimeRange(self, numRange: Tuple[int, int]) -> Tuple[timedelta, timedelta]:
-        return self.getSpectrumRetentionTime(numRange[0]), self.getSpectrumRetentionTime(numRange[1] - 1)
-
-    def scanNumRange2DatetimeRange(self, numRange: Tuple[int, int]):
-        return self.creationDatetime + self.getSpectrumRetentionTime(numRange[0]), self.creationDatetime + self.getSpectrumRetentionTime(numRange[1])
-
-    def checkAverageEmpty(self, filter: SpectrumFilter, timeRange: Tuple[timedelta, timedelta] = None, numRange: Tuple[int, int] = None):
-        if timeRange is not None and numRange is None:
-            start, end = self.timeRange2ScanNumRange(timeRange)
-        elif numRange is not None and timeRange is None:
-            start, end = numRange
-        else:
-            raise ValueError(
-                "`timeRange` or `numRange` must be provided and only one can be provided")
-
-        for i in range(start, end):
-            if spectrum_filter.filter_match(self.getSpectrumFilter(i), filter):
-                return False
-        return True
-
     def getAveragedSpectrumInTimeRange(self, start: datetime, end: datetime, rtol, filter: SpectrumFilter, stats_filter: StatsFilters):
         # Due to a bug related to scan time during data acquisition, AverageScansInTimeRange should not be used
         # averaged = Extensions.AverageScansInTimeRange(self.rawfile, start, end, scanfilter, MassOptions(rtol, ToleranceUnits.ppm))
@@ -197,7 +130,8 @@ class File:
             map(self.getRawScanNum, self.datetimeRange2ScanNumRange((start, end))))
         if self._getFirstFilterInRawNumRange(startNum, stopNum, filter) is None:
             return
-        average_list = CSharpList[Int32]()
+        dotnet = runtime()
+        average_list = dotnet.CSharpList[dotnet.Int32]()
         cnt = 0
         for i in range(startNum, stopNum):
             i_filter = self.getSpectrumFilter(i, True)
@@ -213,8 +147,8 @@ class File:
         if cnt == 0:
             logger.d(TAG, "getAveragedSpectrumInTimeRange() empty list, skip")
             return
-        averaged = Extensions.AverageScans(
-            self.rawfile, average_list, MassOptions(rtol, ToleranceUnits.ppm))
+        averaged = dotnet.Extensions.AverageScans(
+            self.rawfile, average_list, dotnet.MassOptions(rtol, dotnet.ToleranceUnits.ppm))
         if averaged is None:
             return
         averaged = averaged.SegmentedScan
@@ -222,6 +156,62 @@ class File:
         intensity = np.fromiter(averaged.Intensities, np.float64)
         return mass, intensity
 
+    def getChromatograms(self, mz_ranges: np.ndarray, filter: SpectrumFilter, stats_filter: StatsFilters, time_range: Tuple[datetime, datetime] = None):
+        """
+        intensity traces of `mz_ranges` ([[mz_min, mz_max], ...]) over scans matching
+        `filter` and `stats_filter`, all traces are extracted by one chromatogram call.
+        return times (M8[us]) and intensity with shape (len(times), len(mz_ranges))
+        """
+        mz_ranges = np.asarray(mz_ranges, float).reshape(-1, 2)
+        empty = np.empty(0, "M8[us]"), np.empty((0, len(mz_ranges)), float)
+        num_range = (0, self.totalScanNum) if time_range is None else \
+            self.datetimeRange2ScanNumRange(time_range)
+        if num_range[0] >= num_range[1] or not len(mz_ranges):
+            return empty
+        rawfilters = [f for f in self.rawfile.GetFilters() if spectrum_filter.filter_match(
+            to_spectrum_filter(f), filter)]
+        if not rawfilters:
+            return empty
+        # .NET side filtering is exact only when one raw filter matches
+        filter_string = rawfilters[0].ToString() if len(rawfilters) == 1 else ""
+
+        dotnet = runtime()
+        traces = []
+        for low, high in mz_ranges:
+            trace = dotnet.ChromatogramTraceSettings(
+                filter_string, dotnet.Array[dotnet.MassRange]([dotnet.MassRange(float(low), float(high))]))
+            trace.Trace = dotnet.TraceType.MassRange
+            traces.append(trace)
+        data = self.rawfile.GetChromatogramData(
+            dotnet.Array[dotnet.IChromatogramSettings](traces),
+            self.getRawScanNum(num_range[0]), self.getRawScanNum(num_range[1] - 1))
+        if data is None or data.Length == 0:
+            return empty
+
+        scans = np.fromiter(data.ScanNumbersArray[0], np.int64)
+        minutes = np.fromiter(data.PositionsArray[0], np.float64)
+        intensity = np.empty((len(scans), len(mz_ranges)), float)
+        for column in range(len(mz_ranges)):
+            intensity[:, column] = np.fromiter(
+                data.IntensitiesArray[column], np.float64, len(scans))
+
+        slt = np.ones(len(scans), bool)
+        for index, scan in enumerate(scans):
+            if len(rawfilters) > 1 and not spectrum_filter.filter_match(
+                    self.getSpectrumFilter(int(scan), True), filter):
+                slt[index] = False
+            elif stats_filter and not spectrum_filter.stats_match(
+                    self.get_spectrum_stats(int(scan), True), stats_filter):
+                slt[index] = False
+
+        times = np.datetime64(self.creationDatetime, "us") + \
+            (minutes[slt] * 60e6).astype("m8[us]")
+        return times, intensity[slt]
+
+    def getScan(self, scan_num):
+        scan = runtime().Scan.FromFile(self.rawfile, self.getRawScanNum(scan_num)).SegmentedScan
+        return np.fromiter(scan.Positions, np.float64), np.fromiter(scan.Intensities, np.float64)
+
     def __del__(self):
         self.rawfile.Dispose()
 
@@ -240,7 +230,7 @@ def to_spectrum_filter(rawfilter) -> SpectrumFilter:
     r = rawfilter.GetMassRange(0)
     return SpectrumFilter(
         string=rawfilter.ToString(),
-        polarity=str(convertPolarity[rawfilter.Polarity]),
+        polarity=str(runtime().convertPolarity[rawfilter.Polarity]),
         mass=f"{r.Low:.1f}-{r.High:.1f}",
         CiD="off" if rawfilter.HigherEnergyCiD.ToString(
         ) == "Off" else format(rawfilter.HigherEnergyCiDValue, ".2f"),
@@ -253,7 +243,3 @@ def to_spectrum_stats(rawstats) -> SpectrumStats:
         TIC=rawstats.TIC
     )
 
-
-convertPolarity = {PolarityType.Any: 0,
-                   PolarityType.Positive: 1,
-                   PolarityType.Negative: -1}
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+.NET runtime and Thermo dlls, imported by `thermo.runtime()` when the first
+raw file is opened instead of when `Orbitool.utils.readers` is imported.
+"""
+import os
+
+from Orbitool import setting
+
+match setting.file.dotnet_driver:
+    case ".net framework":
+        pass
+    case ".net core":
+        from pythonnet import load
+        load("coreclr")
+import clr
+
+
+pwd = os.path.dirname(__file__)
+clr.AddReference(os.path.join(pwd, 'ThermoFisher.CommonCore.Data.dll'))
+clr.AddReference(os.path.join(
+    pwd, 'ThermoFisher.CommonCore.RawFileReader.dll'))
+clr.AddReference(os.path.join(
+    pwd, 'ThermoFisher.CommonCore.BackgroundSubtraction.dll'))
+clr.AddReference(os.path.join(
+    pwd, 'ThermoFisher.CommonCore.MassPrecisionEstimator.dll'))
+
+clr.AddReference('System.Collections')
+
+from System.Collections.Generic import List as CSharpList
+from System import Array, Int32
+
+from ThermoFisher.CommonCore.RawFileReader import RawFileReaderAdapter
+from ThermoFisher.CommonCore.MassPrecisionEstimator import PrecisionEstimate
+from ThermoFisher.CommonCore.Data.Interfaces import IChromatogramSettings, IScanEventBase, \
+    IScanFilter, RawFileClassification
+from ThermoFisher.CommonCore.Data.FilterEnums import IonizationModeType, MSOrderType, PolarityType
+from ThermoFisher.CommonCore.Data.Business import ChromatogramSignal, ChromatogramTraceSettings, \
+    DataUnits, Device, GenericDataTypes, SampleType, Scan, TraceType, MassOptions, Range as MassRange
+from ThermoFisher.CommonCore.Data import ToleranceUnits, Extensions
+
+
+convertPolarity = {PolarityType.Any: 0,
+                   PolarityType.Positive: 1,
+                   PolarityType.Negative: -1}
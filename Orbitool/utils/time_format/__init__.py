@@ -1,3 +1,3 @@
 from . import time_convert
-from .time_convert import converters
+from .time_convert import converters, array_converters
 from .time_parser import TimeParser
@@ -49,3 +49,30 @@ converters = {
     "matlab": (getMatlabTime, fromMatlabTime),
     "excel": (getExcelTime, fromExcelTime)
 }
+
+
+# vectorized converters for datetime64 arrays, results are the same as
+# converters above on times with microseconds dropped
+
+def getIsoTimes(times: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(times.astype('M8[s]'), 's')
+
+
+def getIgorTimes(times: np.ndarray) -> np.ndarray:
+    return (times.astype('M8[s]') - np.datetime64(igorTimeStandard, 's')).astype(np.int64)
+
+
+def getMatlabTimes(times: np.ndarray) -> np.ndarray:
+    return (times.astype('M8[s]') - matlabTimeStandard).astype('m8[s]').astype(float) / 86400.
+
+
+def getExcelTimes(times: np.ndarray) -> np.ndarray:
+    return (times.astype('M8[s]') - np.datetime64(excelTimeStandard, 's')).astype('m8[s]').astype(float) / 86400.
+
+
+array_converters = {
+    "iso": getIsoTimes,
+    "igor": getIgorTimes,
+    "matlab": getMatlabTimes,
+    "excel": getExcelTimes
+}
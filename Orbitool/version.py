@@ -1 +1 @@
-VERSION = "2.5.4"
\ No newline at end of file
+VERSION = "2.5.8"
\ No newline at end of file
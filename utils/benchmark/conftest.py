@@ -0,0 +1,83 @@
+"""
+Throughput of each kernel is compared with `baseline.json`,
+a kernel fails if it is slower than `1 - tolerance` of its baseline.
+
+    python -m pytest utils/benchmark [--kernel-baseline-update] [--kernel-tolerance 0.5]
+"""
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+results: Dict[str, Dict[str, float]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("kernel benchmark")
+    group.addoption("--kernel-baseline-update", action="store_true",
+                    help="write measured throughputs to baseline.json")
+    group.addoption("--kernel-tolerance", type=float, default=.5,
+                    help="allowed relative slow down to baseline")
+
+
+def load_baseline() -> Dict[str, Dict[str, float]]:
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+class KernelBenchmark:
+    def __init__(self, baseline: Dict[str, Dict[str, float]], update: bool, tolerance: float) -> None:
+        self.baseline = baseline
+        self.update = update
+        self.tolerance = tolerance
+
+    def __call__(self, name: str, func: Callable[[], object], items: int, unit: str = "items", rounds: int = 5) -> float:
+        """
+        run `func` once to warm up, then `rounds` times,
+        return throughput of the fastest round in `items` per second
+        """
+        func()
+        best = float("inf")
+        for _ in range(rounds):
+            begin = perf_counter()
+            func()
+            best = min(best, perf_counter() - begin)
+        throughput = items / best
+        results[name] = {"throughput": throughput, "unit": unit}
+
+        if not self.update and (base := self.baseline.get(name)) is not None:
+            ratio = throughput / base["throughput"]
+            assert ratio >= 1 - self.tolerance, \
+                f"{name}: {throughput:.4g} {unit}/s, {ratio:.2f} of baseline {base['throughput']:.4g}"
+        return throughput
+
+
+@pytest.fixture(scope="session")
+def kernel_benchmark(pytestconfig: pytest.Config):
+    return KernelBenchmark(
+        load_baseline(), pytestconfig.getoption("kernel_baseline_update"),
+        pytestconfig.getoption("kernel_tolerance"))
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    if not results:
+        return
+    baseline = load_baseline()
+    terminalreporter.section("kernel throughput")
+    for name, result in results.items():
+        line = f"{name:<32} {result['throughput']:>12.4g} {result['unit']}/s"
+        if (base := baseline.get(name)) is not None:
+            line += f"  x{result['throughput'] / base['throughput']:.2f} of baseline"
+        terminalreporter.write_line(line)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    if results and session.config.getoption("kernel_baseline_update"):
+        baseline = load_baseline()
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=4, sort_keys=True))
@@ -0,0 +1,162 @@
+"""
+benchmark of startup: import time of packages in fresh interpreters, main
+window creation and warm up of spawned worker processes
+
+    python -m utils.benchmark.startup [--repeat 3] [--processes 4]
+        [--output report.json] [--compare old_report.json]
+
+Only standard library is imported at module level, since `warm_up` is
+imported by spawned workers and should not add to what is measured.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent.parent
+
+# modules which should only be loaded when needed
+HEAVY = ("clr", "matplotlib", "scipy", "pyteomics.mass", "pandas")
+
+MODULES = ("Orbitool.models", "Orbitool.utils.readers",
+           "Orbitool.UI.manager", "Orbitool.UI.TimeseriesesUiPy")
+
+# module of `MultiProcess` subclasses imported by workers to unpickle `func`
+WORKER_MODULE = "Orbitool.UI.TimeseriesesUiPy"
+
+IMPORT_SCRIPT = """
+import json, sys
+from time import perf_counter
+begin = perf_counter()
+import {module}
+seconds = perf_counter() - begin
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+MAIN_WINDOW_SCRIPT = """
+import json, os
+from time import perf_counter
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+begin = perf_counter()
+import matplotlib as mpl
+mpl.use("QtAgg")
+from PyQt6 import QtWidgets
+app = QtWidgets.QApplication([])
+from Orbitool.UI import MainUiPy
+imported = perf_counter()
+window = MainUiPy.Window()
+print(json.dumps({"import": imported - begin, "window": perf_counter() - imported}))
+"""
+
+
+def run_script(script: str) -> dict:
+    ret = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                         text=True, cwd=ROOT)
+    if ret.returncode:
+        raise RuntimeError(ret.stderr.strip().splitlines()[-1])
+    return json.loads(ret.stdout.strip().splitlines()[-1])
+
+
+def import_time(module: str, repeat: int = 1) -> dict:
+    """
+    least seconds of importing `module` in `repeat` fresh interpreters,
+    and `HEAVY` modules loaded by it
+    """
+    results = [run_script(IMPORT_SCRIPT.format(module=module, heavy=HEAVY))
+               for _ in range(repeat)]
+    return {"seconds": min(result["seconds"] for result in results),
+            "loaded": results[0]["loaded"]}
+
+
+def main_window_time() -> Dict[str, float]:
+    return run_script(MAIN_WINDOW_SCRIPT)
+
+
+def warm_up(module: str) -> float:
+    begin = perf_counter()
+    __import__(module)
+    return perf_counter() - begin
+
+
+def worker_warm_up_time(processes: int, module: str = WORKER_MODULE) -> Dict[str, float]:
+    """
+    spawn workers like `MultiProcess` and import `module` in each of them.
+    first: until the first worker imported it, all: until all workers did
+    """
+    import multiprocessing
+
+    from Orbitool import setting
+    from Orbitool.UI.manager.thread import init_process
+
+    context = multiprocessing.get_context("spawn")
+    begin = perf_counter()
+    with context.Pool(processes, initializer=init_process, initargs=(setting,)) as pool:
+        results = [pool.apply_async(warm_up, (module,)) for _ in range(processes)]
+        results[0].get()
+        first = perf_counter() - begin
+        imports = [result.get() for result in results]
+        all_ready = perf_counter() - begin
+        pool.close()
+        pool.join()
+    return {"first": first, "all": all_ready, "import": max(imports)}
+
+
+def run(repeat: int = 3, processes: int = 4) -> dict:
+    from .workspace import current_commit
+
+    seconds: Dict[str, float] = {}
+    loaded: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+    for module in MODULES:
+        result = import_time(module, repeat)
+        seconds[f"import.{module}"] = result["seconds"]
+        loaded[module] = result["loaded"]
+    try:
+        for name, value in main_window_time().items():
+            seconds[f"main_window.{name}"] = value
+    except RuntimeError as e:
+        errors["main_window"] = str(e)
+    for name, value in worker_warm_up_time(processes).items():
+        seconds[f"worker.{name}"] = value
+    return {"commit": current_commit(), "repeat": repeat, "processes": processes,
+            "seconds": seconds, "loaded": loaded, "errors": errors}
+
+
+def format_report(report: dict, old: Optional[dict] = None) -> List[str]:
+    old_seconds = old["seconds"] if old else {}
+    head = f"commit {report['commit'] or '?'}"
+    if old:
+        head += f" compared with {old['commit'] or '?'}"
+    lines = [head, f"repeat {report['repeat']}, processes {report['processes']}"]
+    for name, seconds in report["seconds"].items():
+        line = f"{name:<44} {seconds:>9.4f}s"
+        if (base := old_seconds.get(name)):
+            line += f" {base:>9.4f}s  x{seconds / base:.2f}"
+        lines.append(line)
+    for module, modules in report["loaded"].items():
+        lines.append(f"{module} loads {', '.join(modules) or 'none'} of {', '.join(HEAVY)}")
+    for name, error in report["errors"].items():
+        lines.append(f"{name} failed: {error}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--output", help="write report as json")
+    parser.add_argument("--compare", help="json report of another run")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.processes)
+    old = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print("\n".join(format_report(report, old)))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
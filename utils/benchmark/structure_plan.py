@@ -0,0 +1,60 @@
+"""
+micro-benchmark of row serialization
+
+    python -m utils.benchmark.structure_plan [rows]
+"""
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import List
+
+import numpy as np
+
+from Orbitool.base import H5File
+from Orbitool.models.file import FileSpectrumInfo
+from Orbitool.models.formula import Formula
+from Orbitool.models.spectrum.peak import StorageFittedPeak
+
+
+def spectrum_infos(num: int):
+    begin = datetime(2021, 1, 1)
+    interval = timedelta(minutes=1)
+    filter = {"polarity": "-", "mass range": "50-750"}
+    stats_filter = {}
+    return [FileSpectrumInfo(
+        start_time=begin + i * interval, end_time=begin + (i + 1) * interval,
+        path=f"Thermo:D:/data/{i // 100}.RAW", filter=filter, stats_filter=stats_filter,
+        average_index=i % 3) for i in range(num)]
+
+
+def fitted_peaks(num: int):
+    formulas = [Formula("C7H8O2"), Formula("C3H3Ti-"), Formula("CC[13]H[2]")]
+    param = np.array([1e4, 100., 1.5e-3]).tobytes()
+    return [StorageFittedPeak(
+        start_index=i * 10, stop_index=i * 10 + 10, fitted_param=param,
+        peak_position=50 + i * 7e-3, peak_intensity=1e4, area=20.,
+        tags="D" if i % 5 else "", formulas=formulas[:i % 4]) for i in range(num)]
+
+
+def measure(typ, values):
+    file = H5File()
+    begin = perf_counter()
+    file.write("values", values, typ)
+    write = perf_counter() - begin
+
+    begin = perf_counter()
+    file.read("values", typ)
+    read = perf_counter() - begin
+    return write, read
+
+
+def main(num: int = 100000):
+    for name, typ, values in [
+            ("List[FileSpectrumInfo]", List[FileSpectrumInfo], spectrum_infos(num)),
+            ("List[StorageFittedPeak]", List[StorageFittedPeak], fitted_peaks(num))]:
+        write, read = measure(typ, values)
+        print(f"{name} x {num}: write {write:.3f}s ({num / write:.0f} rows/s), read {read:.3f}s ({num / read:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
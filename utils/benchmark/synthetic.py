@@ -0,0 +1,134 @@
+"""
+synthetic Orbitrap profile spectra, for benchmarks without RAW files
+
+    python -m utils.benchmark.synthetic [num]
+"""
+import math
+import sys
+from copy import copy
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import numpy as np
+
+from Orbitool.models.formula import Formula
+
+# FWHM = 2sqrt(2ln2)*sigma
+FWHM_SIGMA = 2 * math.sqrt(2 * math.log(2))
+
+
+@dataclass
+class SyntheticSpectra:
+    """
+    Peaks are gaussian, resolution is `resolution` at m/z 200 and decreases
+    as 1/sqrt(m/z) like Orbitrap, points are sampled `points_per_fwhm` per FWHM.
+    Peaks are formula peaks (with their 13C isotopic peak), random peaks
+    (`peak_density` per Th) and noise peaks (`noise_density` per Th, exponential
+    height with mean `noise_level`). Points lower than `cutoff` are dropped
+    except those next to a kept point, like zero filled Orbitrap profile data.
+    Spectrum i is shifted by `drift_ppm + i * drift_ppm_per_spectrum`.
+    """
+    mz_min: float = 50
+    mz_max: float = 750
+    resolution: float = 140000
+    points_per_fwhm: float = 4
+    formulas: List[str] = field(default_factory=lambda: [
+        "NO3-", "HNO3NO3-", "HN2O6-", "C3H3O4-", "C5H7O7N2-", "C10H16O7N-",
+        "C10H15O8N-", "C10H16O9N-", "C20H32O13N-", "C20H31O16N-"])
+    formula_intensity: Tuple[float, float] = (1e4, 1e6)
+    peak_density: float = 2
+    peak_intensity: Tuple[float, float] = (1e2, 1e5)
+    noise_density: float = 20
+    noise_level: float = 30
+    cutoff: float = 1
+    drift_ppm: float = 0
+    drift_ppm_per_spectrum: float = 0
+    seed: int = 0
+
+    start_time: datetime = datetime(2021, 1, 1)
+    interval: timedelta = timedelta(minutes=1)
+
+    def fwhm(self, mz: np.ndarray) -> np.ndarray:
+        return mz * np.sqrt(mz / 200) / self.resolution
+
+    def mz_axis(self) -> np.ndarray:
+        """
+        d mz / d index = fwhm(mz) / points_per_fwhm
+        """
+        c = self.resolution * math.sqrt(200) * self.points_per_fwhm
+        end = 2 * c * (self.mz_min ** -.5 - self.mz_max ** -.5)
+        return (self.mz_min ** -.5 - np.arange(int(end) + 1) / (2 * c)) ** -2
+
+    def formula_peaks(self) -> Tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        positions = []
+        heights = []
+        low, high = np.log(self.formula_intensity)
+        for formula in self.formulas:
+            formula = Formula(formula)
+            height = math.exp(rng.uniform(low, high))
+            positions.append(formula.mass())
+            heights.append(height)
+            if formula['C'] > 0:
+                isotope = copy(formula)
+                isotope['C[13]'] = 1
+                positions.append(isotope.mass())
+                heights.append(height * isotope.relativeAbundance())
+        return np.array(positions), np.array(heights)
+
+    def generate(self, index: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        return mz, intensity of spectrum `index`
+        """
+        rng = np.random.default_rng((self.seed, index))
+        mz = self.mz_axis()
+        width = self.mz_max - self.mz_min
+
+        positions, heights = self.formula_peaks()
+        heights = heights * rng.uniform(.9, 1.1, len(heights))
+        num = rng.poisson(self.peak_density * width)
+        low, high = np.log(self.peak_intensity)
+        noise_num = rng.poisson(self.noise_density * width)
+        positions = np.concatenate((
+            positions, rng.uniform(self.mz_min, self.mz_max, num + noise_num)))
+        heights = np.concatenate((
+            heights, np.exp(rng.uniform(low, high, num)),
+            rng.exponential(self.noise_level, noise_num)))
+        positions *= 1 + 1e-6 * (self.drift_ppm +
+                                 index * self.drift_ppm_per_spectrum)
+
+        intensity = np.zeros_like(mz)
+        sigmas = self.fwhm(positions) / FWHM_SIGMA
+        starts = np.searchsorted(mz, positions - 5 * sigmas)
+        stops = np.searchsorted(mz, positions + 5 * sigmas)
+        for position, height, sigma, start, stop in zip(positions, heights, sigmas, starts, stops):
+            x = mz[start:stop]
+            intensity[start:stop] += height * \
+                np.exp(-.5 * ((x - position) / sigma) ** 2)
+
+        high = intensity > self.cutoff
+        high[0] = high[-1] = False
+        keep = high.copy()
+        keep[1:] |= high[:-1]
+        keep[:-1] |= high[1:]
+        intensity[~high] = 0
+        return mz[keep], intensity[keep]
+
+    def generate_spectra(self, num: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        return [self.generate(index) for index in range(num)]
+
+    def times(self, num: int) -> List[Tuple[datetime, datetime]]:
+        return [(self.start_time + index * self.interval,
+                 self.start_time + (index + 1) * self.interval) for index in range(num)]
+
+
+def main(num: int = 1):
+    synthetic = SyntheticSpectra()
+    for mz, intensity in synthetic.generate_spectra(num):
+        print(f"{len(mz)} points, {np.count_nonzero(intensity)} not zero, "
+              f"m/z {mz[0]:.3f}-{mz[-1]:.3f}, max intensity {intensity.max():.3e}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
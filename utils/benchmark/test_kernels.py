@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from Orbitool.models.formula import CalculatorGenerator, Formula
+from Orbitool.models.peakfit.normal_distribution import NormalDistributionFunc
+from Orbitool.models.spectrum import (averageSpectra, denoiseWithParams,
+                                      getNoiseParams, mergeSpectra,
+                                      safeCutSpectrum, splitPeaks)
+
+from .synthetic import FWHM_SIGMA, SyntheticSpectra
+
+SPECTRA_NUM = 5
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    return SyntheticSpectra(drift_ppm_per_spectrum=.1)
+
+
+@pytest.fixture(scope="module")
+def spectra(synthetic: SyntheticSpectra):
+    return synthetic.generate_spectra(SPECTRA_NUM)
+
+
+@pytest.fixture(scope="module")
+def noise_mass_points():
+    mass_points = np.array([Formula(f).mass() for f in ["NO3-", "HNO3NO3-"]])
+    return mass_points, np.full_like(mass_points, 5, dtype=np.int32)
+
+
+def test_split_peaks(kernel_benchmark, spectra):
+    mz, intensity = spectra[0]
+    kernel_benchmark("splitPeaks", lambda: splitPeaks(
+        mz, intensity), len(mz), "points")
+
+
+def test_merge_spectra(kernel_benchmark, spectra):
+    (mz1, intensity1), (mz2, intensity2) = spectra[:2]
+    kernel_benchmark("mergeSpectra", lambda: mergeSpectra(
+        mz1, intensity1, mz2, intensity2, 1, 1, 1e-6), len(mz1) + len(mz2), "points")
+
+
+def test_average_spectra(kernel_benchmark, spectra):
+    kernel_benchmark("averageSpectra", lambda: averageSpectra(
+        [(mz, intensity, 1.) for mz, intensity in spectra]),
+        sum(len(mz) for mz, _ in spectra), "points")
+
+
+def test_get_noise_params(kernel_benchmark, spectra, noise_mass_points):
+    mz, intensity = spectra[0]
+    kernel_benchmark("getNoiseParams", lambda: getNoiseParams(
+        mz, intensity, .5, True, *noise_mass_points), len(mz), "points")
+
+
+def test_denoise_with_params(kernel_benchmark, spectra, noise_mass_points):
+    mz, intensity = spectra[0]
+    mass_points, mass_point_deltas = noise_mass_points
+    poly_coef, std, slt, params = getNoiseParams(
+        mz, intensity, .5, True, mass_points, mass_point_deltas)
+    kernel_benchmark("denoiseWithParams", lambda: denoiseWithParams(
+        mz, intensity, poly_coef, std, params, mass_points[slt],
+        mass_point_deltas[slt], 3, False), len(mz), "points")
+
+
+def test_normal_distribution_split_peak(kernel_benchmark, synthetic: SyntheticSpectra, spectra):
+    mz, intensity = spectra[0]
+    peaks = splitPeaks(mz, intensity)
+    peaks = sorted(peaks, key=lambda peak: peak.intensity.max())[-200:]
+    sigma = 1 / (synthetic.resolution * FWHM_SIGMA)
+    func = NormalDistributionFunc(
+        peak_fit_sigma=sigma, peak_fit_res=synthetic.resolution)
+    kernel_benchmark("NormalDistributionFunc.splitPeak", lambda: [
+        func.splitPeak(peak) for peak in peaks], len(peaks), "peaks", rounds=3)
+
+
+def test_calculator_get(kernel_benchmark, synthetic: SyntheticSpectra):
+    generator = CalculatorGenerator.Factory()
+    generator.add_EI("N")
+    calc = generator.generate()
+    masses, _ = synthetic.formula_peaks()
+    masses = np.concatenate([masses + delta for delta in range(10)])
+    kernel_benchmark("Calculator.get", lambda: [
+        calc.get(mass, -1) for mass in masses], len(masses), "masses", rounds=3)
+
+
+def test_safe_cut_spectrum(kernel_benchmark, synthetic: SyntheticSpectra, spectra):
+    mz, intensity = spectra[0]
+    lefts = np.arange(synthetic.mz_min, synthetic.mz_max, .5)
+    kernel_benchmark("safeCutSpectrum", lambda: [
+        safeCutSpectrum(mz, intensity, left, left + .1) for left in lefts], len(lefts), "cuts")
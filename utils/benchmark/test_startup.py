@@ -0,0 +1,24 @@
+from .startup import HEAVY, format_report, import_time, worker_warm_up_time
+
+
+def test_lazy_imports():
+    assert import_time("Orbitool.utils.readers")["loaded"] == []
+    # pyteomics (with pandas) is still needed by the element table of formulas
+    assert not {"clr", "matplotlib", "scipy"} & set(
+        import_time("Orbitool.models")["loaded"])
+    assert not {"clr", "matplotlib", "scipy"} & set(
+        import_time("Orbitool.UI.TimeseriesesUiPy")["loaded"])
+
+
+def test_worker_warm_up():
+    seconds = worker_warm_up_time(1)
+    assert 0 < seconds["import"] < seconds["first"] <= seconds["all"]
+
+
+def test_format_report():
+    report = {"commit": "", "repeat": 1, "processes": 1,
+              "seconds": {"import.Orbitool": 1., "worker.first": 2.},
+              "loaded": {"Orbitool": list(HEAVY[:1])}, "errors": {"main_window": "no display"}}
+    lines = format_report(report, report)
+    assert len(lines) == 2 + 2 + 1 + 1
+    assert lines[2].endswith("x1.00")
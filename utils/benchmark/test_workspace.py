@@ -0,0 +1,21 @@
+from Orbitool.models.workspace import WorkSpace
+
+from .workspace import WorkspaceSize, format_report, run
+
+
+def test_workspace_lifecycle(tmp_path):
+    size = WorkspaceSize(spectra=4, peaks=50, timeseries=3, paths=2, distinct=1, reads=2)
+    report = run(size, tmp_path)
+    assert {"open", "save", "close_as", "extend.raw_spectra",
+            "read.time_series_matrices", "iterate.fitted_peak_tables"} <= report["seconds"].keys()
+    assert len(format_report(report, report)) == 2 + \
+        len(report["seconds"]) + len(report["bytes"])
+
+    workspace = WorkSpace(tmp_path / "workspace.orbt", False)
+    assert len(workspace.data.raw_spectra) == 4
+    assert len(workspace.data.calibrated_spectra) == 8
+    assert workspace.data.time_series_matrices[0].count == 3
+    assert len(workspace.info.time_series_tab.timeseries_infos) == 3
+    assert len(workspace.info.calibration_tab.path_ion_infos) == 2
+    assert workspace.info.time_series_tab.show_index == 0
+    workspace.close()
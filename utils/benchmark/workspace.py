@@ -0,0 +1,244 @@
+"""
+benchmark of workspace lifecycle on synthetic workspaces
+
+    python -m utils.benchmark.workspace [--spectra 100] [--peaks 2000] [--timeseries 100] [--paths 10]
+        [--output report.json] [--compare old_report.json]
+"""
+import argparse
+import json
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Orbitool.models.calibration import PathIonInfo
+from Orbitool.models.file import FileSpectrumInfo
+from Orbitool.models.peakfit import FittedPeakTable
+from Orbitool.models.spectrum import FittedPeak, Spectrum, SpectrumInfo, splitPeaks
+from Orbitool.models.timeseries import TimeSeries, TimeSeriesMatrix
+from Orbitool.models.workspace import WorkSpace
+
+from .synthetic import SyntheticSpectra
+
+
+@dataclass
+class WorkspaceSize:
+    spectra: int = 100
+    # fitted peaks in peak fit tab and in each fitted peak table
+    peaks: int = 2000
+    timeseries: int = 100
+    paths: int = 10
+    # spectra are generated `distinct` times and reused
+    distinct: int = 4
+    reads: int = 50
+    seed: int = 0
+
+
+class SyntheticWorkspace:
+    def __init__(self, size: WorkspaceSize) -> None:
+        self.size = size
+        self.synthetic = SyntheticSpectra(seed=size.seed)
+        self.rng = np.random.default_rng(size.seed)
+        self.profiles = self.synthetic.generate_spectra(
+            min(size.distinct, size.spectra))
+        self.times = self.synthetic.times(size.spectra)
+        self.paths = [f"Thermo:D:/data/{index}.RAW" for index in range(size.paths)]
+
+    def path_of(self, index: int) -> str:
+        return self.paths[index * len(self.paths) // self.size.spectra]
+
+    def spectra(self) -> List[Spectrum]:
+        return [Spectrum(
+            mz=mz, intensity=intensity, path=self.path_of(index), start_time=start, end_time=end)
+            for index, ((start, end), (mz, intensity)) in enumerate(
+                zip(self.times, self.profiles * (self.size.spectra // len(self.profiles) + 1)))]
+
+    def spectrum_infos(self) -> List[FileSpectrumInfo]:
+        return [FileSpectrumInfo(
+            start_time=start, end_time=end, path=self.path_of(index),
+            filter={"polarity": "-", "mass range": "50-750"}, average_index=0)
+            for index, (start, end) in enumerate(self.times)]
+
+    def fitted_peaks(self) -> List[FittedPeak]:
+        mz, intensity = self.profiles[0]
+        peaks = splitPeaks(mz, intensity)
+        peaks = [peaks[index % len(peaks)] for index in range(self.size.peaks)]
+        return [FittedPeak(
+            mz=peak.mz, intensity=peak.intensity,
+            fitted_param=np.array([peak.intensity.max(), peak.mz.mean(), 1e-3]),
+            peak_position=peak.mz.mean(), peak_intensity=peak.intensity.max(),
+            area=peak.intensity.sum() * 1e-3) for peak in peaks]
+
+    def fitted_peak_tables(self) -> List[FittedPeakTable]:
+        num = self.size.peaks
+        tables = []
+        for start, _ in self.times:
+            position = np.sort(self.rng.uniform(
+                self.synthetic.mz_min, self.synthetic.mz_max, num))
+            tables.append(FittedPeakTable(
+                position=position, peak_intensity=self.rng.exponential(1e3, num),
+                area=self.rng.exponential(1, num), raw_index=np.arange(num),
+                raw_mz_min=position - 1e-3, raw_mz_max=position + 1e-3,
+                raw_signal_max=position + 5e-4, start_time=start))
+        return tables
+
+    def timeseries(self) -> Tuple[TimeSeriesMatrix, List[TimeSeries]]:
+        """
+        one calculation of all time series
+        """
+        positions = self.rng.uniform(
+            self.synthetic.mz_min, self.synthetic.mz_max, self.size.timeseries)
+        shape = (len(self.times), len(positions))
+        matrix = TimeSeriesMatrix.Empty(len(positions))
+        matrix.extend([start for start, _ in self.times], self.rng.exponential(
+            1e3, shape), np.broadcast_to(positions, shape))
+        return matrix, [TimeSeries(
+            position_min=position * (1 - 1e-6), position_max=position * (1 + 1e-6)) for position in positions]
+
+    def path_ion_infos(self, formulas) -> Dict[str, Dict[object, PathIonInfo]]:
+        counts = np.bincount([self.paths.index(self.path_of(index))
+                             for index in range(self.size.spectra)], minlength=len(self.paths))
+        return {path: {formula: PathIonInfo.fromRaw(
+            formula, formula.mass() * (1 + self.rng.normal(0, 1e-6, count)),
+            self.rng.exponential(1e4, count)) for formula in formulas}
+            for path, count in zip(self.paths, counts)}
+
+    def fill(self, workspace: WorkSpace, timer: "Timer"):
+        spectra = self.spectra()
+        data = workspace.data
+        with timer("extend.raw_spectra"):
+            data.raw_spectra.extend(spectra)
+        with timer("extend.calibrated_spectra"):
+            data.calibrated_spectra.extend(spectra)
+        with timer("extend.fitted_peak_tables"):
+            data.fitted_peak_tables.extend(self.fitted_peak_tables())
+        matrix, timeseries = self.timeseries()
+        with timer("extend.time_series_matrices"):
+            workspace.info.time_series_tab.append_matrix(
+                data.time_series_matrices, matrix, timeseries)
+
+        info = workspace.info
+        info.file_tab.spectrum_infos = self.spectrum_infos()
+        calibration = info.calibration_tab
+        calibration.last_ions = calibration.ions.copy()
+        calibration.path_ion_infos = self.path_ion_infos(
+            [ion.formula for ion in calibration.ions])
+        calibration.path_times = {
+            path: self.times[0][0] for path in self.paths}
+        calibration.calibrated_spectrum_infos = [SpectrumInfo(
+            start_time=start, end_time=end) for start, end in self.times]
+        peaks = self.fitted_peaks()
+        info.peak_fit_tab.spectrum = spectra[0]
+        info.peak_fit_tab.raw_peaks = peaks
+        info.peak_fit_tab.peaks = peaks
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, name: str):
+        begin = perf_counter()
+        yield
+        self.seconds[name] = perf_counter() - begin
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run(size: WorkspaceSize, folder: Path) -> dict:
+    """
+    create, open, read, modify, save and close as a synthetic workspace in `folder`
+    """
+    workspace_path = folder / "workspace.orbt"
+    copy_path = folder / "copy.orbt"
+    synthetic = SyntheticWorkspace(size)
+    timer = Timer()
+
+    workspace = WorkSpace(workspace_path, False)
+    synthetic.fill(workspace, timer)
+    with timer("create.save"):
+        workspace.save()
+    workspace.close()
+
+    with timer("open"):
+        workspace = WorkSpace(workspace_path)
+
+    data = workspace.data
+    lists = {"raw_spectra": data.raw_spectra, "fitted_peak_tables": data.fitted_peak_tables,
+             "time_series_matrices": data.time_series_matrices}
+    rng = np.random.default_rng(size.seed)
+    for name, disk_list in lists.items():
+        indexes = rng.integers(0, len(disk_list), size.reads).tolist()
+        with timer(f"read.{name}"):
+            for index in indexes:
+                disk_list[index]
+        with timer(f"iterate.{name}"):
+            for _ in disk_list:
+                pass
+
+    workspace.info.time_series_tab.show_index = 0
+    with timer("proxy.extend.calibrated_spectra"):
+        data.calibrated_spectra.extend(synthetic.spectra())
+    with timer("save"):
+        workspace.save()
+    workspace_size = workspace_path.stat().st_size
+
+    with timer("close_as"):
+        workspace.close_as(copy_path)
+
+    return {
+        "commit": current_commit(),
+        "size": asdict(size),
+        "seconds": timer.seconds,
+        "bytes": {"workspace": workspace_size, "close_as": copy_path.stat().st_size}}
+
+
+def format_report(report: dict, old: Optional[dict] = None) -> List[str]:
+    old_seconds = old["seconds"] if old else {}
+    head = f"commit {report['commit'] or '?'}"
+    if old:
+        head += f" compared with {old['commit'] or '?'}"
+    lines = [head, ", ".join(f"{key} {value}" for key, value in report["size"].items())]
+    for name, seconds in report["seconds"].items():
+        line = f"{name:<36} {seconds:>9.4f}s"
+        if (base := old_seconds.get(name)):
+            line += f" {base:>9.4f}s  x{seconds / base:.2f}"
+        lines.append(line)
+    for name, size in report["bytes"].items():
+        lines.append(f"{name:<36} {size / 2**20:>9.2f}MB")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    for name, default in asdict(WorkspaceSize()).items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--output", help="write report as json")
+    parser.add_argument("--compare", help="json report of another run")
+    args = parser.parse_args()
+
+    size = WorkspaceSize(**{name: getattr(args, name)
+                            for name in asdict(WorkspaceSize())})
+    with tempfile.TemporaryDirectory() as folder:
+        report = run(size, Path(folder))
+    old = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print("\n".join(format_report(report, old)))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()